@@ -0,0 +1,170 @@
+import io
+import os
+import time
+import random
+import contextlib
+import multiprocessing
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from modelo_base import read_sheet, default_horizon, scenario_from_frames, solve_with_slot_sizing, get_solution_data
+from solvers import NONCONVEX_SOLVERS
+from verification import check_solution_vectorized
+
+
+# Batch runner: every scenario (sheet of the workbook or perturbed variant of one) is solved in its own process.
+# Each worker gets cores // workers solver threads so the solvers together never ask for more than the machine has.
+
+# Variables de entorno que limitan los hilos de las librerías numéricas de cada proceso
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# Columnas de la hoja de trabajos que lee scenario_from_frames
+JOB_COLUMNS = {'plane', 'task', 'job', 'date', 'duration'}
+
+
+def scenario_sheets(file_name="input_data.xlsx"):
+    # Hojas de escenarios: las que tienen las columnas de trabajos (no 'Planes' ni hojas de notas como 'use case1')
+    import pandas as pd
+    headers = pd.read_excel(file_name, sheet_name=None, nrows=0)
+    return [sheet for sheet, df in headers.items() if JOB_COLUMNS <= set(df.columns)]
+
+
+def perturbed_durations(df, variant, spread=0.2, seed=0):
+    # Hoja de trabajos con las duraciones multiplicadas por un factor uniforme en [1 - spread, 1 + spread]
+    rng = random.Random(f"{seed}:{variant}")
+    df = df.copy()
+    df['duration'] = [round(d * rng.uniform(1 - spread, 1 + spread), 2) for d in df['duration']]
+    return df
+
+
+def load_scenario(file_name, sheet, variant=0, spread=0.2, seed=0):
+    """
+    Escenario de la hoja, igual que read_excel, o con variant=k ≥ 1 su variante k con las duraciones perturbadas
+    (perturbed_durations; los trabajos entry/exit se añaden después y no cambian). La variante se construye con
+    scenario_from_frames, así que pPredictedFinishOfPlane y nSlotsMax salen de las duraciones nuevas, y su
+    horizonte es el mayor entre el de la hoja y el de la regla de read_excel con las duraciones nuevas: crece si
+    los trabajos se alargan y no se acorta por debajo de los early start de la hoja si se acortan.
+    """
+    df = read_sheet(file_name, sheet)
+    horizon = None
+    if variant:
+        horizon = default_horizon(df)
+        df = perturbed_durations(df, variant, spread, seed)
+        horizon = max(horizon, default_horizon(df))
+    return scenario_from_frames(df, read_sheet(file_name, 'Planes'), pHorizon=horizon)
+
+
+def scenario_loaders(file_name, sheets, variants=0, spread=0.2, seed=0):
+    # [(nombre, cargador)] de cada hoja y de sus variantes 'hoja~k'; se leen en el proceso que las resuelve
+    return [(sheet if k == 0 else f"{sheet}~{k}", partial(load_scenario, file_name, sheet, k, spread, seed))
+            for sheet in sheets for k in range(variants + 1)]
+
+
+def available_cores():
+    # Núcleos que puede usar este proceso (afinidad de CPU si el sistema la expone)
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_threads(workers, cores=None):
+    # Hilos del solver por proceso para que workers × hilos no supere el nº de núcleos
+    return max(1, (cores or available_cores()) // max(workers, 1))
+
+
+@contextlib.contextmanager
+def thread_env(threads):
+    # THREAD_ENV_VARS = threads en este proceso mientras dura el bloque. Las librerías numéricas sólo las leen al
+    # cargarse, así que sirven para los procesos 'spawn' que se crean dentro (no para este ni para los de fork)
+    previous = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def solve_scenario(name, data, solver_name="gurobi", profile=None, formulation="bilinear", warm=True):
+    """
+    Resuelve un escenario (read_excel) y verifica la solución. Devuelve una fila del resumen:
+        scenario, status, objective, gap, time, nSlots, checks (restricciones que se cumplen / total),
+        failed (restricciones violadas) y max_violation. Los errores se devuelven en la fila, no se propagan.
+    data puede ser también una función sin argumentos que devuelve el escenario (scenario_loaders): así los
+    errores de lectura de una hoja también quedan en su fila.
+    """
+    row = {'scenario': name, 'status': None, 'objective': None, 'gap': None, 'time': None, 'nSlots': None,
+           'checks': None, 'failed': None, 'max_violation': None}
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = data() if callable(data) else data
+            instance, result, data_n = solve_with_slot_sizing(data, solver_name, profile, formulation, warm=warm)
+            verification = check_solution_vectorized(data_n, get_solution_data(instance)) \
+                if result['has_solution'] else None
+    except Exception as err:
+        row.update({'status': f"error: {err}", 'time': time.perf_counter() - t0})
+        return row
+    row.update({'status': str(result['termination_condition']), 'objective': result['objective'],
+                'gap': result['gap'], 'time': time.perf_counter() - t0, 'nSlots': result['nSlots']})
+    if verification is not None:
+        checks = verification['constraints_verification']
+        failed = [c for c, v in checks.items() if not v['passed']]
+        row.update({'checks': f"{len(checks) - len(failed)}/{len(checks)}", 'failed': ", ".join(failed),
+                    'max_violation': max((v['max_violation'] for v in checks.values()), default=0.0)})
+    return row
+
+
+def run_batch(scenarios, solver_name="gurobi", profile=None, formulation=None, workers=None, warm=True):
+    """
+    Resuelve la lista [(nombre, data o cargador)] con un pool de 'workers' procesos (por defecto uno por
+    núcleo, sin pasar del nº de escenarios) y 'threads' = núcleos // workers en el perfil de cada solver y
+    en las librerías numéricas de cada proceso (pool 'spawn' creado dentro de thread_env; el script que llama
+    necesita el if __name__ == "__main__"). Devuelve el resumen como DataFrame, en el orden de 'scenarios'.
+    """
+    import pandas as pd
+
+    formulation = formulation or ("bilinear" if solver_name in NONCONVEX_SOLVERS else "linear")
+    workers = max(1, min(workers or available_cores(), len(scenarios)))
+    threads = worker_threads(workers)
+    profile = {**(profile or {}), 'threads': threads}
+    t0 = time.perf_counter()
+    with thread_env(threads), \
+            ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(solve_scenario, name, data, solver_name, profile, formulation, warm)
+                   for name, data in scenarios]
+        rows = [f.result() for f in futures]
+    summary = pd.DataFrame(rows)
+    summary.attrs.update({'workers': workers, 'threads': threads, 'wall_time': time.perf_counter() - t0})
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="input_data.xlsx")
+    parser.add_argument("--sheets", nargs="*", default=None, help="hojas a resolver (por defecto todas)")
+    parser.add_argument("--solver", default="gurobi", choices=["gurobi", "highs", "cbc"])
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--mip-gap", type=float, default=0.10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--variants", type=int, default=0, help="variantes con duraciones perturbadas por hoja")
+    parser.add_argument("--spread", type=float, default=0.2)
+    parser.add_argument("--csv", default=None, help="guardar el resumen en este fichero")
+    args = parser.parse_args()
+
+    scenarios = scenario_loaders(args.file, args.sheets or scenario_sheets(args.file), args.variants, args.spread)
+
+    summary = run_batch(scenarios, args.solver, {'time_limit': args.time_limit, 'mip_gap': args.mip_gap},
+                        workers=args.workers)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print(summary.to_string(index=False))
+    print(f"\n{len(scenarios)} escenarios, {summary.attrs['workers']} procesos × {summary.attrs['threads']} hilos, "
+          f"{summary.attrs['wall_time']:.1f} s")
+    if args.csv:
+        summary.to_csv(args.csv, index=False)
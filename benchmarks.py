@@ -0,0 +1,693 @@
+import gc
+import io
+import os
+import copy
+import json
+import time
+import platform
+import subprocess
+import tracemalloc
+import contextlib
+from pyomo.environ import Constraint, Var, TransformationFactory, value
+
+from modelo_base import read_excel, create_data, ap_pyomo_model, build_concrete_instance, slot_names, \
+    solve_with_slot_sizing, flatten_input_data, get_solution_data, check_solution
+from solvers import get_solver, solve_instance, first_incumbent_time, node_count, NONCONVEX_SOLVERS
+from warm_start import warm_start
+from verification import check_solution_vectorized
+from rolling_horizon import solve_rolling_horizon
+from replanning import open_session, replan
+from scenario_generator import generate_data
+from interference_cuts import solve_lazy_interference
+from benders import solve_benders
+from cp_engine import solve_cp, overlapping_pairs
+
+
+CASES = ["case_1_plane", "case_2_planes", "case_3_planes", "case_3b_planes",
+         "case_4_planes", "case_5_planes", "case_6_planes"]
+
+# Synthetic larger fleets of the suite (parameters of scenario_generator.generate_data, fixed seed)
+SUITE_SYNTHETIC = {
+    'synthetic_8_planes': {'n_planes': 8, 'seed': 0},
+    'synthetic_12_planes': {'n_planes': 12, 'planes_per_client': 2, 'seed': 0},
+}
+SUITE_DIR = "benchmark_results"
+
+
+def quiet(func, *args, **kwargs):
+    # Runs func hiding the banners printed while building the model
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def timed(func, repeat=3):
+    # Best wall-clock time of func over several runs, with the garbage collector paused
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            t0 = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+    return best
+
+
+def peak_memory(func):
+    # Peak memory (MB) allocated by Python while running func
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def build_instance(file_name, sheet_name, formulation="bilinear"):
+    data = quiet(read_excel, file_name, sheet_name)
+    input_data = quiet(create_data, data)
+    model = quiet(ap_pyomo_model, formulation=formulation)
+    instance = quiet(model.create_instance, input_data)
+    return data, instance
+
+
+def model_size(instance):
+    n_vars = sum(len(v) for v in instance.component_objects(Var, active=True))
+    n_cons = sum(len(c) for c in instance.component_objects(Constraint, active=True))
+    n_quad = sum(1 for c in instance.component_data_objects(Constraint, active=True)
+                 if c.body.polynomial_degree() not in (0, 1))
+    return n_vars, n_cons, n_quad
+
+
+# Benchmark of c26_NoOverlapSlots: dense S×S×P×P×J index (old) vs sparse sNoOverlap (new)
+def bench_c26_no_overlap(file_name="input_data.xlsx", cases=CASES):
+    rows = []
+    for case in cases:
+        _, instance = build_instance(file_name, case)
+        calls = {'dense': 0, 'sparse': 0}
+
+        def fc26_dense(m, s, s2, p, p2, j):
+            calls['dense'] += 1
+            if s == s2 or p == p2:
+                return Constraint.Skip
+            if (s, s2, p, p2) not in m.sPosPosSlotSlot:
+                return Constraint.Skip
+            return 1 + m.v01BetaS[s, s2, p, p2] + m.v01BetaF[s, s2, p, p2] >= \
+                m.v01JobInSlot[s, p, j] + m.v01JobInSlot[s2, p2, j]
+
+        def fc26_sparse(m, s, s2, p, p2, j):
+            calls['sparse'] += 1
+            return 1 + m.v01BetaS[s, s2, p, p2] + m.v01BetaF[s, s2, p, p2] >= \
+                m.v01JobInSlot[s, p, j] + m.v01JobInSlot[s2, p2, j]
+
+        def add_dense():
+            if hasattr(instance, 'bench_c26_dense'):
+                instance.del_component('bench_c26_dense')
+            calls['dense'] = 0
+            instance.bench_c26_dense = Constraint(instance.sSlots, instance.sSlots, instance.sPositions,
+                                                  instance.sPositions, instance.sJobs, rule=fc26_dense)
+
+        def add_sparse():
+            if hasattr(instance, 'bench_c26_sparse'):
+                instance.del_component('bench_c26_sparse')
+            calls['sparse'] = 0
+            instance.bench_c26_sparse = Constraint(instance.sNoOverlap, rule=fc26_sparse)
+
+        t_dense = timed(add_dense)
+        t_sparse = timed(add_sparse)
+
+        assert len(instance.bench_c26_dense) == len(instance.bench_c26_sparse)
+        rows.append({
+            'case': case,
+            'constraints': len(instance.bench_c26_sparse),
+            'calls_dense': calls['dense'],
+            'calls_sparse': calls['sparse'],
+            'time_dense(s)': round(t_dense, 4),
+            'time_sparse(s)': round(t_sparse, 4),
+            'speedup': round(t_dense / max(t_sparse, 1e-9), 1),
+        })
+    return rows
+
+
+# Bilinear (MIQCP) vs linear (MILP) formulation of c22/c23: size, root relaxation and solve
+def bench_formulations(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300):
+    rows = []
+    for case in cases:
+        for formulation in ("bilinear", "linear"):
+            _, instance = build_instance(file_name, case, formulation=formulation)
+            n_vars, n_cons, n_quad = model_size(instance)
+            row = {'case': case, 'formulation': formulation, 'vars': n_vars, 'cons': n_cons, 'quad_cons': n_quad,
+                   'root_bound': None, 'objective': None, 'best_bound': None, 'status': None, 'time(s)': None}
+            # Only Gurobi (NonConvex=2) accepts the bilinear model
+            if formulation == "bilinear" and solver_name not in NONCONVEX_SOLVERS:
+                row['status'] = "n/a"
+                rows.append(row)
+                continue
+            profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+
+            # Root relaxation: same model with the integrality of the binaries relaxed
+            relaxed = instance.clone()
+            TransformationFactory('core.relax_integer_vars').apply_to(relaxed)
+            res = quiet(get_solver(solver_name, profile).solve, relaxed, load_solutions=False)
+            if str(res.solver.termination_condition) == "optimal":
+                relaxed.solutions.load_from(res)
+                row['root_bound'] = round(value(relaxed.ObjFunction), 4)
+
+            result = quiet(solve_instance, instance, solver_name, profile)
+            row['time(s)'] = round(result['wall_time'], 2)
+            row['status'] = str(result['termination_condition'])
+            row['objective'] = result['objective']
+            row['best_bound'] = result['lower_bound']
+            rows.append(row)
+    return rows
+
+
+# AbstractModel + create_data + create_instance (old) vs build_concrete_instance (new)
+def bench_build_paths(file_name="input_data.xlsx", cases=CASES, formulation="bilinear"):
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+
+        def abstract_path():
+            input_data = quiet(create_data, copy.deepcopy(data))
+            quiet(ap_pyomo_model, formulation).create_instance(input_data)
+
+        def concrete_path():
+            build_concrete_instance(copy.deepcopy(data), formulation)
+
+        t_abstract = timed(abstract_path)
+        t_concrete = timed(concrete_path)
+        rows.append({
+            'case': case,
+            'time_abstract(s)': round(t_abstract, 3),
+            'time_concrete(s)': round(t_concrete, 3),
+            'speedup': round(t_abstract / max(t_concrete, 1e-9), 2),
+            'peak_abstract(MB)': round(peak_memory(abstract_path), 1),
+            'peak_concrete(MB)': round(peak_memory(concrete_path), 1),
+        })
+    return rows
+
+
+# Slot count of estimate_slots (+ retries on infeasibility) vs the old oversized count (nSlotsMax)
+def bench_slot_sizing(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+        runs = {
+            'estimate': lambda: quiet(solve_with_slot_sizing, data, solver_name, profile, formulation)[:2],
+            'old': lambda: (lambda inst: (inst, quiet(solve_instance, inst, solver_name, profile)))(
+                build_concrete_instance({**data, 'sSlots': slot_names(data['nSlotsMax'])}, formulation)),
+        }
+        for mode, run in runs.items():
+            t0 = time.perf_counter()
+            instance, result = run()
+            n_vars, n_cons, _ = model_size(instance)
+            rows.append({
+                'case': case,
+                'slots': mode,
+                'nSlots': len(instance.sSlots),
+                'vars': n_vars,
+                'cons': n_cons,
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'time(s)': round(time.perf_counter() - t0, 2),
+            })
+    return rows
+
+
+# Time to first incumbent with and without the greedy MIP start of warm_start.py
+def bench_warm_start(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+        for mode in ("cold", "warm"):
+            instance = build_concrete_instance(data, formulation)
+            heuristic = {'time': 0.0, 'objective': None, 'feasible': False}
+            if mode == "warm":
+                heuristic = warm_start(instance, verbose=False)
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                result = solve_instance(instance, solver_name, profile, tee=True, warmstart=heuristic['feasible'])
+            first = first_incumbent_time(log.getvalue(), solver_name)
+            rows.append({
+                'case': case,
+                'start': mode,
+                'heuristic_obj': heuristic['objective'] if heuristic['feasible'] else None,
+                'first_incumbent(s)': round(heuristic['time'] + first, 2) if first is not None else None,
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'time(s)': round(heuristic['time'] + result['wall_time'], 2),
+            })
+    return rows
+
+
+# Symmetry breaking (cSym*) off vs on: B&B nodes and solve time, without MIP start so the tree is comparable
+def bench_symmetry(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300, old_slots=False):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+        if old_slots:
+            data['sSlots'] = slot_names(data['nSlotsMax'])
+        for symmetry in (False, True):
+            instance = build_concrete_instance(data, formulation, symmetry)
+            log = io.StringIO()
+            with contextlib.redirect_stdout(log):
+                result = solve_instance(instance, solver_name, profile, tee=True)
+            rows.append({
+                'case': case,
+                'nSlots': len(data['sSlots']),
+                'symmetry': symmetry,
+                'nodes': node_count(log.getvalue(), solver_name),
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'time(s)': round(result['wall_time'], 2),
+            })
+    return rows
+
+
+# check_solution (loops over every index) vs check_solution_vectorized (NumPy), on the greedy schedule of
+# warm_start.py with the estimated and the old number of slots; the sequence sets of create_data are included
+def bench_check_solution(file_name="input_data.xlsx", cases=CASES, repeat=5):
+    rows = []
+    for case in cases:
+        base = quiet(read_excel, file_name, case)
+        for n_slots in sorted({len(base['sSlots']), base['nSlotsMax']}):
+            data = {**base, 'sSlots': slot_names(n_slots)}
+            instance = build_concrete_instance(data, "linear")
+            warm_start(instance, verbose=False)
+            solution = get_solution_data(instance)
+            data = {**data, **flatten_input_data(quiet(create_data, data))}
+            loops, arrays = check_solution(data, solution), check_solution_vectorized(data, solution)
+            same = all(loops['constraints_verification'][name]['passed'] == entry['passed']
+                       and len(loops['constraints_verification'][name]['errors']) == len(entry['errors'])
+                       for name, entry in arrays['constraints_verification'].items())
+            t_loops = timed(lambda: check_solution(data, solution), repeat)
+            t_arrays = timed(lambda: check_solution_vectorized(data, solution), repeat)
+            rows.append({
+                'case': case,
+                'nSlots': n_slots,
+                'loops(ms)': round(t_loops * 1e3, 2),
+                'numpy(ms)': round(t_arrays * 1e3, 2),
+                'speedup': round(t_loops / t_arrays, 1),
+                'same_result': same,
+                'failed': sum(not e['passed'] for e in arrays['constraints_verification'].values()),
+            })
+    return rows
+
+
+# read_excel parsing the workbook (cache_dir=None) vs loading the sheets from the scenario cache
+def bench_excel_cache(file_name="input_data.xlsx", cases=CASES, repeat=3):
+    rows = []
+    for case in cases:
+        t_excel = timed(lambda: quiet(read_excel, file_name, case, None), repeat)
+        quiet(read_excel, file_name, case)  # primera lectura: crea la caché si no existe
+        t_cache = timed(lambda: quiet(read_excel, file_name, case), repeat)
+        same = repr(quiet(read_excel, file_name, case, None)) == repr(quiet(read_excel, file_name, case))
+        rows.append({
+            'case': case,
+            'excel(ms)': round(t_excel * 1e3, 1),
+            'cache(ms)': round(t_cache * 1e3, 1),
+            'speedup': round(t_excel / t_cache, 1),
+            'same_data': same,
+        })
+    return rows
+
+
+# Rolling horizon (windows of aircraft by early start) vs the monolithic solve: objective of the complete
+# schedule evaluated in the full model, and total time
+def bench_rolling_horizon(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300,
+                          window=2, step=1):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4}
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+        t0 = time.perf_counter()
+        _, result, _ = quiet(solve_with_slot_sizing, data, solver_name, profile, formulation, warm=True)
+        rows.append({'case': case, 'mode': "full", 'status': str(result['termination_condition']),
+                     'objective': result['objective'], 'max_violation': None,
+                     'time(s)': round(time.perf_counter() - t0, 2)})
+        try:
+            rolling = quiet(solve_rolling_horizon, data, window, step, solver_name, profile, formulation)
+            rows.append({'case': case, 'mode': f"rolling {window}/{step}", 'status': f"{len(rolling['windows'])} ventanas",
+                         'objective': rolling['objective'], 'max_violation': round(rolling['max_violation'], 6),
+                         'time(s)': round(rolling['time'], 2)})
+        except RuntimeError as err:
+            rows.append({'case': case, 'mode': f"rolling {window}/{step}", 'status': str(err),
+                         'objective': None, 'max_violation': None, 'time(s)': None})
+    return rows
+
+
+# Replanning after a change of duration / early start / deadline: persistent solver updated in place vs
+# rebuilding the instance and solving from scratch
+def bench_replan(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4}
+    rows = []
+    for case in cases:
+        _, result, data = quiet(solve_with_slot_sizing, read_excel(file_name, case), solver_name, profile, formulation)
+        if not result['has_solution']:
+            continue
+        session = quiet(open_session, data, solver_name, profile, formulation)
+        j = data['sJobs'][len(data['sJobs']) // 2]
+        r = data['pPlaneOfJob'][j]
+        # cada cambio por separado: tras medirlo se vuelve a los datos originales
+        original = {'durations': {j: data['pJobDuration'][j]}, 'early_starts': {r: data['pEarlyStartOfPlane'][r]},
+                    'deadlines': {r: data['pLateFinishDeadline'][r]}}
+        changes = [
+            (f"duración {j} +1", {'durations': {j: data['pJobDuration'][j] + 1}}),
+            (f"early start {r} +1", {'early_starts': {r: data['pEarlyStartOfPlane'][r] + 1}}),
+            (f"deadline {r} -1", {'deadlines': {r: data['pLateFinishDeadline'][r] - 1}}),
+        ]
+        for label, change in changes:
+            replanned = quiet(replan, session, **change)
+            t0 = time.perf_counter()
+            cold = quiet(solve_instance, build_concrete_instance(session['data'], formulation), solver_name, profile)
+            t_cold = time.perf_counter() - t0
+            rows.append({
+                'case': case,
+                'change': label,
+                'rebuilt': replanned['rebuilt'],
+                'cold_obj': cold['objective'],
+                'replan_obj': replanned['objective'],
+                'cold(s)': round(t_cold, 2),
+                'replan(s)': round(replanned['time'], 2),
+                'speedup': round(t_cold / replanned['time'], 1),
+            })
+            quiet(replan, session, **{key: original[key] for key in change})
+    return rows
+
+
+def suite_scenarios(file_name="input_data.xlsx", cases=CASES, synthetic=SUITE_SYNTHETIC):
+    # (name, data, read_excel time) of every sheet and of the synthetic scenarios (scenario_generator.py)
+    scenarios = []
+    for case in cases:
+        t_read = timed(lambda: quiet(read_excel, file_name, case, None), repeat=1)
+        scenarios.append((case, quiet(read_excel, file_name, case), t_read))
+    for name, params in synthetic.items():
+        scenarios.append((name, generate_data(**params), None))
+    return scenarios
+
+
+# Reproducible suite: build stages, model size and solve metrics of every sheet and synthetic fleet, saved as
+# JSON with the commit and environment so runs of different commits can be compared (compare_results)
+def bench_suite(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300,
+                synthetic=SUITE_SYNTHETIC, repeat=3):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False, 'threads': 1}
+    rows = []
+    for name, data, t_read in suite_scenarios(file_name, cases, synthetic):
+        t_create = timed(lambda: quiet(create_data, copy.deepcopy(data)), repeat)
+        input_data = quiet(create_data, copy.deepcopy(data))
+        model = quiet(ap_pyomo_model, formulation=formulation)
+        t_instance = timed(lambda: quiet(model.create_instance, input_data), repeat)
+        t_concrete = timed(lambda: build_concrete_instance(data, formulation), repeat)
+        instance = build_concrete_instance(data, formulation)
+        n_vars, n_cons, n_quad = model_size(instance)
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            result = solve_instance(instance, solver_name, profile, tee=True)
+        rows.append({
+            'case': name,
+            'planes': len(data['sPlanes']),
+            'jobs': len(data['sJobs']),
+            'nSlots': len(data['sSlots']),
+            'read_excel(s)': round(t_read, 4) if t_read is not None else None,
+            'create_data(s)': round(t_create, 4),
+            'create_instance(s)': round(t_instance, 4),
+            'build_concrete(s)': round(t_concrete, 4),
+            'vars': n_vars,
+            'cons': n_cons,
+            'quad': n_quad,
+            'status': str(result['termination_condition']),
+            'objective': result['objective'],
+            'gap': result['gap'],
+            'first_incumbent(s)': first_incumbent_time(log.getvalue(), solver_name),
+            'nodes': node_count(log.getvalue(), solver_name),
+            'solve(s)': round(result['wall_time'], 3),
+        })
+    return rows
+
+
+def run_metadata(**settings):
+    # Commit and environment of a suite run
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    import pyomo
+    return {
+        'commit': git("rev-parse", "HEAD"),
+        'dirty': bool(git("status", "--porcelain", "--untracked-files=no")),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'pyomo': pyomo.version.version,
+        'platform': platform.platform(),
+        'cores': os.cpu_count(),
+        **settings,
+    }
+
+
+def save_results(rows, meta, path=None):
+    # One JSON file per run: {'meta': {...}, 'rows': [...]}; by default benchmark_results/suite-<commit>-<time>.json
+    if path is None:
+        os.makedirs(SUITE_DIR, exist_ok=True)
+        stamp = meta['timestamp'].replace(':', '').replace('-', '')
+        path = os.path.join(SUITE_DIR, f"suite-{(meta['commit'] or 'nogit')[:8]}-{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({'meta': meta, 'rows': rows}, f, indent=1, default=str)
+    return path
+
+
+def compare_results(old_path, new_path):
+    # Ratio new/old of the timings and sizes of the scenarios present in both runs (< 1 = faster/smaller)
+    runs = []
+    for path in (old_path, new_path):
+        with open(path, encoding="utf-8") as f:
+            runs.append(json.load(f))
+    old = {row['case']: row for row in runs[0]['rows']}
+    metrics = ['create_data(s)', 'create_instance(s)', 'build_concrete(s)', 'vars', 'cons', 'solve(s)']
+    rows = []
+    for row in runs[1]['rows']:
+        if row['case'] not in old:
+            continue
+        ratios = {m: round(row[m] / old[row['case']][m], 2) if old[row['case']][m] else None for m in metrics}
+        rows.append({'case': row['case'], **ratios, 'objective': f"{old[row['case']]['objective']} → {row['objective']}"})
+    return rows
+
+
+# Interference pairs up front (c22–c24 over sPosPosSlotSlot) vs lazy (only the pairs found in conflict)
+def bench_lazy_interference(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for case in cases:
+        data = quiet(read_excel, file_name, case)
+        for lazy in (False, True):
+            instance = build_concrete_instance(data, formulation, lazy_interference=lazy)
+            binaries = sum(1 for v in instance.component_data_objects(Var) if v.is_binary())
+            _, n_cons, _ = model_size(instance)
+            if lazy:
+                result = quiet(solve_lazy_interference, instance, solver_name, profile)
+            else:
+                result = quiet(solve_instance, instance, solver_name, profile)
+                result.update({'rounds': 1, 'cuts': len(instance.sPosPosSlotSlot), 'time': result['wall_time']})
+            rows.append({
+                'case': case,
+                'interference': "lazy" if lazy else "full",
+                'binaries': binaries,
+                'cons': n_cons,
+                'rounds': result['rounds'],
+                'pairs': result['cuts'],
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'time(s)': round(result['time'], 2),
+            })
+    return rows
+
+
+# c25 over every pair of planes (P·S·R² rows) vs aggregated (only c20e/c20f, P·S·R rows), on the sheets and on
+# synthetic fleets where R² starts to dominate the model size
+def bench_switch(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300,
+                 synthetic=SUITE_SYNTHETIC, repeat=3):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for name, data, _ in suite_scenarios(file_name, cases, synthetic):
+        for switch in ("pairwise", "aggregated"):
+            t_build = timed(lambda: build_concrete_instance(data, formulation, switch=switch), repeat)
+            instance = build_concrete_instance(data, formulation, switch=switch)
+            _, n_cons, _ = model_size(instance)
+            result = quiet(solve_instance, instance, solver_name, profile)
+            rows.append({
+                'case': name,
+                'planes': len(data['sPlanes']),
+                'switch': switch,
+                'cons': n_cons,
+                'build(s)': round(t_build, 3),
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'solve(s)': round(result['wall_time'], 2),
+            })
+    return rows
+
+
+# Monolithic ap_pyomo_model vs logic-based Benders (benders.py), both from the greedy start, on the sheets and on the
+# synthetic fleets
+def bench_benders(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300,
+                  synthetic=SUITE_SYNTHETIC, workers=None):
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for name, data, _ in suite_scenarios(file_name, cases, synthetic):
+        t0 = time.perf_counter()
+        instance = build_concrete_instance(data, formulation)
+        start = quiet(warm_start, instance)
+        result = quiet(solve_instance, instance, solver_name, profile, warmstart=start['feasible'])
+        result.update({'iterations': None, 'cuts': None, 'time': time.perf_counter() - t0})
+        runs = [("monolithic", result)]
+        _, result = quiet(solve_benders, data, solver_name, profile, formulation, workers=workers,
+                          time_limit=time_limit)
+        runs.append(("benders", result))
+        for mode, result in runs:
+            rows.append({
+                'case': name,
+                'planes': len(data['sPlanes']),
+                'mode': mode,
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'iterations': result['iterations'],
+                'cuts': result['cuts'],
+                'time(s)': round(result['time'], 2),
+            })
+    return rows
+
+
+def bench_cp(file_name="input_data.xlsx", cases=CASES, solver_name="gurobi", time_limit=300,
+             synthetic=SUITE_SYNTHETIC):
+    # MIP (warm start + solve_instance) against the CP-SAT engine in both interference modes. 'overlaps' counts
+    # the pairs of sPosPosSlotSlot that overlap in each schedule: the α of the MIP may leave them at 0
+    formulation = "bilinear" if solver_name in NONCONVEX_SOLVERS else "linear"
+    profile = {'time_limit': time_limit, 'mip_gap': 1e-4, 'heuristic_focus': False}
+    rows = []
+    for name, data, _ in suite_scenarios(file_name, cases, synthetic):
+        t0 = time.perf_counter()
+        instance = build_concrete_instance(data, formulation)
+        start = quiet(warm_start, instance)
+        result = quiet(solve_instance, instance, solver_name, profile, warmstart=start['feasible'])
+        result['time'] = time.perf_counter() - t0
+        solution = get_solution_data(instance) if result['has_solution'] else None
+        data_n = flatten_input_data(create_data(copy.deepcopy(data), verbose=False))
+        runs = [(solver_name, result, solution)]
+        for interference in ("soft", "hard"):
+            # solve_cp resuelve en un proceso aparte (OR-Tools y HiGHS no conviven): sin contar el arranque
+            solution, result, _ = solve_cp(data, profile, interference)
+            result['time'] = result['build_time'] + result['wall_time']
+            runs.append((f"cp-sat {interference}", result, solution))
+        for engine, result, solution in runs:
+            checks = check_solution_vectorized(data_n, solution)['constraints_verification'] \
+                if solution is not None else {}
+            rows.append({
+                'case': name,
+                'planes': len(data['sPlanes']),
+                'engine': engine,
+                'status': str(result['termination_condition']),
+                'objective': result['objective'],
+                'best_bound': result['lower_bound'],
+                'overlaps': len(overlapping_pairs(data_n['sPosPosSlotSlot'], solution)) if solution else None,
+                'checks': f"{sum(v['passed'] for v in checks.values())}/{len(checks)}" if checks else None,
+                'time(s)': round(result['time'], 2),
+            })
+    return rows
+
+
+def print_rows(title, rows):
+    import pandas as pd
+    print("\n" + "=" * 90)
+    print(title)
+    print("=" * 90)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bench", nargs="?", default="c26", choices=["c26", "formulation", "build", "slots", "warmstart", "symmetry", "check", "excel", "rolling", "replan", "suite", "lazy", "switch", "benders", "cp"])
+    parser.add_argument("--file", default="input_data.xlsx")
+    parser.add_argument("--cases", nargs="*", default=CASES)
+    parser.add_argument("--solver", default="gurobi", choices=["gurobi", "highs", "cbc"])
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--window", type=int, default=2, help="aviones por ventana (rolling)")
+    parser.add_argument("--step", type=int, default=1, help="aviones comprometidos por ventana (rolling)")
+    parser.add_argument("--old-slots", action="store_true", help="usar el nº de slots anterior (nSlotsMax)")
+    parser.add_argument("--output", default=None, help="fichero JSON de resultados (suite)")
+    parser.add_argument("--compare", default=None, help="JSON de una ejecución anterior para comparar (suite)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos para los subproblemas (benders)")
+    args = parser.parse_args()
+
+    if args.bench == "c26":
+        print_rows("c26_NoOverlapSlots: construcción densa vs sNoOverlap",
+                   bench_c26_no_overlap(args.file, args.cases))
+    elif args.bench == "build":
+        print_rows("Construcción: AbstractModel/create_instance vs build_concrete_instance",
+                   bench_build_paths(args.file, args.cases))
+    elif args.bench == "slots":
+        print_rows(f"Nº de slots: estimate_slots vs cota anterior ({args.solver})",
+                   bench_slot_sizing(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "warmstart":
+        print_rows(f"Tiempo hasta la primera solución: sin/con solución inicial voraz ({args.solver})",
+                   bench_warm_start(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "symmetry":
+        print_rows(f"Ruptura de simetrías: nodos y tiempo sin/con cSym* ({args.solver})",
+                   bench_symmetry(args.file, args.cases, args.solver, args.time_limit, args.old_slots))
+    elif args.bench == "check":
+        print_rows("Verificación: check_solution con bucles vs check_solution_vectorized",
+                   bench_check_solution(args.file, args.cases))
+    elif args.bench == "excel":
+        print_rows("Lectura de escenarios: Excel vs caché", bench_excel_cache(args.file, args.cases))
+    elif args.bench == "rolling":
+        print_rows(f"Horizonte rodante vs modelo completo ({args.solver})",
+                   bench_rolling_horizon(args.file, args.cases, args.solver, args.time_limit, args.window, args.step))
+    elif args.bench == "replan":
+        print_rows(f"Replanificación: solver persistente vs reconstruir y resolver ({args.solver})",
+                   bench_replan(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "suite":
+        rows = bench_suite(args.file, args.cases, args.solver, args.time_limit)
+        print_rows(f"Suite de rendimiento ({args.solver})", rows)
+        meta = run_metadata(solver=args.solver, time_limit=args.time_limit, cases=args.cases)
+        path = save_results(rows, meta, args.output)
+        print(f"Resultados guardados en {path}")
+        if args.compare:
+            print_rows(f"Comparación con {args.compare} (nuevo / anterior)", compare_results(args.compare, path))
+    elif args.bench == "lazy":
+        print_rows(f"Interferencias c22–c24: todas vs sólo las que entran en conflicto ({args.solver})",
+                   bench_lazy_interference(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "switch":
+        print_rows(f"Cambios de avión: c25 por pares vs agregada con c20e/c20f ({args.solver})",
+                   bench_switch(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "benders":
+        print_rows(f"Modelo completo vs descomposición de Benders lógica ({args.solver})",
+                   bench_benders(args.file, args.cases, args.solver, args.time_limit, workers=args.workers))
+    elif args.bench == "cp":
+        print_rows(f"MIP vs motor CP-SAT con intervalos ({args.solver})",
+                   bench_cp(args.file, args.cases, args.solver, args.time_limit))
+    elif args.bench == "formulation":
+        print_rows(f"Formulación bilineal vs lineal de c22/c23 ({args.solver})",
+                   bench_formulations(args.file, args.cases, args.solver, args.time_limit))
@@ -0,0 +1,347 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pyomo.environ import Binary, Constraint, ConstraintList, Set, TerminationCondition, Var, value
+
+from modelo_base import build_concrete_instance, job_time_windows
+from solvers import PERSISTENT_SOLVERS, get_persistent_solver, solve_persistent, solve_instance
+from interference_cuts import solve_lazy_interference
+from warm_start import warm_start
+
+
+# Logic-based Benders: the master is ap_pyomo_model without its timing rows (which job goes to which slot, presence,
+# switches and idle planes, with the same objective) and the subproblems check that the assignment has a schedule.
+# Given the slots, the times form a precedence network (task sequence c14, slot sequence c13, early start c27 and the
+# latest finish of each job in its slot pMFinishSlotJob), so each subproblem is an earliest-start pass; planes that
+# share no position are independent and are checked separately. An infeasible assignment returns the pairs of jobs
+# that follow each other in a position along the critical path (or cycle), and the cut forbids that order in any
+# position and slots. Delay cuts are not needed: c28 makes the deadlines hard, so the delays of c09/c10 are always 0,
+# and α is never forced by the presence times (interference_cuts.py), so a master solution with a schedule is
+# optimal for the full model.
+
+# Restricciones con tiempos que se desactivan en el maestro
+TIMING_CONSTRAINTS = ('c02_SlotJobDuration', 'c03_NullStartTimeIfNotInSlot', 'c04_NullFinishTimeIfNotInSlot',
+                      'c05_JobDuration', 'c06_StartJob_upper', 'c06_StartJob_lower', 'c07_FinishJob_lower',
+                      'c07_FinishJob_upper', 'c08_StartFinishRelation', 'c09_Plane_delay', 'c11_SlotStartTime',
+                      'c12_SlotFinishTime', 'c13_SlotSequence', 'c14_JobSequence', 'c17_DurationIfNotAssigned',
+                      'c18_SlotDuration', 'cLinkStartPres', 'cLinkFinishPres1', 'cLinkFinishPres2',
+                      'cLinkStartPresNull', 'cLinkFinishPresNull', 'c28_EarlyStart', 'c29_LateFinish')
+
+# Variables de asignación que se fijan para calcular los tiempos de la solución final
+ASSIGNMENT_VARS = ('v01JobInSlot', 'v01PlaneInSlot', 'v01PlaneInPosition', 'v01SwitchPlanes', 'vPresence', 'vIdle',
+                   'vClientPosition')
+
+
+def set_timing(instance, active):
+    for name in TIMING_CONSTRAINTS:
+        constraint = instance.find_component(name)
+        if constraint is not None:
+            constraint.activate() if active else constraint.deactivate()
+
+
+def master_problem(data, formulation="linear", switch="pairwise"):
+    """
+    Maestro: la instancia de build_concrete_instance con lazy_interference=True (sin α/β ni c22–c24/c26) y sin las
+    restricciones de TIMING_CONSTRAINTS, más dos bloques nuevos:
+        - cBendersEnergy: en cada posición, los trabajos cuya ventana (est, lft) está dentro de un intervalo
+          [ES de un avión, fin más tardío de otro] caben uno tras otro en él (relajación de los subproblemas)
+        - cBendersCuts: los cortes de los subproblemas, con las variables de orden v01Before (order_var)
+    """
+    instance = build_concrete_instance(data, formulation, lazy_interference=True, switch=switch)
+    set_timing(instance, False)
+    J, R = list(instance.sJobs), list(instance.sPlanes)
+    plane = {j: instance.pPlaneOfJob[j] for j in J}
+    D = {j: value(instance.pJobDuration[j]) for j in J}
+    ES = {r: value(instance.pEarlyStartOfPlane[r]) for r in R}
+    LF = {r: value(instance.pLateFinishDeadline[r]) for r in R}
+    sequence = sorted(instance.sJobSequence, key=lambda jj: (str(plane[jj[0]]), instance.pTaskOfJob[jj[0]]))
+    est, lft = job_time_windows(J, sequence, D, plane, ES, LF, value(instance.pHorizon))
+    window = {}
+    for (s, p, j) in instance.sSlotWindow:
+        window.setdefault(p, []).append((s, j))
+
+    # Intervalos [ES de un avión, fin más tardío de otro]; sólo los que no caben sin repartir los trabajos
+    intervals = []
+    for a in sorted(set(ES.values())):
+        for b in sorted({min(LF[r], value(instance.pHorizon)) for r in R}):
+            inside = [j for j in J if est[j] >= a and lft[j] <= b]
+            if b > a and sum(D[j] for j in inside) > b - a:
+                intervals.append((a, b, set(inside)))
+    energy = [(p, k) for p in window for k in range(len(intervals))]
+
+    def fcBendersEnergy(model, p, k):
+        a, b, inside = intervals[k]
+        return sum(model.pJobDuration[j] * model.v01JobInSlot[s, p, j] for (s, j) in window[p] if j in inside) <= b - a
+
+    instance.cBendersEnergy = Constraint(energy, rule=fcBendersEnergy)
+    instance.sBendersOrder = Set(dimen=2, initialize=[])
+    instance.v01Before = Var(instance.sBendersOrder, within=Binary)
+    instance.cBendersOrder = ConstraintList()
+    instance.cBendersCuts = ConstraintList()
+    return instance
+
+
+def timing_subproblems(instance):
+    """
+    Subproblemas de la asignación cargada en el maestro, uno por grupo de aviones que comparten alguna posición:
+    {'jobs': {j: (duración, ES del avión, fin más tardío en su slot, (s, p))}, 'arcs': [(j, j2, de posición)]}.
+    Los arcos de posición van del trabajo de cada slot ocupado al del slot anterior (c13: posterior en el tiempo).
+    """
+    slot_of, job_in = {}, {}
+    for (s, p, j) in instance.sSlotWindow:
+        if (instance.v01JobInSlot[s, p, j].value or 0) > 0.5:
+            slot_of[j], job_in[s, p] = (s, p), j
+    plane = {j: instance.pPlaneOfJob[j] for j in instance.sJobs}
+
+    # grupos de aviones unidos por las posiciones que usan (union-find)
+    parent = {r: r for r in instance.sPlanes}
+
+    def find(r):
+        while parent[r] != r:
+            parent[r] = parent[parent[r]]
+            r = parent[r]
+        return r
+
+    arcs = [(j, j2, False) for (j, j2) in instance.sJobSequence]
+    for (prev_s, s, p) in instance.sSlotsSequence:
+        if (s, p) in job_in and (prev_s, p) in job_in:
+            j, j2 = job_in[s, p], job_in[prev_s, p]
+            arcs.append((j, j2, True))
+            parent[find(plane[j])] = find(plane[j2])
+
+    parts = {}
+    for j, (s, p) in slot_of.items():
+        part = parts.setdefault(find(plane[j]), {'jobs': {}, 'arcs': []})
+        part['jobs'][j] = (value(instance.pJobDuration[j]), value(instance.pEarlyStartOfPlane[plane[j]]),
+                           value(instance.pMFinishSlotJob[s, p, j]), (s, p))
+    for (j, j2, positional) in arcs:
+        if j in slot_of and j2 in slot_of:
+            parts[find(plane[j])]['arcs'].append((j, j2, positional))
+    return list(parts.values())
+
+
+def check_timing(part, tol=1e-6):
+    """
+    Programa lo antes posible los trabajos del subproblema. Devuelve {'feasible', 'start', 'conflict'}, con
+    'conflict' = {'before': [(j, j2)], 'late': (j, fin más tardío) o None}: los pares de trabajos seguidos en una
+    posición en el camino crítico hasta el trabajo que no llega a tiempo, o en el ciclo de precedencias.
+    """
+    jobs, arcs = part['jobs'], part['arcs']
+    predecessors = {j: [] for j in jobs}
+    successors = {j: [] for j in jobs}
+    for (j, j2, positional) in arcs:
+        predecessors[j2].append((j, positional))
+        successors[j].append(j2)
+
+    pending = {j: len(predecessors[j]) for j in jobs}
+    ready = [j for j, n in pending.items() if n == 0]
+    start, critical = {}, {}
+    while ready:
+        j2 = ready.pop()
+        _, release, _, _ = jobs[j2]
+        start[j2], critical[j2] = release, None
+        for (j, positional) in predecessors[j2]:
+            if start[j] + jobs[j][0] > start[j2]:
+                start[j2], critical[j2] = start[j] + jobs[j][0], (j, positional)
+        for j3 in successors[j2]:
+            pending[j3] -= 1
+            if pending[j3] == 0:
+                ready.append(j3)
+
+    if len(start) < len(jobs):
+        # ciclo: cada trabajo sin programar tiene algún predecesor sin programar
+        j2 = next(j for j in jobs if j not in start)
+        walk = []
+        while j2 not in [j for (j, _, _) in walk]:
+            j, positional = next((i, positional) for (i, positional) in predecessors[j2] if i not in start)
+            walk.append((j2, j, positional))
+            j2 = j
+        cycle = walk[[j for (j, _, _) in walk].index(j2):]
+        conflict = [(j, j2) for (j2, j, positional) in cycle if positional]
+        return {'feasible': False, 'start': start, 'conflict': {'before': conflict, 'late': None}}
+
+    late = [j for j in jobs if start[j] + jobs[j][0] > jobs[j][2] + tol]
+    if not late:
+        return {'feasible': True, 'start': start, 'conflict': None}
+    j2 = max(late, key=lambda j: start[j] + jobs[j][0] - jobs[j][2])
+    conflict = {'before': [], 'late': (j2, jobs[j2][2])}
+    while critical[j2] is not None:
+        j, positional = critical[j2]
+        if positional:
+            conflict['before'].append((j, j2))
+        j2 = j
+    return {'feasible': False, 'start': start, 'conflict': conflict}
+
+
+def order_var(instance, j, j2):
+    """
+    v01Before[j, j2] ≥ 1 si j va antes que j2 en alguna posición (en un slot de índice mayor: c13), con una fila
+    por slot de j. Se crea la primera vez que un corte la necesita.
+    """
+    if (j, j2) not in instance.sBendersOrder:
+        instance.sBendersOrder.add((j, j2))
+        x, window = instance.v01JobInSlot, instance.sSlotWindow
+        for p in instance.sPositions:
+            later = []
+            for s in instance.sSlots:
+                if later and (s, p, j) in window:
+                    instance.cBendersOrder.add(instance.v01Before[j, j2] >= x[s, p, j] + sum(later) - 1)
+                if (s, p, j2) in window:
+                    later.append(x[s, p, j2])
+    return instance.v01Before[j, j2]
+
+
+def add_benders_cuts(instance, conflicts, tol=1e-6):
+    """
+    Un corte por conflicto: los órdenes de 'before' no pueden darse todos a la vez y, si el conflicto es un
+    trabajo que acaba tarde, tampoco con ese trabajo en un slot con un fin más tardío igual o menor. Los tiempos no
+    dependen de la posición ni del slot concreto (pMFinishSlotJob sólo depende del nº de slot), así que el corte
+    sirve para todas las asignaciones con los mismos órdenes.
+    """
+    for conflict in conflicts:
+        terms = [order_var(instance, j, j2) for (j, j2) in conflict['before']]
+        bound = len(terms) - 1
+        if conflict['late'] is not None:
+            j, deadline = conflict['late']
+            terms += [instance.v01JobInSlot[s, p, j] for (s, p, j2) in instance.sSlotWindow
+                      if j2 == j and value(instance.pMFinishSlotJob[s, p, j]) <= deadline + tol]
+            bound += 1
+        instance.cBendersCuts.add(sum(terms) <= bound)
+
+
+def complete_timing(instance, solver_name="highs", profile=None, tee=False):
+    """
+    Solución completa de una asignación con programa: activa las restricciones con tiempos, fija las variables de
+    ASSIGNMENT_VARS y calcula tiempos e interferencias con solve_lazy_interference (deja la instancia como el
+    modelo completo). Las variables se liberan al terminar.
+    """
+    set_timing(instance, True)
+    fixed = []
+    for name in ASSIGNMENT_VARS:
+        for v in instance.find_component(name).values():
+            if not v.fixed:
+                v.fix(round(v.value or 0))
+                fixed.append(v)
+    try:
+        return solve_lazy_interference(instance, solver_name, profile, tee=tee)
+    finally:
+        for v in fixed:
+            v.unfix()
+
+
+def set_order_values(instance):
+    # v01Before de la asignación cargada (para que una solución inicial cumpla cBendersOrder)
+    rank = {}
+    for k, s in enumerate(instance.sSlots):
+        for p in instance.sPositions:
+            for j in instance.sJobs:
+                if (s, p, j) in instance.sSlotWindow and (instance.v01JobInSlot[s, p, j].value or 0) > 0.5:
+                    rank[j] = (p, k)
+    for (j, j2) in instance.sBendersOrder:
+        ordered = j in rank and j2 in rank and rank[j][0] == rank[j2][0] and rank[j][1] > rank[j2][1]
+        instance.v01Before[j, j2].set_value(int(ordered), skip_validation=True)
+
+
+def solve_benders(data, solver_name="highs", profile=None, formulation="linear", switch="pairwise", workers=None,
+                  max_iterations=100, time_limit=None, warm=True, tee=False, complete=True):
+    """
+    Resuelve el escenario (read_excel, con su nº de slots) por descomposición de Benders lógica: resuelve el maestro,
+    comprueba los subproblemas de tiempos (en 'workers' procesos si es > 1) y añade un corte por cada subproblema
+    infactible hasta que todos tienen programa, o hasta max_iterations o time_limit segundos (el límite de cada
+    maestro es el del perfil). Con HiGHS o Gurobi el maestro va en el solver persistente.
+    warm=True usa la programación voraz (warm_start.py), que cumple todos los cortes, como solución inicial de cada
+    maestro y como solución si ningún maestro llega a tener programa (o la suya es peor).
+    complete=True calcula después los tiempos de la asignación final (complete_timing) para que get_solution_data y
+    las verificaciones vean la solución completa.
+    Devuelve (instance, result): el resultado del último maestro con la mejor cota de todos ellos (que también lo es
+    del modelo completo) y 'iterations', 'cuts', 'subproblems' (los de la última iteración), 'master_time',
+    'subproblem_time' y 'time'.
+    """
+    t0 = time.perf_counter()
+    instance = master_problem(data, formulation, switch)
+    incumbent = None
+    if warm and warm_start(instance, verbose=tee)['feasible']:
+        incumbent = (value(instance.ObjFunction), [(v, v.value) for v in instance.component_data_objects(Var)])
+    persistent = get_persistent_solver(solver_name, profile) if solver_name in PERSISTENT_SOLVERS else None
+    pool = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    cuts, master_time, subproblem_time, parts, conflicts, bound = 0, 0.0, 0.0, [], [], None
+    try:
+        for iteration in range(1, max_iterations + 1):
+            if incumbent is not None:
+                for v, val in incumbent[1]:
+                    v.set_value(val, skip_validation=True)
+                set_order_values(instance)
+            if persistent is not None:
+                persistent.config.warmstart = incumbent is not None
+                result = solve_persistent(instance, persistent, solver_name, tee=tee)
+            else:
+                result = solve_instance(instance, solver_name, profile, tee=tee, warmstart=incumbent is not None)
+            master_time += result['wall_time']
+            if result['lower_bound'] is not None:
+                bound = result['lower_bound'] if bound is None else max(bound, result['lower_bound'])
+            if not result['has_solution']:
+                break
+            t_sub = time.perf_counter()
+            parts = timing_subproblems(instance)
+            outcomes = list(pool.map(check_timing, parts) if pool is not None else map(check_timing, parts))
+            subproblem_time += time.perf_counter() - t_sub
+            conflicts = [o['conflict'] for o in outcomes if not o['feasible']]
+            if tee:
+                print(f"🔀 Iteración {iteration}: objetivo {result['objective']}, {len(parts)} subproblemas, "
+                      f"{len(conflicts)} cortes")
+            if not conflicts:
+                break
+            add_benders_cuts(instance, conflicts)
+            cuts += len(conflicts)
+            if time_limit is not None and time.perf_counter() - t0 > time_limit:
+                result['termination_condition'] = TerminationCondition.maxTimeLimit
+                break
+        else:
+            # sin converger, la última asignación no tiene programa
+            result['termination_condition'] = TerminationCondition.maxIterations
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    scheduled = result['has_solution'] and not conflicts
+    if incumbent is not None and (not scheduled or incumbent[0] < result['objective'] - 1e-6):
+        for v, val in incumbent[1]:
+            v.set_value(val, skip_validation=True)
+        result.update({'has_solution': True, 'objective': incumbent[0]})
+        scheduled = True
+    if not scheduled:
+        result['has_solution'] = False
+    elif complete:
+        final = complete_timing(instance, solver_name, profile)
+        if final['has_solution']:
+            result['objective'] = final['objective']
+        else:
+            result.update({'termination_condition': final['termination_condition'], 'has_solution': False})
+    if result['has_solution'] and bound is not None:
+        result['gap'] = abs(result['objective'] - bound) / max(abs(result['objective']), 1e-10)
+    result.update({'lower_bound': bound, 'iterations': iteration, 'cuts': cuts, 'subproblems': len(parts),
+                   'master_time': master_time, 'subproblem_time': subproblem_time, 'time': time.perf_counter() - t0})
+    return instance, result
+
+
+if __name__ == "__main__":
+    import argparse
+    from modelo_base import read_excel, create_data, flatten_input_data, get_solution_data
+    from verification import check_solution_vectorized
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="input_data.xlsx")
+    parser.add_argument("--sheet", default="case_4_planes")
+    parser.add_argument("--solver", default="highs", choices=["gurobi", "highs", "cbc"])
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    data = read_excel(args.file, args.sheet)
+    instance, result = solve_benders(data, args.solver, {'time_limit': args.time_limit}, workers=args.workers,
+                                     time_limit=args.time_limit, tee=True)
+    print(f"{result['termination_condition']}: objetivo {result['objective']}, cota {result['lower_bound']}, "
+          f"{result['iterations']} iteraciones, {result['cuts']} cortes, {result['time']:.1f} s")
+    if result['has_solution']:
+        checks = check_solution_vectorized(flatten_input_data(create_data(dict(data), verbose=False)),
+                                           get_solution_data(instance))['constraints_verification']
+        print(f"Restricciones que se cumplen: {sum(v['passed'] for v in checks.values())}/{len(checks)}")
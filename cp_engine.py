@@ -0,0 +1,330 @@
+import sys
+import math
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pyomo.environ import TerminationCondition
+
+from modelo_base import OUTSIDE, create_data, flatten_input_data, job_time_windows
+from solvers import DEFAULT_PROFILE
+from warm_start import slots_from_jobs, _is_entry_exit
+
+
+# Constraint programming engine (OR-Tools CP-SAT, optional dependency): the same problem as ap_pyomo_model without
+# slots. Each job has one optional interval per position it can use (exactly one present), the positions are
+# NoOverlap resources with at most len(sSlots) jobs, and a circuit per position gives the order of its jobs, which
+# is what the switches count. The slots are rebuilt afterwards with slots_from_jobs (the latest job in slot0, as c13
+# and c15 require), so the solution dict is the one of get_solution_data and print_chart / check_solution read it
+# unchanged. The objective is that of fc29_NoMovements at the optimum of the MIP:
+#     - v01JobInSlot and vPresence: one each per job, a constant 2·|J|
+#     - v01SwitchPlanes: one per change of plane between consecutive jobs of a position, plus one in the last used
+#       slot when the position has free slots (c20e)
+#     - vIdle and the delays: always 0 (c28 makes the deadlines hard)
+#     - v01Alpha: with interference="soft", one per pair of sPosPosSlotSlot whose jobs overlap in time, the overlap
+#       that c24_interference_exists of verification.py asks to be marked. The MIP only bounds the presence start
+#       from above and can leave α at 0 for the same schedule, so on this term the two objectives are not
+#       comparable: compare the overlaps of the schedules instead (overlapping_pairs). interference="hard" forbids
+#       them (NoOverlap on each interfering pair of positions).
+# The ortools and highspy wheels bundle different HiGHS builds and only the first one loaded in a process works:
+# after a HiGHS solve ortools fails to import, and after ortools appsi_highs is "not available". solve_cp therefore
+# runs CP-SAT in a spawned process by default (isolated=True), so it can be called next to the MIP; as with any
+# spawn pool, the calling script needs the if __name__ == "__main__" guard.
+
+# Estados de CP-SAT → TerminationCondition de Pyomo, como en el resultado de solve_instance
+CP_STATUS = {
+    'OPTIMAL': TerminationCondition.optimal,
+    'FEASIBLE': TerminationCondition.maxTimeLimit,
+    'INFEASIBLE': TerminationCondition.infeasible,
+    'UNKNOWN': TerminationCondition.maxTimeLimit,
+    'MODEL_INVALID': TerminationCondition.error,
+}
+
+# Modos de las interferencias
+INTERFERENCE_MODES = ('soft', 'hard')
+
+
+def import_cp_model():
+    # cp_model de OR-Tools, con un mensaje claro si no se puede cargar por el conflicto con highspy
+    try:
+        from ortools.sat.python import cp_model
+    except ImportError as err:
+        if 'highspy' in sys.modules:
+            raise ImportError("OR-Tools no se puede cargar en un proceso que ya ha cargado HiGHS (highspy): los dos "
+                              "incluyen versiones distintas de HiGHS. Usar solve_cp(..., isolated=True), que resuelve "
+                              "en un proceso aparte") from err
+        raise ImportError("El motor CP necesita OR-Tools: pip install ortools") from err
+    return cp_model
+
+
+def time_scale(values, max_digits=4, tol=1e-6):
+    # Menor potencia de 10 (hasta 10^max_digits) que hace enteros todos los tiempos; CP-SAT sólo usa enteros
+    for digits in range(max_digits + 1):
+        scale = 10 ** digits
+        if all(abs(v * scale - round(v * scale)) <= tol * scale for v in values):
+            return scale
+    return 10 ** max_digits
+
+
+def cp_model_data(data):
+    # Datos planos de create_data con las ventanas (est, lft) de cada trabajo
+    data_n = flatten_input_data(create_data(dict(data), verbose=False))
+    J = data_n['sJobs']
+    plane = data_n['pPlaneOfJob']
+    sequence = sorted(data_n['sJobSequence'], key=lambda jj: (str(plane[jj[0]]), data_n['pTaskOfJob'][jj[0]]))
+    est, lft = job_time_windows(J, sequence, data_n['pJobDuration'], plane, data_n['pEarlyStartOfPlane'],
+                                data_n['pLateFinishDeadline'], data_n['pHorizon'])
+    return data_n, sequence, est, lft
+
+
+def build_cp_model(data_n, sequence, est, lft, interference="soft", hint=None):
+    """
+    Modelo CP-SAT del problema (ver la cabecera del módulo). Devuelve (model, variables) con las variables
+    que lee solve_cp: 'start', 'end', 'x' ({(j, p): literal}), 'scale' y 'objective_offset'.
+    hint: programación {'jobs': {j: (p, inicio, fin)}} de greedy_schedule que se pasa como solución inicial.
+    """
+    cp_model = import_cp_model()
+
+    if interference not in INTERFERENCE_MODES:
+        raise ValueError(f"interference debe ser uno de {INTERFERENCE_MODES}")
+    S, P, J = data_n['sSlots'], data_n['sPositions'], data_n['sJobs']
+    D, plane = data_n['pJobDuration'], data_n['pPlaneOfJob']
+    scale = time_scale(list(D.values()) + list(est.values()) + list(lft.values()))
+    d = {j: round(D[j] * scale) for j in J}
+    lo = {j: math.ceil(est[j] * scale - 1e-6) for j in J}
+    hi = {j: math.floor(lft[j] * scale + 1e-6) for j in J}
+
+    model = cp_model.CpModel()
+    start = {j: model.NewIntVar(lo[j], max(hi[j] - d[j], lo[j]), f"start[{j}]") for j in J}
+    end = {j: model.NewIntVar(lo[j] + d[j], max(hi[j], lo[j] + d[j]), f"end[{j}]") for j in J}
+    for j in J:
+        model.Add(end[j] == start[j] + d[j])
+        model.Add(end[j] <= hi[j])  # c28/c29: infactible si la ventana no admite el trabajo
+    # c14: cada tarea empieza cuando acaba la anterior de su avión
+    for (j, j2) in sequence:
+        model.Add(start[j2] >= end[j])
+
+    # c16/c26b: una posición por trabajo (los entry/exit sólo en la exterior) y un intervalo opcional por posición
+    candidates = {p: [j for j in J if not _is_entry_exit(j) or p == OUTSIDE] for p in P}
+    x, interval = {}, {}
+    for p in P:
+        for j in candidates[p]:
+            x[j, p] = model.NewBoolVar(f"x[{j},{p}]")
+            interval[j, p] = model.NewOptionalIntervalVar(start[j], d[j], end[j], x[j, p], f"interval[{j},{p}]")
+    for j in J:
+        model.AddExactlyOne(x[j, p] for p in P if (j, p) in x)
+
+    costs = []
+    for p in P:
+        jobs_p = candidates[p]
+        model.AddNoOverlap(interval[j, p] for j in jobs_p)
+        used_slots = sum(x[j, p] for j in jobs_p)
+        model.Add(used_slots <= len(S))
+
+        # Orden de los trabajos de la posición: nodo 0 = inicio/fin, arco i→k si k va justo después de i
+        empty = model.NewBoolVar(f"empty[{p}]")
+        arcs = [(0, 0, empty)]
+        for i, j in enumerate(jobs_p, start=1):
+            arcs.append((i, i, x[j, p].Not()))
+            arcs.append((0, i, model.NewBoolVar(f"first[{j},{p}]")))
+            arcs.append((i, 0, model.NewBoolVar(f"last[{j},{p}]")))
+            for k, j2 in enumerate(jobs_p, start=1):
+                if j2 == j or lo[j] + d[j] + d[j2] > hi[j2]:
+                    continue
+                follows = model.NewBoolVar(f"follows[{j},{j2},{p}]")
+                model.Add(start[j2] >= end[j]).OnlyEnforceIf(follows)
+                arcs.append((i, k, follows))
+                if plane[j] != plane[j2]:
+                    costs.append(follows)
+        model.AddCircuit(arcs)
+        # c20e: cambio al primer slot vacío si la posición se usa y no está llena
+        full = model.NewBoolVar(f"full[{p}]")
+        model.Add(used_slots >= len(S)).OnlyEnforceIf(full)
+        boundary = model.NewBoolVar(f"boundary[{p}]")
+        model.AddBoolOr([empty, full, boundary])
+        costs.append(boundary)
+
+    # c21: dos aviones del mismo cliente no comparten posición
+    planes_of_client = {}
+    for (c, r) in data_n['sPlaneOfClient']:
+        planes_of_client.setdefault(c, []).append(r)
+    shared = {r for planes in planes_of_client.values() if len(planes) > 1 for r in planes}
+    use = {}
+    for p in P:
+        for j in candidates[p]:
+            if plane[j] in shared:
+                if (plane[j], p) not in use:
+                    use[plane[j], p] = model.NewBoolVar(f"use[{plane[j]},{p}]")
+                model.AddImplication(x[j, p], use[plane[j], p])
+        for planes in planes_of_client.values():
+            if len(planes) > 1:
+                model.AddAtMostOne(use[r, p] for r in planes if (r, p) in use)
+
+    # Interferencias entre posiciones de sPositionsInterference
+    pairs = [(p, p2) for (p, p2) in data_n['sPositionsInterference'] if p in candidates and p2 in candidates]
+    if interference == "hard":
+        for p, p2 in {tuple(sorted(pp)) for pp in pairs}:
+            model.AddNoOverlap([interval[j, p] for j in candidates[p]] + [interval[j, p2] for j in candidates[p2]])
+    else:
+        # α: j en p y j2 en p2 se solapan; sólo los pares cuyas ventanas se cortan
+        for (p, p2) in pairs:
+            for j in candidates[p]:
+                for j2 in candidates[p2]:
+                    if plane[j] == plane[j2] or lo[j2] >= hi[j] or lo[j] >= hi[j2]:
+                        continue
+                    alpha = model.NewBoolVar(f"alpha[{j},{j2},{p},{p2}]")
+                    after = model.NewBoolVar(f"after[{j},{j2},{p},{p2}]")
+                    enforce = [x[j, p], x[j2, p2], alpha.Not()]
+                    model.Add(start[j2] >= end[j]).OnlyEnforceIf(enforce + [after])
+                    model.Add(start[j] >= end[j2]).OnlyEnforceIf(enforce + [after.Not()])
+                    costs.append(alpha)
+
+    model.Minimize(sum(costs))
+    if hint is not None:
+        for j, (p, t, _) in hint['jobs'].items():
+            model.AddHint(start[j], round(t * scale))
+            for p2 in P:
+                if (j, p2) in x:
+                    model.AddHint(x[j, p2], int(p2 == p))
+    variables = {'start': start, 'end': end, 'x': x, 'scale': scale, 'objective_offset': 2 * len(J)}
+    return model, variables
+
+
+def schedule_solution(data_n, jobs):
+    """
+    Diccionario de get_solution_data para la programación {j: (p, inicio, fin)}: slots con slots_from_jobs,
+    presencia igual al avión del slot, cambios de avión entre slots consecutivos (como apply_schedule),
+    α de los pares de sPosPosSlotSlot que se solapan y retrasos sobre el fin más tardío de cada avión.
+    """
+    S, P = data_n['sSlots'], data_n['sPositions']
+    plane = data_n['pPlaneOfJob']
+    slots = slots_from_jobs(jobs, S)
+    solution = {key: {} for key in ('duration_slot', 'duration_slot_job', 'start_slot_job', 'finish_slot_job',
+                                    'start_slot', 'finish_slot', 'start_job', 'finish_job', 'presence',
+                                    'plane_in_slot', 'idle', 'start_presence', 'finish_presence', 'switch_planes',
+                                    'plane_delay')}
+    solution['slot_assignment'] = slots
+    plane_in = {}
+    for (s, p), j in slots.items():
+        _, st, fn = jobs[j]
+        r = plane[j]
+        plane_in[s, p] = r
+        solution['start_slot_job'][s, p, j], solution['finish_slot_job'][s, p, j] = st, fn
+        solution['duration_slot_job'][s, p, j] = fn - st
+        solution['start_slot'][s, p], solution['finish_slot'][s, p] = st, fn
+        solution['duration_slot'][s, p] = fn - st
+        solution['presence'][s, p, r] = solution['plane_in_slot'][s, p, r] = 1
+        solution['start_presence'][s, p, r], solution['finish_presence'][s, p, r] = st, fn
+    for j, (_, st, fn) in jobs.items():
+        solution['start_job'][j], solution['finish_job'][j] = st, fn
+    for i in range(len(S) - 1):
+        for p in P:
+            if plane_in.get((S[i], p)) != plane_in.get((S[i + 1], p)):
+                solution['switch_planes'][S[i], p] = 1
+    solution['interference'] = overlapping_pairs(data_n['sPosPosSlotSlot'], solution)
+    for r in data_n['sPlanes']:
+        finish = max((fn for j, (_, _, fn) in jobs.items() if plane[j] == r), default=0)
+        solution['plane_delay'][r] = max(0, finish - data_n['pLateFinishDeadline'][r])
+    return solution
+
+
+def overlapping_pairs(sPosPosSlotSlot, solution, tol=1e-6):
+    # Pares (s,s2,p,p2) cuyos slots se solapan en el tiempo (el solape que comprueba c24 en verification.py)
+    slots, start_slot, finish_slot = solution['slot_assignment'], solution['start_slot'], solution['finish_slot']
+    return [(s, s2, p, p2) for (s, s2, p, p2) in sPosPosSlotSlot
+            if (s, p) in slots and (s2, p2) in slots
+            and start_slot[s, p] < finish_slot[s2, p2] - tol and start_slot[s2, p2] < finish_slot[s, p] - tol]
+
+
+def solution_objective(solution):
+    # Valor de fc29_NoMovements para un diccionario de schedule_solution
+    return (len(solution['slot_assignment']) + len(solution['interference']) + sum(solution['switch_planes'].values())
+            + sum(solution['presence'].values()) + sum(solution['idle'].values())
+            + sum(solution['plane_delay'].values()))
+
+
+def solve_cp(data, profile=None, interference="soft", hint=None, tee=False, isolated=True):
+    """
+    Resuelve el escenario (read_excel) con CP-SAT. profile usa las claves de DEFAULT_PROFILE: time_limit,
+    mip_gap (gap relativo) y threads (nº de workers de CP-SAT). isolated=True resuelve en un proceso aparte
+    (spawn) para que OR-Tools no se cargue junto a HiGHS (ver la cabecera del módulo); isolated=False lo
+    resuelve en este proceso. Devuelve (solution, result, data_n):
+        - solution: diccionario de get_solution_data (None si no hay solución)
+        - result: como solve_instance (solver, termination_condition, status, has_solution, objective,
+          lower_bound, gap, wall_time) más 'interference' (nº de solapes) y 'build_time'
+        - data_n: datos planos de create_data, los que esperan check_solution y check_solution_vectorized
+    El objetivo y la cota están en las unidades de fc29_NoMovements (ver la cabecera del módulo).
+    """
+    if isolated:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            return pool.submit(solve_cp, data, profile, interference, hint, tee, False).result()
+    cp_model = import_cp_model()
+
+    profile = {**DEFAULT_PROFILE, **(profile or {})}
+    t0 = time.perf_counter()
+    data_n, sequence, est, lft = cp_model_data(data)
+    model, variables = build_cp_model(data_n, sequence, est, lft, interference, hint)
+    build_time = time.perf_counter() - t0
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(profile['time_limit'])
+    solver.parameters.relative_gap_limit = profile['mip_gap']
+    if profile['threads']:
+        solver.parameters.num_workers = profile['threads']
+    solver.parameters.log_search_progress = tee
+    t0 = time.perf_counter()
+    status = solver.Solve(model)
+    wall_time = time.perf_counter() - t0
+
+    name = solver.StatusName(status)
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    solution, objective, lower_bound, gap = None, None, None, None
+    if has_solution:
+        scale = variables['scale']
+        jobs = {}
+        for (j, p), lit in variables['x'].items():
+            if solver.Value(lit):
+                jobs[j] = (p, solver.Value(variables['start'][j]) / scale, solver.Value(variables['end'][j]) / scale)
+        solution = schedule_solution(data_n, jobs)
+        objective = solution_objective(solution)
+        lower_bound = solver.BestObjectiveBound() + variables['objective_offset']
+        gap = abs(objective - lower_bound) / max(abs(objective), 1e-10)
+    result = {
+        'solver': 'cp-sat',
+        'termination_condition': CP_STATUS.get(name, TerminationCondition.unknown),
+        'status': name,
+        'has_solution': has_solution,
+        'objective': objective,
+        'lower_bound': lower_bound,
+        'gap': gap,
+        'wall_time': wall_time,
+        'build_time': build_time,
+        'interference': len(solution['interference']) if has_solution else None,
+    }
+    return solution, result, data_n
+
+
+if __name__ == "__main__":
+    import argparse
+    from modelo_base import read_excel, print_chart
+    from verification import check_solution_vectorized
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="input_data.xlsx")
+    parser.add_argument("--sheet", default="case_2_planes")
+    parser.add_argument("--time-limit", type=float, default=300)
+    parser.add_argument("--mip-gap", type=float, default=0.0)
+    parser.add_argument("--interference", default="soft", choices=list(INTERFERENCE_MODES))
+    parser.add_argument("--chart", default=None, help="guardar el diagrama en este html")
+    parser.add_argument("--tee", action="store_true")
+    args = parser.parse_args()
+
+    solution, result, data_n = solve_cp(read_excel(args.file, args.sheet),
+                                        {'time_limit': args.time_limit, 'mip_gap': args.mip_gap},
+                                        args.interference, tee=args.tee)
+    print(f"{result['status']}: objetivo {result['objective']}, cota {result['lower_bound']}, "
+          f"{result['interference']} interferencias, {result['wall_time']:.2f} s")
+    if solution is not None:
+        checks = check_solution_vectorized(data_n, solution)['constraints_verification']
+        failed = [c for c, v in checks.items() if not v['passed']]
+        print(f"Restricciones que se cumplen: {len(checks) - len(failed)}/{len(checks)} {', '.join(failed)}")
+        print_chart(solution, args.chart)
@@ -0,0 +1,120 @@
+import time
+import numpy as np
+from pyomo.environ import TerminationCondition, value
+
+from solvers import PERSISTENT_SOLVERS, get_persistent_solver, solve_persistent, solve_instance
+
+
+# Lazy interference (ap_pyomo_model(lazy_interference=True)): α/β and c22–c24/c26 start empty. c22/c23 only bound
+# βS/βF from below and c26 is met by any β, so a pair (s,s2,p,p2) left out can only change the objective, through
+# α, when both βS and βF are forced to 1: (s2,p2) starts strictly inside the presence of (s,p). The loop solves,
+# adds those pairs and solves again until there are none; then the solution is feasible for the full model with
+# the same objective, and the bound of the relaxed model is a bound of the full one.
+
+
+def presence_times(instance):
+    """
+    Inicio y fin de presencia de cada (s,p) en la solución cargada, igual que start/finish_presence_expr
+    (suma sobre los aviones de los tiempos de presencia, multiplicados por vPresence en la bilineal).
+    """
+    S, P, R = list(instance.sSlots), list(instance.sPositions), list(instance.sPlanes)
+    shape = (len(S), len(P), len(R))
+    def values(var):
+        return np.nan_to_num(np.array([var[s, p, r].value for s in S for p in P for r in R], dtype=float)).reshape(shape)
+    presence = values(instance.vPresence)
+    start = (values(instance.vStartPresence) * presence).sum(axis=2)
+    finish = (values(instance.vFinishPresence) * presence).sum(axis=2)
+    index = {(s, p): (a, b) for a, s in enumerate(S) for b, p in enumerate(P)}
+    return start, finish, index
+
+
+def conflicting_pairs(instance, tol=1e-6):
+    # Pares de sPosPosSlotSlot fuera de sInterference con βS y βF forzados a 1 en la solución cargada
+    start, finish, index = presence_times(instance)
+    pairs = [q for q in instance.sPosPosSlotSlot if q not in instance.sInterference]
+    if not pairs:
+        return []
+    first = np.array([index[s, p] for (s, s2, p, p2) in pairs])
+    second = np.array([index[s2, p2] for (s, s2, p, p2) in pairs])
+    st, fn = start[first[:, 0], first[:, 1]], finish[first[:, 0], first[:, 1]]
+    st2 = start[second[:, 0], second[:, 1]]
+    conflict = (st2 > st + tol) & (fn > st2 + tol)
+    return [pairs[k] for k in np.flatnonzero(conflict)]
+
+
+def add_interference_pairs(instance, pairs, tol=1e-6):
+    """
+    Añade los pares a sInterference con sus α/β, c22–c24, c26 y α en el objetivo. Las nuevas variables toman
+    los valores que imponen los tiempos de presencia de la solución cargada, que sigue siendo factible.
+    """
+    if not pairs:
+        return
+    start, finish, index = presence_times(instance)
+    alphas = []
+    for q in pairs:
+        s, s2, p, p2 = q
+        instance.sInterference.add(q)
+        st, fn, st2 = start[index[s, p]], finish[index[s, p]], start[index[s2, p2]]
+        beta_s, beta_f = int(st2 > st + tol), int(fn > st2 + tol)
+        # c26: un trabajo repartido entre (s,p) y (s2,p2) necesita βS + βF ≥ 1
+        split = any((instance.v01JobInSlot[s, p, j].value or 0) > 0.5 and (instance.v01JobInSlot[s2, p2, j].value or 0) > 0.5
+                    for j in instance.sJobs)
+        beta_s = max(beta_s, int(split and not beta_f))
+        instance.v01BetaS[q].set_value(beta_s)
+        instance.v01BetaF[q].set_value(beta_f)
+        instance.v01Alpha[q].set_value(int(beta_s + beta_f > 1))
+        for constraint in (instance.c22_BetaDefinition1, instance.c23_BetaDefinition2, instance.c24_InterferenceExists):
+            constraint.add(q, constraint.rule(instance, q))
+        if s != s2:
+            c26 = instance.c26_NoOverlapSlots
+            for j in instance.sJobs:
+                c26.add((s, s2, p, p2, j), c26.rule(instance, (s, s2, p, p2, j)))
+        alphas.append(instance.v01Alpha[q])
+    instance.ObjFunction.expr = instance.ObjFunction.expr + sum(alphas)
+
+
+def complete_interference(instance):
+    # Añade el resto de pares con los valores de la solución: la instancia queda igual que el modelo completo
+    add_interference_pairs(instance, [q for q in instance.sPosPosSlotSlot if q not in instance.sInterference])
+
+
+def solve_lazy_interference(instance, solver_name="highs", profile=None, tee=False, warmstart=False, max_rounds=50,
+                            complete=True):
+    """
+    Bucle de cortes sobre una instancia con lazy_interference=True: resuelve, añade los pares en conflicto
+    (conflicting_pairs) y vuelve a resolver partiendo de la solución anterior. Con HiGHS o Gurobi usa el solver
+    persistente, que sólo recibe las variables y restricciones nuevas; con el resto reconstruye cada vez.
+    complete=True añade al final los pares restantes (sin resolver) para que get_solution_data y las
+    verificaciones vean el modelo completo. Devuelve el resultado de la última resolución con
+    'rounds', 'cuts' (pares añadidos por conflicto), 'pairs' (total de sPosPosSlotSlot) y 'time'.
+    """
+    t0 = time.perf_counter()
+    persistent = get_persistent_solver(solver_name, profile) if solver_name in PERSISTENT_SOLVERS else None
+    cuts = 0
+    for rounds in range(1, max_rounds + 1):
+        if persistent is not None:
+            persistent.config.warmstart = warmstart
+            result = solve_persistent(instance, persistent, solver_name, tee=tee)
+        else:
+            result = solve_instance(instance, solver_name, profile, tee=tee, warmstart=warmstart)
+        if not result['has_solution']:
+            break
+        pairs = conflicting_pairs(instance)
+        if tee:
+            print(f"✂️ Ronda {rounds}: objetivo {result['objective']}, {len(pairs)} pares en conflicto")
+        if not pairs:
+            break
+        add_interference_pairs(instance, pairs)
+        cuts += len(pairs)
+        warmstart = True
+    else:
+        # sin converger, la solución no cuenta las interferencias de los últimos pares
+        result['termination_condition'] = TerminationCondition.maxIterations
+    if complete and result['has_solution']:
+        complete_interference(instance)
+        result['objective'] = value(instance.ObjFunction)
+        if result['lower_bound'] is not None:
+            result['gap'] = abs(result['objective'] - result['lower_bound']) / max(abs(result['objective']), 1e-10)
+    result.update({'rounds': rounds, 'cuts': cuts, 'pairs': len(instance.sPosPosSlotSlot),
+                   'time': time.perf_counter() - t0})
+    return result
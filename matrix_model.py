@@ -0,0 +1,479 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from modelo_base import OUTSIDE, read_excel, create_data, flatten_input_data, ap_pyomo_model, solution_from_families
+
+
+# Matrix backend: the linear formulation of ap_pyomo_model as coefficient arrays.
+#   min obj·x   s.t.   A·x (sense) rhs,   lb ≤ x ≤ ub,   x_i ∈ {0,1} if vtype_i == 'B'
+# Each variable family is a block of consecutive columns laid out like a NumPy array over its index sets,
+# so every constraint family is generated with broadcasting instead of one Python call per row.
+# Variables and rows keep the (component name, index) key of the Pyomo model to compare both backends.
+
+
+def _add_var(mm, name, index_sets, vtype, ub=np.inf):
+    shape = tuple(len(idx) for idx in index_sets)
+    size = int(np.prod(shape))
+    cols = mm['n_vars'] + np.arange(size).reshape(shape)
+    mm['n_vars'] += size
+    keys = np.empty(shape, dtype=object)
+    for pos in np.ndindex(*shape):
+        k = tuple(index_sets[d][pos[d]] for d in range(len(shape)))
+        keys[pos] = k[0] if len(k) == 1 else k
+    mm['var_keys'].extend((name, k) for k in keys.ravel())
+    mm['vtype'].append(np.full(size, vtype))
+    mm['lb'].append(np.zeros(size))
+    mm['ub'].append(np.full(size, 1.0 if vtype == 'B' else ub))
+    mm['vars'][name] = cols
+    return cols
+
+
+def _add_rows(mm, name, keys, terms, sense, rhs):
+    # terms: list of (cols, coefs) with cols shaped (n_rows, k) and coefs broadcastable to it
+    n = len(keys)
+    if n == 0:
+        return
+    rows = mm['n_rows'] + np.arange(n)
+    for cols, coefs in terms:
+        cols = np.asarray(cols)
+        coefs = np.broadcast_to(np.asarray(coefs, dtype=float), cols.shape)
+        cols = cols.reshape(n, -1)
+        mm['I'].append(np.repeat(rows, cols.shape[1]))
+        mm['J'].append(cols.ravel())
+        mm['V'].append(coefs.ravel())
+    mm['row_keys'].extend((name, k) for k in keys)
+    mm['sense'].append(np.full(n, sense))
+    mm['rhs'].append(np.broadcast_to(np.asarray(rhs, dtype=float), (n,)).copy())
+    mm['n_rows'] += n
+
+
+def _ragged(pairs, rows):
+    # Sparse (row, col) pairs → (cols, mask) of shape (len(rows), k), k = most pairs in a row; padding has mask 0
+    cols = {row: [] for row in rows}
+    for row, col in pairs:
+        cols[row].append(col)
+    k = max([len(v) for v in cols.values()] + [1])
+    idx = np.zeros((len(rows), k), dtype=int)
+    mask = np.zeros((len(rows), k))
+    for i, row in enumerate(rows):
+        idx[i, :len(cols[row])] = cols[row]
+        mask[i, :len(cols[row])] = 1
+    return idx, mask
+
+
+def build_matrix_model(data):
+    """
+    Construye la formulación lineal de ap_pyomo_model (formulation="linear") en forma matricial a partir
+    del diccionario de read_excel. Devuelve un diccionario con:
+        - A (scipy.sparse.csr_matrix), sense ('<', '>', '='), rhs, obj, lb, ub, vtype ('B'/'C')
+        - var_keys / row_keys: (componente, índice) de cada columna / fila, como en Pyomo
+        - vars: bloque de columnas de cada familia de variables (np.ndarray con la forma de sus índices)
+    """
+    d = flatten_input_data(create_data(data, verbose=False))
+    S, P, J, R, C = d['sSlots'], d['sPositions'], d['sJobs'], d['sPlanes'], d['sClients']
+    iS = {s: i for i, s in enumerate(S)}
+    iP = {p: i for i, p in enumerate(P)}
+    iJ = {j: i for i, j in enumerate(J)}
+    iR = {r: i for i, r in enumerate(R)}
+    K = d['sPosPosSlotSlot']
+
+    D = np.array([float(d['pJobDuration'][j]) for j in J])
+    plane_of_job = np.array([iR[d['pPlaneOfJob'][j]] for j in J])
+    # sPlaneOfClient / sLastJob as padded per-row lists: planes of each client, last jobs of each plane
+    planes_of_client, planes_mask = _ragged([(c, iR[r]) for (c, r) in d['sPlaneOfClient']], C)
+    last_jobs, last_mask = _ragged([(r, iJ[j]) for (j, r) in d['sLastJob']], R)
+    LF = np.array([float(d['pLateFinishDeadline'][r]) for r in R])
+    ES = np.array([float(d['pEarlyStartOfPlane'][r]) for r in R])
+    # Big-M por índice de create_data
+    M_start_job = np.array([float(d['pMStartJob'][j]) for j in J])
+    M_finish_job = np.array([float(d['pMFinishJob'][j]) for j in J])
+    M_start_slot = np.array([[float(d['pMStartSlot'][s, p]) for p in P] for s in S])
+    M_finish_slot = np.array([[float(d['pMFinishSlot'][s, p]) for p in P] for s in S])
+
+    mm = {'n_vars': 0, 'n_rows': 0, 'var_keys': [], 'row_keys': [], 'vtype': [], 'lb': [], 'ub': [],
+          'vars': {}, 'I': [], 'J': [], 'V': [], 'sense': [], 'rhs': []}
+
+    # Variables (mismo orden que ap_pyomo_model)
+    x = _add_var(mm, 'v01JobInSlot', [S, P, J], 'B')
+    ps = _add_var(mm, 'v01PlaneInSlot', [S, P, R], 'B')
+    pp = _add_var(mm, 'v01PlaneInPosition', [R, P], 'B')
+    sw = _add_var(mm, 'v01SwitchPlanes', [S, P], 'B')
+    dS = _add_var(mm, 'vDurationSlot', [S, P], 'C')
+    stS = _add_var(mm, 'vStartSlot', [S, P], 'C')
+    fnS = _add_var(mm, 'vFinishSlot', [S, P], 'C')
+    dJ = _add_var(mm, 'vDurationSlotForJob', [S, P, J], 'C')
+    stJ = _add_var(mm, 'vStartSlotForJob', [S, P, J], 'C')
+    fnJ = _add_var(mm, 'vFinishSlotForJob', [S, P, J], 'C')
+    cp = _add_var(mm, 'vClientPosition', [C, P], 'B')
+    cd = _add_var(mm, 'vClientDelay', [C], 'C')
+    pd_ = _add_var(mm, 'vPlaneDelay', [R], 'C')
+    pr = _add_var(mm, 'vPresence', [S, P, R], 'B')
+    spr = _add_var(mm, 'vStartPresence', [S, P, R], 'C')
+    fpr = _add_var(mm, 'vFinishPresence', [S, P, R], 'C')
+    _add_var(mm, 'vDurPresence', [S, P, R], 'C')
+    idle = _add_var(mm, 'vIdle', [S, P, R], 'B')
+    sj = _add_var(mm, 'vStartJob', [J], 'C')
+    fj = _add_var(mm, 'vFinishJob', [J], 'C')
+    alpha = _add_var(mm, 'v01Alpha', [K], 'B')
+    betaS = _add_var(mm, 'v01BetaS', [K], 'B')
+    betaF = _add_var(mm, 'v01BetaF', [K], 'B')
+
+    nS, nP, nJ, nR = len(S), len(P), len(J), len(R)
+
+    # Ventana de slots (sSlotWindow): c03, c04, c06, c07 y c17 sólo dentro de ella; fuera, x = stJ = fnJ = dJ = 0
+    win = np.zeros(x.shape, dtype=bool)
+    for (s, p, j) in d['sSlotWindow']:
+        win[iS[s], iP[p], iJ[j]] = True
+    keys_sp = [(s, p) for s in S for p in P]
+    keys_spj = [(s, p, j) for s in S for p in P for j in J]
+    keys_spr = [(s, p, r) for s in S for p in P for r in R]
+    keys_sr = [(s, r) for s in S for r in R]
+    keys_win = [k for k, w in zip(keys_spj, win.ravel()) if w]
+    xw, stJw, fnJw = x[win], stJ[win], fnJ[win]
+    M_start_win = np.array([float(d['pMStartSlotJob'][k]) for k in keys_win])
+    M_finish_win = np.array([float(d['pMFinishSlotJob'][k]) for k in keys_win])
+    ones = 1.0
+
+    # c01: Σ_j x ≤ 1
+    _add_rows(mm, 'c01_SingleJobPerSlot', keys_sp, [(x, ones)], '<', 1)
+    # c02: dJ - fnJ + stJ = 0
+    _add_rows(mm, 'c02_SlotJobDuration', keys_spj, [(dJ, 1), (fnJ, -1), (stJ, 1)], '=', 0)
+    # c03/c04 (sSlotWindow): stJ - M·x ≤ 0, fnJ - M·x ≤ 0 con M = inicio/fin más tardío de j en (s,p)
+    _add_rows(mm, 'c03_NullStartTimeIfNotInSlot', keys_win, [(stJw, 1), (xw, -M_start_win)], '<', 0)
+    _add_rows(mm, 'c04_NullFinishTimeIfNotInSlot', keys_win, [(fnJw, 1), (xw, -M_finish_win)], '<', 0)
+    # c05: Σ_{s,p} dJ = D_j
+    _add_rows(mm, 'c05_JobDuration', J, [(dJ.transpose(2, 0, 1), ones)], '=', D)
+    # c06/c07 big-M (sSlotWindow)
+    sj_b = np.broadcast_to(sj, x.shape)[win]
+    fj_b = np.broadcast_to(fj, x.shape)[win]
+    Ms = np.broadcast_to(M_start_job, x.shape)[win]
+    Mf = np.broadcast_to(M_finish_job, x.shape)[win]
+    _add_rows(mm, 'c06_StartJob_upper', keys_win, [(sj_b, 1), (stJw, -1), (xw, Ms)], '<', Ms)
+    _add_rows(mm, 'c06_StartJob_lower', keys_win, [(sj_b, 1), (stJw, -1)], '>', 0)
+    _add_rows(mm, 'c07_FinishJob_lower', keys_win, [(fj_b, 1), (fnJw, -1)], '>', 0)
+    _add_rows(mm, 'c07_FinishJob_upper', keys_win, [(fj_b, 1), (fnJw, -1), (xw, Mf)], '<', Mf)
+    # c08: sj - fj ≤ 0
+    _add_rows(mm, 'c08_StartFinishRelation', J, [(sj, 1), (fj, -1)], '<', 0)
+    # c09: pd_r - Σ_{(j,r) ∈ sLastJob} fj ≥ -Σ_{(j,r) ∈ sLastJob} LF_r
+    _add_rows(mm, 'c09_Plane_delay', R,
+              [(pd_, 1), (fj[last_jobs], -last_mask)], '>', -last_mask.sum(axis=1) * LF)
+    # c10: cd_c - Σ_{(c,r) ∈ sPlaneOfClient} pd_r = 0
+    _add_rows(mm, 'c10_Client_delay', C,
+              [(cd, 1), (pd_[planes_of_client], -planes_mask)], '=', 0)
+    # c11/c12: slot start/finish from jobs
+    _add_rows(mm, 'c11_SlotStartTime', keys_sp, [(stS, 1), (stJ, -1)], '=', 0)
+    _add_rows(mm, 'c12_SlotFinishTime', keys_sp, [(fnS, 1), (fnJ, -1)], '=', 0)
+    # c13: start[s,p] ≥ finish[s2,p] for (s, s2, p) in sSlotsSequence
+    seq = d['sSlotsSequence']
+    _add_rows(mm, 'c13_SlotSequence', seq,
+              [(np.array([stS[iS[s], iP[p]] for (s, s2, p) in seq]), 1),
+               (np.array([fnS[iS[s2], iP[p]] for (s, s2, p) in seq]), -1)], '>', 0)
+    # c14: sj[j2] - fj[j] ≥ 0
+    jseq = d['sJobSequence']
+    _add_rows(mm, 'c14_JobSequence', jseq,
+              [(np.array([sj[iJ[j2]] for (j, j2) in jseq], dtype=int), 1),
+               (np.array([fj[iJ[j]] for (j, j2) in jseq], dtype=int), -1)], '>', 0)
+    # c15: Σ_j x[s,p,j] - Σ_j x[prev,p,j] ≤ 0 (s > primero)
+    keys_sp_next = [(s, p) for s in S[1:] for p in P]
+    _add_rows(mm, 'c15_ConsecutiveSlots', keys_sp_next, [(x[1:], 1), (x[:-1], -1)], '<', 0)
+    # c16: Σ_{s,p} x = 1
+    _add_rows(mm, 'c16_SingleSlotPerJob', J, [(x.transpose(2, 0, 1), ones)], '=', 1)
+    # c17 (sSlotWindow): fnJ - stJ - D_j·x = 0
+    _add_rows(mm, 'c17_DurationIfNotAssigned', keys_win,
+              [(fnJw, 1), (stJw, -1), (xw, -np.broadcast_to(D, x.shape)[win])], '=', 0)
+    # c18: dS - Σ_j dJ = 0
+    _add_rows(mm, 'c18_SlotDuration', keys_sp, [(dS, 1), (dJ, -1)], '=', 0)
+    # c19: ps[s,p,r] - Σ_{j de r} x[s,p,j] = 0 (matriz de incidencia avión-trabajo)
+    inc = (plane_of_job[None, :] == np.arange(nR)[:, None]).astype(float)  # R × J
+    _add_rows(mm, 'c19_PlaneSlotAssignment', keys_spr,
+              [(ps, 1), (np.broadcast_to(x[:, :, None, :], (nS, nP, nR, nJ)), -inc[None, None, :, :])], '=', 0)
+    # c20: pp[r,p] - ps[s,p,r] ≥ 0
+    _add_rows(mm, 'c20_PlaneInPosition', keys_spr,
+              [(np.broadcast_to(pp.T[None, :, :], ps.shape), 1), (ps, -1)], '>', 0)
+    _add_rows(mm, 'cPresentIfWork', keys_spr, [(pr, 1), (ps, -1)], '>', 0)
+    _add_rows(mm, 'cPresentExactlyOne', keys_sr,
+              [(pr.transpose(0, 2, 1), 1), (ps.transpose(0, 2, 1), -1), (idle.transpose(0, 2, 1), -1)], '=', 0)
+    _add_rows(mm, 'c20d_SinglePlanePerPosition', keys_sp, [(pr, 1)], '<', 1)
+    keys_spr_next = [(s, p, r) for s in S[1:] for p in P for r in R]
+    sw_prev = np.broadcast_to(sw[:-1, :, None], pr[1:].shape)
+    _add_rows(mm, 'c20e_PresenceNoJumpF', keys_spr_next, [(pr[:-1], 1), (pr[1:], -1), (sw_prev, -1)], '<', 0)
+    _add_rows(mm, 'c20f_PresenceNoJumpB', keys_spr_next, [(pr[1:], 1), (pr[:-1], -1), (sw_prev, -1)], '<', 0)
+    _add_rows(mm, 'cIdle1', keys_spr, [(idle, 1), (pr, -1), (ps, 1)], '>', 0)
+    _add_rows(mm, 'cIdle2', keys_spr, [(idle, 1), (pr, -1)], '<', 0)
+    stS_b = np.broadcast_to(stS[:, :, None], pr.shape)
+    fnS_b = np.broadcast_to(fnS[:, :, None], pr.shape)
+    Ms = np.broadcast_to(M_start_slot[:, :, None], pr.shape)
+    Mf = np.broadcast_to(M_finish_slot[:, :, None], pr.shape)
+    _add_rows(mm, 'cLinkStartPres', keys_spr, [(spr, 1), (stS_b, -1), (pr, Ms)], '<', Ms.ravel())
+    _add_rows(mm, 'cLinkFinishPres1', keys_spr, [(fpr, 1), (fnS_b, -1), (pr, -Mf)], '>', -Mf.ravel())
+    _add_rows(mm, 'cLinkFinishPres2', keys_spr, [(fpr, 1), (fnS_b, -1), (pr, Mf)], '<', Mf.ravel())
+    _add_rows(mm, 'cLinkStartPresNull', keys_spr, [(spr, 1), (pr, -Ms)], '<', 0)
+    _add_rows(mm, 'cLinkFinishPresNull', keys_spr, [(fpr, 1), (pr, -Mf)], '<', 0)
+    # c21: cp[c,p] - Σ_r A[c,r]·pp[r,p] ≥ 0
+    keys_cp = [(c, p) for c in C for p in P]
+    _add_rows(mm, 'c21_ClientInPosition', keys_cp,
+              [(cp, 1), (pp.T[:, planes_of_client].transpose(1, 0, 2), -planes_mask[:, None, :])], '>', 0)
+    # c22/c23/c24 sobre sPosPosSlotSlot
+    if K:
+        k_sp = np.array([[iS[s], iP[p]] for (s, s2, p, p2) in K])
+        k_s2p2 = np.array([[iS[s2], iP[p2]] for (s, s2, p, p2) in K])
+        spr_a = spr[k_sp[:, 0], k_sp[:, 1], :]
+        spr_b = spr[k_s2p2[:, 0], k_s2p2[:, 1], :]
+        fpr_a = fpr[k_sp[:, 0], k_sp[:, 1], :]
+        _add_rows(mm, 'c22_BetaDefinition1', K,
+                  [(betaS, M_start_slot[k_s2p2[:, 0], k_s2p2[:, 1]]), (spr_a, 1), (spr_b, -1)], '>', 0)
+        _add_rows(mm, 'c23_BetaDefinition2', K,
+                  [(betaF, M_finish_slot[k_sp[:, 0], k_sp[:, 1]]), (spr_b, 1), (fpr_a, -1)], '>', 0)
+        _add_rows(mm, 'c24_InterferenceExists', K, [(alpha, 1), (betaS, -1), (betaF, -1)], '>', -1)
+    # c25: sw[s,p] - pr[s,p,r] - pr[s2,p,r2] ≥ -1
+    swp = d['sSwitchPlanes']
+    if swp:
+        idx = np.array([[iP[p], iS[s], iS[s2], iR[r], iR[r2]] for (p, s, s2, r, r2) in swp])
+        _add_rows(mm, 'c25_SwitchingPlanes', swp,
+                  [(sw[idx[:, 1], idx[:, 0]], 1), (pr[idx[:, 1], idx[:, 0], idx[:, 3]], -1),
+                   (pr[idx[:, 2], idx[:, 0], idx[:, 4]], -1)], '>', -1)
+    # c26: βS + βF - x[s,p,j] - x[s2,p2,j] ≥ -1
+    nov = d['sNoOverlap']
+    if nov:
+        iK = {k: i for i, k in enumerate(K)}
+        idx = np.array([[iK[(s, s2, p, p2)], iS[s], iP[p], iS[s2], iP[p2], iJ[j]] for (s, s2, p, p2, j) in nov])
+        _add_rows(mm, 'c26_NoOverlapSlots', nov,
+                  [(betaS[idx[:, 0]], 1), (betaF[idx[:, 0]], 1),
+                   (x[idx[:, 1], idx[:, 2], idx[:, 5]], -1), (x[idx[:, 3], idx[:, 4], idx[:, 5]], -1)], '>', -1)
+    # c26b: trabajos entry/exit en la posición exterior
+    ee = [j for j in J if str(j).endswith('entry') or str(j).endswith('exit')]
+    if ee:
+        _add_rows(mm, 'c26b_EntryExitOutside', ee, [(x[:, iP[OUTSIDE], [iJ[j] for j in ee]].T, 1)], '=', 1)
+    # c27/c28: ventanas de cada avión
+    _add_rows(mm, 'c28_EarlyStart', J, [(sj, 1)], '>', ES[plane_of_job])
+    _add_rows(mm, 'c29_LateFinish', J, [(fj, 1)], '<', LF[plane_of_job])
+
+    # Objective
+    obj = np.zeros(mm['n_vars'])
+    for block in (x, alpha, sw, pr, cd, idle):
+        obj[block.ravel()] = 1.0
+
+    A = sp.coo_matrix((np.concatenate(mm.pop('V')), (np.concatenate(mm.pop('I')), np.concatenate(mm.pop('J')))),
+                      shape=(mm['n_rows'], mm['n_vars'])).tocsr()
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    mm['A'] = A
+    mm['obj'] = obj
+    mm['sense'] = np.concatenate(mm['sense'])
+    mm['rhs'] = np.concatenate(mm['rhs'])
+    mm['lb'] = np.concatenate(mm['lb'])
+    mm['ub'] = np.concatenate(mm['ub'])
+    for block in (x, dJ, stJ, fnJ):
+        mm['ub'][block[~win]] = 0.0
+    mm['vtype'] = np.concatenate(mm['vtype'])
+    return mm
+
+
+def _mps_name(key):
+    name, idx = key
+    if not isinstance(idx, tuple):
+        idx = (idx,)
+    return f"{name}[{','.join(str(i) for i in idx)}]".replace(' ', '_')
+
+
+def write_mps(mm, file_name):
+    # Free-format MPS; binaries inside MARKER INTORG/INTEND with BV bounds
+    A = mm['A'].tocsc()
+    row_names = [_mps_name(k) for k in mm['row_keys']]
+    col_names = [_mps_name(k) for k in mm['var_keys']]
+    sense_mps = {'<': 'L', '>': 'G', '=': 'E'}
+    lines = ["NAME aircraft_positioning", "ROWS", " N OBJ"]
+    lines += [f" {sense_mps[s]} {n}" for s, n in zip(mm['sense'], row_names)]
+    lines.append("COLUMNS")
+    in_int = False
+    for c, cname in enumerate(col_names):
+        is_int = mm['vtype'][c] == 'B'
+        if is_int and not in_int:
+            lines.append(" MARKER MARKER INTORG")
+            in_int = True
+        elif not is_int and in_int:
+            lines.append(" MARKER MARKER INTEND")
+            in_int = False
+        if mm['obj'][c]:
+            lines.append(f" {cname} OBJ {mm['obj'][c]:.17g}")
+        for k in range(A.indptr[c], A.indptr[c + 1]):
+            lines.append(f" {cname} {row_names[A.indices[k]]} {A.data[k]:.17g}")
+        if A.indptr[c] == A.indptr[c + 1] and not mm['obj'][c]:
+            lines.append(f" {cname} OBJ 0")
+    if in_int:
+        lines.append(" MARKER MARKER INTEND")
+    lines.append("RHS")
+    lines += [f" RHS {row_names[i]} {v:.17g}" for i, v in enumerate(mm['rhs']) if v != 0]
+    lines.append("BOUNDS")
+    for c, cname in enumerate(col_names):
+        if mm['vtype'][c] == 'B':
+            lines.append(f" BV BND {cname}")
+        elif np.isfinite(mm['ub'][c]):
+            lines.append(f" UP BND {cname} {mm['ub'][c]:.17g}")
+    lines.append("ENDATA")
+    with open(file_name, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return file_name
+
+
+def solve_matrix_gurobi(mm, profile=None, tee=True):
+    """
+    Resuelve el modelo matricial con la API matricial de gurobipy (addMVar / addMConstr), sin pasar por
+    Pyomo ni por ficheros. Devuelve el diccionario de resultados de solvers.solve_instance más 'x' (valores).
+    """
+    import gurobipy as gp
+    from gurobipy import GRB
+    from solvers import DEFAULT_PROFILE, solver_options
+
+    profile = {**DEFAULT_PROFILE, **(profile or {})}
+    grb = gp.Model("aircraft_positioning")
+    for key, val in solver_options('gurobi', profile).items():
+        grb.setParam(key, val)
+    if not tee:
+        grb.setParam('OutputFlag', 0)
+    x = grb.addMVar(mm['n_vars'], lb=mm['lb'], ub=mm['ub'],
+                    vtype=np.where(mm['vtype'] == 'B', GRB.BINARY, GRB.CONTINUOUS))
+    sense = np.array([{'<': GRB.LESS_EQUAL, '>': GRB.GREATER_EQUAL, '=': GRB.EQUAL}[s] for s in mm['sense']])
+    grb.addMConstr(mm['A'], x, sense, mm['rhs'])
+    grb.setObjective(mm['obj'] @ x, GRB.MINIMIZE)
+
+    t0 = time.perf_counter()
+    grb.optimize()
+    wall_time = time.perf_counter() - t0
+
+    has_solution = grb.SolCount > 0
+    objective = grb.ObjVal if has_solution else None
+    lower_bound = grb.ObjBound if grb.IsMIP and grb.Status != GRB.INFEASIBLE else None
+    gap = grb.MIPGap if has_solution else None
+    return {
+        'solver': 'gurobi',
+        'termination_condition': grb.Status,
+        'status': 'ok' if has_solution else 'error',
+        'has_solution': has_solution,
+        'objective': objective,
+        'lower_bound': lower_bound,
+        'gap': gap,
+        'wall_time': wall_time,
+        'results': grb,
+        'x': x.X if has_solution else None,
+    }
+
+
+def get_matrix_solution_data(mm, xval, tol=0.5):
+    # Same structure as modelo_base.get_solution_data, read straight from the solution vector of the matrix model
+    keys = mm['var_keys']
+    families = {}
+    for name, cols in mm['vars'].items():
+        cols = cols.ravel()
+        if len(cols) and mm['vtype'][cols[0]] == 'B':
+            cols = cols[xval[cols] > tol]
+            families[name] = ([keys[c][1] for c in cols], np.ones(len(cols)))
+        else:
+            families[name] = ([keys[c][1] for c in cols], np.asarray(xval[cols], dtype=float))
+    return solution_from_families(families)
+
+
+def compare_with_pyomo(data, tol=1e-9):
+    """
+    Comprueba que el modelo matricial es idéntico a ap_pyomo_model(formulation="linear") para los mismos datos:
+    mismas variables (tipo y cotas), mismas filas (coeficientes y lados derechos) y mismo objetivo.
+    Devuelve una lista de diferencias (vacía si son equivalentes).
+    """
+    import copy
+    from pyomo.environ import Constraint, Var, Objective, value
+    from pyomo.repn import generate_standard_repn
+
+    mm = build_matrix_model(copy.deepcopy(data))
+    instance = ap_pyomo_model("linear", concrete_data=flatten_input_data(create_data(copy.deepcopy(data), verbose=False)),
+                              verbose=False)
+    errors = []
+
+    def vkey(v):
+        return (v.parent_component().name, v.index())
+
+    # Variables
+    col = {k: i for i, k in enumerate(mm['var_keys'])}
+    pyomo_vars = {vkey(v): v for v in instance.component_data_objects(Var)}
+    if set(pyomo_vars) != set(col):
+        errors.append(f"Variables distintas: {len(set(pyomo_vars) ^ set(col))} claves no coinciden")
+    for k, v in pyomo_vars.items():
+        if k not in col:
+            continue
+        i = col[k]
+        lb = v.lb if v.lb is not None else -np.inf
+        ub = v.ub if v.ub is not None else np.inf
+        if (mm['vtype'][i] == 'B') != v.is_binary() or lb != mm['lb'][i] or ub != mm['ub'][i]:
+            errors.append(f"Variable {k}: dominio/cotas distintos")
+
+    def normalize(coefs, lo, up):
+        # Same orientation for both backends: first coefficient (by column) positive
+        coefs = {c: a for c, a in coefs.items() if abs(a) > tol}
+        if coefs and coefs[min(coefs)] < 0:
+            coefs = {c: -a for c, a in coefs.items()}
+            lo, up = (-up if up is not None else None), (-lo if lo is not None else None)
+        return coefs, lo, up
+
+    # Filas
+    A = mm['A'].tocsr()
+    mat_rows = {}
+    for i, k in enumerate(mm['row_keys']):
+        coefs = {int(A.indices[t]): float(A.data[t]) for t in range(A.indptr[i], A.indptr[i + 1])}
+        rhs, sense = float(mm['rhs'][i]), mm['sense'][i]
+        lo = rhs if sense in ('>', '=') else None
+        up = rhs if sense in ('<', '=') else None
+        mat_rows[k] = normalize(coefs, lo, up)
+
+    pyomo_rows = {}
+    for c in instance.component_data_objects(Constraint, active=True):
+        repn = generate_standard_repn(c.body, compute_values=True, quadratic=False)
+        coefs = {}
+        for v, a in zip(repn.linear_vars, repn.linear_coefs):
+            coefs[col[vkey(v)]] = coefs.get(col[vkey(v)], 0.0) + float(a)
+        const = float(repn.constant)
+        lo = float(value(c.lower)) - const if c.has_lb() else None
+        up = float(value(c.upper)) - const if c.has_ub() else None
+        pyomo_rows[vkey(c)] = normalize(coefs, lo, up)
+
+    missing = set(pyomo_rows) - set(mat_rows)
+    extra = set(mat_rows) - set(pyomo_rows)
+    if missing:
+        errors.append(f"{len(missing)} filas de Pyomo sin equivalente, p.ej. {sorted(missing, key=str)[:3]}")
+    if extra:
+        errors.append(f"{len(extra)} filas matriciales sin equivalente, p.ej. {sorted(extra, key=str)[:3]}")
+
+    def close(a, b):
+        return (a is None and b is None) or (a is not None and b is not None and abs(a - b) <= tol * max(1, abs(a)))
+
+    for k in set(pyomo_rows) & set(mat_rows):
+        (c1, lo1, up1), (c2, lo2, up2) = pyomo_rows[k], mat_rows[k]
+        if set(c1) != set(c2) or any(not close(c1[i], c2[i]) for i in c1) or not close(lo1, lo2) or not close(up1, up2):
+            errors.append(f"Fila {k} distinta")
+
+    # Objetivo
+    obj = next(instance.component_data_objects(Objective, active=True))
+    repn = generate_standard_repn(obj.expr, compute_values=True)
+    obj_pyomo = np.zeros(mm['n_vars'])
+    for v, a in zip(repn.linear_vars, repn.linear_coefs):
+        obj_pyomo[col[vkey(v)]] += a
+    if not np.allclose(obj_pyomo, mm['obj']):
+        errors.append("Función objetivo distinta")
+    return errors
+
+
+if __name__ == "__main__":
+    # Equivalencia con ap_pyomo_model y tiempos de construcción en todos los casos del Excel
+    import io
+    import contextlib
+    from benchmarks import CASES
+
+    for case in CASES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = read_excel("input_data.xlsx", case)
+        t0 = time.perf_counter()
+        mm = build_matrix_model(data)
+        t_build = time.perf_counter() - t0
+        errors = compare_with_pyomo(data)
+        status = "✅ equivalente" if not errors else "❌ " + "; ".join(errors[:5])
+        print(f"{case:15s} vars={mm['n_vars']:6d} filas={mm['n_rows']:6d} nnz={mm['A'].nnz:7d} "
+              f"construcción={t_build:.3f}s  {status}")
@@ -1,12 +1,18 @@
+import os
+import pickle
+import hashlib
 import datetime
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from pyomo.environ import *
 from math import ceil
+from itertools import combinations
 from datetime import date, timedelta
 from pyomo.util.infeasible import log_infeasible_constraints
-import gurobipy as gp
+from solvers import solve_instance, compute_iis, NONCONVEX_SOLVERS
+from verification import check_solution_vectorized
 
 
 NO_POSITIONS = 5
@@ -18,54 +24,112 @@ POSITIONS_INTERFERE = [
     (OUTSIDE, "position4"), ("position4", OUTSIDE),
     (OUTSIDE, "position5"), ("position5", OUTSIDE)
 ]
+MAX_EXACT_POSITIONS = 12  # estimate_slots: búsqueda exhaustiva de posiciones sin interferencias hasta este nº
 START_DATE = datetime.date.today()
-
-def ap_pyomo_model():
-    model = AbstractModel()
+SCENARIO_CACHE = ".scenario_cache"  # carpeta de la caché de hojas de Excel (None = leer siempre el Excel)
+
+def ap_pyomo_model(formulation="bilinear", concrete_data=None, verbose=True, symmetry=False, lazy_interference=False,
+                   switch="pairwise"):
+    # formulation="bilinear": c22/c23 multiply presence times by vPresence (MIQCP, needs NonConvex in Gurobi)
+    # formulation="linear": presence times are forced to 0 when vPresence=0, so the products become the
+    #                       presence times themselves and the model is a pure MILP
+    # symmetry=True: adds the symmetry-breaking constraints cSym* (equivalent positions and empty slots)
+    # lazy_interference=True: α/β and c22–c24/c26 only for the (s,s2,p,p2) of sInterference, which starts empty and
+    #                         is filled by interference_cuts.py with the pairs found in conflict
+    # switch="pairwise": c25 for every pair of distinct planes in consecutive slots (P·S·R² rows)
+    # switch="aggregated": no c25; the change of occupant of (s,p) is detected per plane by c20e, P·S·R rows
+    #                      (see the note before c25)
+    # concrete_data: flat dict of sets/parameters (create_data output without the {None: ...} nesting).
+    #                If given, a ConcreteModel is built directly from it instead of an AbstractModel.
+    if formulation not in ("bilinear", "linear"):
+        raise ValueError(f"Formulación desconocida: {formulation} (usar 'bilinear' o 'linear')")
+    if switch not in ("pairwise", "aggregated"):
+        raise ValueError(f"Formulación de c25 desconocida: {switch} (usar 'pairwise' o 'aggregated')")
+
+    log = print if verbose else (lambda *args, **kwargs: None)
+    d = concrete_data if concrete_data is not None else {}
+
+    def init(name):
+        # initialize= only for the concrete model; the abstract one gets its data in create_instance
+        return {'initialize': d[name]} if name in d else {}
+
+    model = ConcreteModel() if concrete_data is not None else AbstractModel()
 
     # Sets
-    model.sSlots = Set(ordered=True)
-    model.sJobs = Set()
-    model.sPositions = Set()
-    model.sPlanes = Set()
-    model.sClients = Set()
-    model.sPositionsInterference = Set(dimen=2)
-    model.sPosPosSlotSlot = Set(dimen=4)
-
-    model.sSlotsSequence = Set(dimen=3)
-    model.sJobSequence = Set(dimen=2)
-    model.sSwitchPlanes = Set(dimen=5)
+    model.sSlots = Set(ordered=True, **init('sSlots'))
+    model.sJobs = Set(**init('sJobs'))
+    model.sPositions = Set(**init('sPositions'))
+    model.sPlanes = Set(**init('sPlanes'))
+    model.sClients = Set(**init('sClients'))
+    model.sPositionsInterference = Set(dimen=2, **init('sPositionsInterference'))
+    model.sPosPosSlotSlot = Set(dimen=4, **init('sPosPosSlotSlot'))
+    model.sInterference = Set(dimen=4, within=model.sPosPosSlotSlot,
+                              initialize=lambda m: [] if lazy_interference else list(m.sPosPosSlotSlot))
+
+    model.sSlotsSequence = Set(dimen=3, **init('sSlotsSequence'))
+    model.sJobSequence = Set(dimen=2, **init('sJobSequence'))
+    model.sSwitchPlanes = Set(dimen=5, **(init('sSwitchPlanes') if switch == "pairwise" else {'initialize': []}))
+    model.sNoOverlap = Set(dimen=5, **init('sNoOverlap'))
+    model.sSlotWindow = Set(dimen=3, **init('sSlotWindow'))  # (s,p,j) compatibles con la ventana temporal de j
+    model.sEquivalentPositions = Set(dimen=2, **init('sEquivalentPositions'))  # (p, p2) intercambiables, p antes
+    model.sPlaneOfClient = Set(dimen=2, within=model.sClients * model.sPlanes, **init('sPlaneOfClient'))  # (c, r): r es de c
+    model.sLastJob = Set(dimen=2, within=model.sJobs * model.sPlanes, **init('sLastJob'))  # (j, r): j es el último de r
+
+
+    # {índice en la posición pos: [el otro índice]} de sLastJob y sPlaneOfClient, agrupados una sola vez al
+    # construir cada instancia y guardados en ella (cada create_instance tiene su propia agrupación)
+    def fb_GroupPairs(model):
+        model.grouped_pairs = {}
+        for name, pos in (('sLastJob', 1), ('sPlaneOfClient', 0)):
+            grouped = model.grouped_pairs[name, pos] = {}
+            for pair in model.component(name):
+                grouped.setdefault(pair[pos], []).append(pair[1 - pos])
+
+    model.bGroupPairs = BuildAction(rule=fb_GroupPairs)
+
+    def pairs_by(pairs, pos):
+        return pairs.parent_block().grouped_pairs[pairs.local_name, pos]
 
     # Parameters
-    model.pHorizon = Param(within=NonNegativeReals)
-
-    def _init_M(m):
-        return value(m.pHorizon)
-    model.M = Param(initialize=_init_M)
+    model.pHorizon = Param(within=NonNegativeReals, **init('pHorizon'))
 
-    model.pJobDuration = Param(model.sJobs, mutable=True)
+    model.pJobDuration = Param(model.sJobs, mutable=True, **init('pJobDuration'))
     model.pJobPrecedesJob = Param(model.sJobs, model.sJobs, mutable=True)
-    model.pPlaneOfJob = Param(model.sJobs)
-    model.pAirplaneOfClient = Param(model.sClients, model.sPlanes)
-    model.pLastJobOfPlane = Param(model.sJobs, model.sPlanes, mutable=True)
-    model.pPredictedFinishOfPlane = Param(model.sPlanes, mutable=True)
-    model.pTaskOfJob = Param(model.sJobs, within=NonNegativeIntegers)
-    model.pNumJobsPerPlane = Param(model.sPlanes, within=NonNegativeIntegers)
-    model.prev_slot = Param( model.sSlots,default=None,within=model.sSlots | {None})
-    model.pEarlyStartOfPlane = Param(model.sPlanes, within=NonNegativeReals)
-    model.pLateFinishDeadline = Param(model.sPlanes, within=NonNegativeReals)
+    model.pPlaneOfJob = Param(model.sJobs, **init('pPlaneOfJob'))
+    model.pPredictedFinishOfPlane = Param(model.sPlanes, mutable=True, **init('pPredictedFinishOfPlane'))
+    model.pTaskOfJob = Param(model.sJobs, within=NonNegativeIntegers, **init('pTaskOfJob'))
+    model.pNumJobsPerPlane = Param(model.sPlanes, within=NonNegativeIntegers, **init('pNumJobsPerPlane'))
+    model.prev_slot = Param( model.sSlots,default=None,within=model.sSlots | {None}, **init('prev_slot'))
+    model.pEarlyStartOfPlane = Param(model.sPlanes, mutable=True, within=NonNegativeReals, **init('pEarlyStartOfPlane'))
+    model.pLateFinishDeadline = Param(model.sPlanes, mutable=True, within=NonNegativeReals, **init('pLateFinishDeadline'))
+
+    # Big-M per index (create_data): latest start/finish of job j in slot (s,p) / in any slot, and of slot (s,p)
+    # (mutable, like the durations and time windows they come from, so replanning.py can update them in place)
+    model.pMStartSlotJob = Param(model.sSlotWindow, mutable=True, within=NonNegativeReals, **init('pMStartSlotJob'))
+    model.pMFinishSlotJob = Param(model.sSlotWindow, mutable=True, within=NonNegativeReals, **init('pMFinishSlotJob'))
+    model.pMStartJob = Param(model.sJobs, mutable=True, within=NonNegativeReals, **init('pMStartJob'))
+    model.pMFinishJob = Param(model.sJobs, mutable=True, within=NonNegativeReals, **init('pMFinishJob'))
+    model.pMStartSlot = Param(model.sSlots, model.sPositions, mutable=True, within=NonNegativeReals, **init('pMStartSlot'))
+    model.pMFinishSlot = Param(model.sSlots, model.sPositions, mutable=True, within=NonNegativeReals, **init('pMFinishSlot'))
+
+    # Bounds: outside its slot window a job cannot be in the slot, so x and its slot times are fixed to 0
+    def fb_JobInSlot(model, s, p, j):
+        return (0, 1) if (s, p, j) in model.sSlotWindow else (0, 0)
+
+    def fb_SlotJobTime(model, s, p, j):
+        return (0, None) if (s, p, j) in model.sSlotWindow else (0, 0)
 
     # Variables
-    model.v01JobInSlot = Var(model.sSlots, model.sPositions, model.sJobs, domain=Binary)
+    model.v01JobInSlot = Var(model.sSlots, model.sPositions, model.sJobs, domain=Binary, bounds=fb_JobInSlot)
     model.v01PlaneInSlot = Var(model.sSlots, model.sPositions, model.sPlanes, domain=Binary)
     model.v01PlaneInPosition = Var(model.sPlanes, model.sPositions, domain=Binary)
     model.v01SwitchPlanes = Var(model.sSlots, model.sPositions, domain=Binary)
     model.vDurationSlot = Var(model.sSlots, model.sPositions, within=NonNegativeReals)
     model.vStartSlot = Var(model.sSlots, model.sPositions, within=NonNegativeReals)
     model.vFinishSlot = Var(model.sSlots, model.sPositions, within=NonNegativeReals)
-    model.vDurationSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals)
-    model.vStartSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals)
-    model.vFinishSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals)
+    model.vDurationSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals, bounds=fb_SlotJobTime)
+    model.vStartSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals, bounds=fb_SlotJobTime)
+    model.vFinishSlotForJob = Var(model.sSlots, model.sPositions, model.sJobs, within=NonNegativeReals, bounds=fb_SlotJobTime)
     model.vClientPosition = Var(model.sClients, model.sPositions, domain=Binary)
     model.vClientDelay = Var(model.sClients, within=NonNegativeReals)
     model.vPlaneDelay = Var(model.sPlanes, within=NonNegativeReals)
@@ -79,9 +143,9 @@ def ap_pyomo_model():
     model.vStartJob = Var(model.sJobs, within=NonNegativeReals)  # s_j: global start time of job j
     model.vFinishJob = Var(model.sJobs, within=NonNegativeReals)  # f_j: global finishing time of job j
 
-    model.v01Alpha = Var(model.sPosPosSlotSlot, within=Binary)
-    model.v01BetaS = Var(model.sPosPosSlotSlot, within=Binary)
-    model.v01BetaF = Var(model.sPosPosSlotSlot, within=Binary)
+    model.v01Alpha = Var(model.sInterference, within=Binary)
+    model.v01BetaS = Var(model.sInterference, within=Binary)
+    model.v01BetaF = Var(model.sInterference, within=Binary)
 
 
     # Rule: Ec. cSingleJobPerSlot - Each slot of each position can have one job at a time
@@ -94,11 +158,11 @@ def ap_pyomo_model():
 
     # Rule: Ec. nullStartIfNotAssigned - Starting times are 0 if the job is not assigned to a position
     def fc03_NullStartTimeIfNotInSlot(model, s, p, j):
-        return model.vStartSlotForJob[s, p, j] <= model.pHorizon * model.v01JobInSlot[s, p, j]
+        return model.vStartSlotForJob[s, p, j] <= model.pMStartSlotJob[s, p, j] * model.v01JobInSlot[s, p, j]
 
     # Rule: Ec. nullFinishIfNotAssigned - Finishing times are 0 if the job is not assigned to a position
     def fc04_NullFinishTimeIfNotInSlot(model, s, p, j):
-        return model.vFinishSlotForJob[s, p, j] <= model.pHorizon * model.v01JobInSlot[s, p, j]
+        return model.vFinishSlotForJob[s, p, j] <= model.pMFinishSlotJob[s, p, j] * model.v01JobInSlot[s, p, j]
 
     # Rule: Ec. cJobDuration - The total duration of a job is the sum of the duration of all corresponding slots
     def fc05_JobDuration(model, j):
@@ -138,29 +202,26 @@ def ap_pyomo_model():
 #         )
 
 # Constraits 6 and 7 formulate with Big-M instead of sums - v3.0
-    # 1) vStartJob[j] ≤ vStartSlotForJob[s,p,j] + M·(1 - x[s,p,j])
+    # 1) vStartJob[j] ≤ vStartSlotForJob[s,p,j] + M_j·(1 - x[s,p,j]), M_j = inicio más tardío de j
     def fc06_StartJob_upper(model, s, p, j):
         return model.vStartJob[j] \
             <= model.vStartSlotForJob[s, p, j] \
-            + model.M * (1 - model.v01JobInSlot[s, p, j])
+            + model.pMStartJob[j] * (1 - model.v01JobInSlot[s, p, j])
 
-    # 2) vStartJob[j] ≥ vStartSlotForJob[s,p,j] - M·(1 - x[s,p,j])
+    # 2) vStartJob[j] ≥ vStartSlotForJob[s,p,j] - M·(1 - x[s,p,j]). Con x = 0 c03 ya anula vStartSlotForJob,
+    #    así que basta M = 0
     def fc06_StartJob_lower(model, s, p, j):
-        return model.vStartJob[j] \
-            >= model.vStartSlotForJob[s, p, j] \
-            - model.M * (1 - model.v01JobInSlot[s, p, j])
+        return model.vStartJob[j] >= model.vStartSlotForJob[s, p, j]
 
-    # 3) vFinishJob[j] ≥ vFinishSlotForJob[s,p,j] - M·(1 - x[s,p,j])
+    # 3) vFinishJob[j] ≥ vFinishSlotForJob[s,p,j] - M·(1 - x[s,p,j]). Igual que 2) con c04: M = 0
     def fc07_FinishJob_lower(model, s, p, j):
-        return model.vFinishJob[j] \
-            >= model.vFinishSlotForJob[s, p, j] \
-            - model.M * (1 - model.v01JobInSlot[s, p, j])
+        return model.vFinishJob[j] >= model.vFinishSlotForJob[s, p, j]
 
-    # 4) vFinishJob[j] ≤ vFinishSlotForJob[s,p,j] + M·(1 - x[s,p,j])
+    # 4) vFinishJob[j] ≤ vFinishSlotForJob[s,p,j] + M_j·(1 - x[s,p,j]), M_j = fin más tardío de j
     def fc07_FinishJob_upper(model, s, p, j):
         return model.vFinishJob[j] \
             <= model.vFinishSlotForJob[s, p, j] \
-            + model.M * (1 - model.v01JobInSlot[s, p, j])
+            + model.pMFinishJob[j] * (1 - model.v01JobInSlot[s, p, j])
 
     # Rule: Ec. noNegativeDurationNoCommas - Start time of job must be <= finish time of job
     def fc08_StartFinishRelation(model, j):
@@ -171,8 +232,8 @@ def ap_pyomo_model():
     def fc09_Plane_delay(model,r):
         # para cada (j,r) con L[j,r]=1, impongo H*γ_r ≥ f[j] - T[r]
         return model.vPlaneDelay[r] >= sum(
-            (model.vFinishJob[j] - model.pLateFinishDeadline[r]) * model.pLastJobOfPlane[j, r]
-            for j in model.sJobs if (j, r) in model.pLastJobOfPlane
+            model.vFinishJob[j] - model.pLateFinishDeadline[r]
+            for j in pairs_by(model.sLastJob, 1).get(r, [])
         )
 
     # Rule: Ec. calculating delays of clients
@@ -180,8 +241,7 @@ def ap_pyomo_model():
 #         return m.vClientDelay[c] >= m.vPlaneDelay[r]
 
         return model.vClientDelay[c] == sum(
-            model.vPlaneDelay[r]*model.pAirplaneOfClient[c,r]
-            for r in model.sPlanes if (c, r) in model.pAirplaneOfClient
+            model.vPlaneDelay[r] for r in pairs_by(model.sPlaneOfClient, 0).get(c, [])
         )
 
     # Rule: Ec. slotStartTimeFromJobs - The starting time of a slot
@@ -292,17 +352,35 @@ def ap_pyomo_model():
     # 1) si vPresence=1 entonces vStartPresence = vStartSlot, si vPresence=0 entonces ≤ M·0
     def link_start_presence(model, s, p, r):
         return model.vStartPresence[s, p, r] <= model.vStartSlot[s, p] \
-            + model.M * (1 - model.vPresence[s, p, r])
+            + model.pMStartSlot[s, p] * (1 - model.vPresence[s, p, r])
 
     # 2) si vPresence=1 entonces vFinishPresence ≥ vFinishSlot, si vPresence=0 entonces ≥ -M
     def link_finish_presence_lb(model, s, p, r):
         return model.vFinishPresence[s, p, r] >= model.vFinishSlot[s, p] \
-            - model.M * (1 - model.vPresence[s, p, r])
+            - model.pMFinishSlot[s, p] * (1 - model.vPresence[s, p, r])
 
     # 3) si vPresence=1 entonces vFinishPresence ≤ vFinishSlot, si vPresence=0 entonces ≤ M·0
     def link_finish_presence_ub(model, s, p, r):
         return model.vFinishPresence[s, p, r] <= model.vFinishSlot[s, p] \
-            + model.M * (1 - model.vPresence[s, p, r])
+            + model.pMFinishSlot[s, p] * (1 - model.vPresence[s, p, r])
+
+    # Linear formulation: vStartPresence = vFinishPresence = 0 if the plane is not present in (s,p)
+    def link_start_presence_null(model, s, p, r):
+        return model.vStartPresence[s, p, r] <= model.pMStartSlot[s, p] * model.vPresence[s, p, r]
+
+    def link_finish_presence_null(model, s, p, r):
+        return model.vFinishPresence[s, p, r] <= model.pMFinishSlot[s, p] * model.vPresence[s, p, r]
+
+    # Start/finish time of the presence in slot s of position p: ∑_r startPres·pres (bilinear) or ∑_r startPres (linear)
+    def start_presence_expr(model, s, p):
+        if formulation == "linear":
+            return sum(model.vStartPresence[s, p, r] for r in model.sPlanes)
+        return sum(model.vStartPresence[s, p, r] * model.vPresence[s, p, r] for r in model.sPlanes)
+
+    def finish_presence_expr(model, s, p):
+        if formulation == "linear":
+            return sum(model.vFinishPresence[s, p, r] for r in model.sPlanes)
+        return sum(model.vFinishPresence[s, p, r] * model.vPresence[s, p, r] for r in model.sPlanes)
 
     # def durPres_rule(model, s, p, r):
     #     return model.vDurPresence[s, p, r] == model.vFinishPresence[s, p, r] - model.vStartPresence[s, p, r]
@@ -310,8 +388,7 @@ def ap_pyomo_model():
     # Rule: Client c with some airpline in position p:
     def fc21_ClientInPosition(model, c, p):
         return model.vClientPosition[c, p] >= sum(
-            model.v01PlaneInPosition[r, p] * model.pAirplaneOfClient[c, r]
-            for r in model.sPlanes
+            model.v01PlaneInPosition[r, p] for r in pairs_by(model.sPlaneOfClient, 0).get(c, [])
         )
 
 
@@ -333,19 +410,18 @@ def ap_pyomo_model():
         if (p,p2) not in model.sPositionsInterference:
           return Constraint.Skip
 
-        return model.pHorizon*model.v01BetaS[s,s2,p,p2] \
-         + sum(model.vStartPresence[s,p,r] * model.vPresence[s,p,r] for r in model.sPlanes) >= sum(model.vStartPresence[s2,p2,r] * model.vPresence[s2,p2,r] for r in model.sPlanes)
+        # M = inicio más tardío del slot (s2,p2)
+        return model.pMStartSlot[s2, p2]*model.v01BetaS[s,s2,p,p2] \
+         + start_presence_expr(model, s, p) >= start_presence_expr(model, s2, p2)
 
     # Rule: Ec. fcBetaDefinion2 - Computing if finishing time of slot s in position p is later than starting time of slot s' in position p'
     def fc23_BetaDefinition2(model, s, s2, p, p2):
         if (p, p2) not in model.sPositionsInterference:
             return Constraint.Skip
-            # M·βF + startPres(s2,p2) ≥ finishPres(s,p)
-        return model.pHorizon * model.v01BetaF[s, s2, p, p2] \
-            + sum(model.vStartPresence[s2, p2, r] * model.vPresence[s2, p2, r]
-                  for r in model.sPlanes) \
-            >= sum(model.vFinishPresence[s, p, r] * model.vPresence[s, p, r]
-                   for r in model.sPlanes)
+            # M·βF + startPres(s2,p2) ≥ finishPres(s,p), M = fin más tardío del slot (s,p)
+        return model.pMFinishSlot[s, p] * model.v01BetaF[s, s2, p, p2] \
+            + start_presence_expr(model, s2, p2) \
+            >= finish_presence_expr(model, s, p)
 
     # Rule: Interference between slots
     def fc24_InterferenceExists(model, s, s2, p, p2):
@@ -359,14 +435,10 @@ def ap_pyomo_model():
         return 1 + model.v01SwitchPlanes[s, p] >= model.vPresence[s, p, r] + model.vPresence[s2, p, r2]
 
     # Rule: If a job is split among different slots, these cannot overlap
+    # sNoOverlap only holds (s,s2,p,p2,j) with s != s2 and (s,s2,p,p2) in sPosPosSlotSlot
     def fc26_NoOverlapSlots(model, s, s2, p, p2, j):
-        # Skip if it's the same slot and position
-        if s == s2 or p == p2:
-            return Constraint.Skip
-        # If (s,s2,p,p2) is not in the sPosPosSlotSlot, these cannot overlap
-        if (s, s2, p, p2) not in model.sPosPosSlotSlot:
+        if (s, s2, p, p2) not in model.sInterference:
             return Constraint.Skip
-
         # 1 + βS_{ss'pp'} + βF_{ss'pp'} >= x_{spj} + x_{s'p'j}
         # This ensures that if the same job is assigned to different slots,
         # either one starts after the other finishes or vice versa
@@ -401,26 +473,26 @@ def ap_pyomo_model():
 
     def fc29_NoMovements(model):
         return sum(model.v01JobInSlot[s, p, j] for s in model.sSlots for p in model.sPositions for j in model.sJobs) \
-                + sum(model.v01Alpha[i] for i in model.sPosPosSlotSlot) \
+                + sum(model.v01Alpha[i] for i in model.sInterference) \
                 + sum(model.v01SwitchPlanes[s, p] for p in model.sPositions for s in model.sSlots) \
                 + sum(model.vPresence[s, p, r] for s in model.sSlots for p in model.sPositions for r in model.sPlanes) \
                 + sum(model.vClientDelay[c] for c in model.sClients) \
                 + sum(model.vIdle[s, p, r] for r in model.sPlanes for p in model.sPositions for s in model.sSlots)
 
     # Activating constraints
-    print("Generating c01_SingleJobPerSlot constraint - Eq. cSingleJobPerSlot")
+    log("Generating c01_SingleJobPerSlot constraint - Eq. cSingleJobPerSlot")
     model.c01_SingleJobPerSlot = Constraint(model.sSlots, model.sPositions, rule=fc01_SingleJobPerSlot)
 
-    print("Generating c02_SlotJobDuration constraint - Eq. cSlotJobDuration")
+    log("Generating c02_SlotJobDuration constraint - Eq. cSlotJobDuration")
     model.c02_SlotJobDuration = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc02_SlotJobDuration)
 
-    print("Generating c03_NullStartTimeIfNotInSlot constraint - Eq. nullStartIfNotAssigned")
-    model.c03_NullStartTimeIfNotInSlot = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc03_NullStartTimeIfNotInSlot)
+    log("Generating c03_NullStartTimeIfNotInSlot constraint - Eq. nullStartIfNotAssigned")
+    model.c03_NullStartTimeIfNotInSlot = Constraint(model.sSlotWindow, rule=fc03_NullStartTimeIfNotInSlot)
 
-    print("Generating c04_NullFinishTimeIfNotInSlot constraint - Eq. nullFinishIfNotAssigned")
-    model.c04_NullFinishTimeIfNotInSlot = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc04_NullFinishTimeIfNotInSlot)
+    log("Generating c04_NullFinishTimeIfNotInSlot constraint - Eq. nullFinishIfNotAssigned")
+    model.c04_NullFinishTimeIfNotInSlot = Constraint(model.sSlotWindow, rule=fc04_NullFinishTimeIfNotInSlot)
 
-    print("Generating c05_JobDuration constraint - Eq. cJobDuration")
+    log("Generating c05_JobDuration constraint - Eq. cJobDuration")
     model.c05_JobDuration = Constraint(model.sJobs, rule=fc05_JobDuration)
 
     # ## Activation of constraints 6 and 7 v 1.0
@@ -438,206 +510,348 @@ def ap_pyomo_model():
     # model.c07_GlobalFinishConstraint = Constraint( model.sJobs, rule=fc07_GlobalFinishConstraint)
     #
     # Activation of constraints 6 and 7 v 3.0
-    print("Generating c06_StartJob constraint - Eq. startUpperLowerBound")
-    model.c06_StartJob_upper = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc06_StartJob_upper)
-    model.c06_StartJob_lower = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc06_StartJob_lower)
-    print("Generating c07_GlobalFinishConstraint constraint - Eq. finishUpperLowerBound")
-    model.c07_FinishJob_lower = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc07_FinishJob_lower)
-    model.c07_FinishJob_upper = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc07_FinishJob_upper)
-
-    print("Generating c08_StartFinishRelation constraint - Eq. noNegativeDurationNoCommas")
+    log("Generating c06_StartJob constraint - Eq. startUpperLowerBound")
+    model.c06_StartJob_upper = Constraint(model.sSlotWindow, rule=fc06_StartJob_upper)
+    model.c06_StartJob_lower = Constraint(model.sSlotWindow, rule=fc06_StartJob_lower)
+    log("Generating c07_GlobalFinishConstraint constraint - Eq. finishUpperLowerBound")
+    model.c07_FinishJob_lower = Constraint(model.sSlotWindow, rule=fc07_FinishJob_lower)
+    model.c07_FinishJob_upper = Constraint(model.sSlotWindow, rule=fc07_FinishJob_upper)
+
+    log("Generating c08_StartFinishRelation constraint - Eq. noNegativeDurationNoCommas")
     model.c08_StartFinishRelation = Constraint(model.sJobs, rule=fc08_StartFinishRelation)
 
-    print("Generating c09_PlaneDelay contraint - Eq. cPlaneDelay")
+    log("Generating c09_PlaneDelay contraint - Eq. cPlaneDelay")
     model.c09_Plane_delay = Constraint(model.sPlanes, rule=fc09_Plane_delay)
 
-    print("Generating c10_ClientDelay contraint - Eq. cPlaneDelay")
+    log("Generating c10_ClientDelay contraint - Eq. cPlaneDelay")
     model.c10_Client_delay = Constraint(model.sClients, rule=fc10_Client_delay)
 
-    print("Generating c11_SlotStartTime constraint - Eq. slotStartTimeFromJobs")
+    log("Generating c11_SlotStartTime constraint - Eq. slotStartTimeFromJobs")
     model.c11_SlotStartTime = Constraint(model.sSlots, model.sPositions, rule=fc11_SlotStartTime)
 
-    print("Generating c12_SlotFinishTime constraint - Eq. slotFinishTimeFromJobs")
+    log("Generating c12_SlotFinishTime constraint - Eq. slotFinishTimeFromJobs")
     model.c12_SlotFinishTime = Constraint(model.sSlots, model.sPositions, rule=fc12_SlotFinishTime)
 
-    print("Generating c13_SlotSequence constraint - Eq. SlotSequence")
+    log("Generating c13_SlotSequence constraint - Eq. SlotSequence")
     model.c13_SlotSequence = Constraint(model.sSlotsSequence, rule=fc13_SlotSequence)
 
-    print("Generating c14_JobSequence constraint - Eq. jobPrecedence")
+    log("Generating c14_JobSequence constraint - Eq. jobPrecedence")
     model.c14_JobSequence = Constraint(model.sJobSequence, rule=fc14_JobSequence)
 
-    print("Generating c15_ConsecutiveSlots constraint - Eq. noEmptySlots")
+    log("Generating c15_ConsecutiveSlots constraint - Eq. noEmptySlots")
     model.c15_ConsecutiveSlots = Constraint(model.sSlots, model.sPositions, rule=fc15_ConsecutiveSlots)
 
-    print("Generating c16_SingleSlotPerJob constraint - Eq. 14")
+    log("Generating c16_SingleSlotPerJob constraint - Eq. 14")
     model.c16_SingleSlotPerJob = Constraint(model.sJobs, rule=fc16_SingleSlotPerJob)
 
-    print("Generating c17_DurationIfNotAssigned constraint - Eq. 15")
-    model.c17_DurationIfNotAssigned = Constraint(model.sSlots, model.sPositions, model.sJobs, rule=fc17_DurationIfNotAssigned)
+    log("Generating c17_DurationIfNotAssigned constraint - Eq. 15")
+    model.c17_DurationIfNotAssigned = Constraint(model.sSlotWindow, rule=fc17_DurationIfNotAssigned)
 
-    print("Generating c18_SlotDuration constraint")
+    log("Generating c18_SlotDuration constraint")
     model.c18_SlotDuration = Constraint(model.sSlots, model.sPositions, rule=fc18_SlotDuration)
 
-    print("Generating c19_PlaneSlotAssignment constraint - Eq. cPlaneSlotAssignment")
+    log("Generating c19_PlaneSlotAssignment constraint - Eq. cPlaneSlotAssignment")
     model.c19_PlaneSlotAssignment = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=fc19_PlaneSlotAssignment)
 
-    print("Generating c20_PlaneInPosition constraint")
+    log("Generating c20_PlaneInPosition constraint")
     model.c20_PlaneInPosition= Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=fc20_PlaneInPosition)
 
-    print("Generating c20b and c20c_PlaneAlwaysPresent constraint")
+    log("Generating c20b and c20c_PlaneAlwaysPresent constraint")
     model.cPresentIfWork = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=fc20b_PresentIfWork)
     model.cPresentExactlyOne = Constraint(model.sSlots, model.sPlanes, rule=fc20c_PresentExactlyOne)
 
-    print("Generating c20d_SinglePlanePerPosition constraint")
+    log("Generating c20d_SinglePlanePerPosition constraint")
     model.c20d_SinglePlanePerPosition = Constraint(model.sSlots, model.sPositions, rule=fc20d_SinglePlanePerPosition)
 
     model.c20e_PresenceNoJumpF = Constraint(model.sSlots, model.sPositions, model.sPlanes,rule=fc20e_PresenceNoJumpForward)
     model.c20f_PresenceNoJumpB = Constraint(model.sSlots, model.sPositions, model.sPlanes,rule=fc20f_PresenceNoJumpBackward)
 
-    print("Generating Variables accounting for Idle Jobs")
+    log("Generating Variables accounting for Idle Jobs")
     model.cIdle1 = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=idle_def1)
     model.cIdle2 = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=idle_def2)
     model.cLinkStartPres = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=link_start_presence)
     model.cLinkFinishPres1 = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=link_finish_presence_lb)
     model.cLinkFinishPres2 = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=link_finish_presence_ub)
+    if formulation == "linear":
+        log("Generating cLinkStartPresNull and cLinkFinishPresNull constraints - linear formulation")
+        model.cLinkStartPresNull = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=link_start_presence_null)
+        model.cLinkFinishPresNull = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=link_finish_presence_null)
     # model.cPresDur = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=durPres_rule)
 
 
-    print("Generating c21_ClientInPosition constraint")
+    log("Generating c21_ClientInPosition constraint")
     model.c21_ClientInPosition = Constraint(model.sClients, model.sPositions, rule=fc21_ClientInPosition)
 
-    print("Generating c22_BetaDefinition1 constraint - Eq. fcBetaDefinion1")
-    model.c22_BetaDefinition1 = Constraint(model.sPosPosSlotSlot, rule=fc22_BetaDefinition1)
+    log("Generating c22_BetaDefinition1 constraint - Eq. fcBetaDefinion1")
+    model.c22_BetaDefinition1 = Constraint(model.sInterference, rule=fc22_BetaDefinition1)
 
-    print("Generating c23_BetaDefinition2 constraint - Eq. fcBetaDefinion2")
-    model.c23_BetaDefinition2 = Constraint(model.sPosPosSlotSlot, rule=fc23_BetaDefinition2)
+    log("Generating c23_BetaDefinition2 constraint - Eq. fcBetaDefinion2")
+    model.c23_BetaDefinition2 = Constraint(model.sInterference, rule=fc23_BetaDefinition2)
 
-    print("Generating c24_InterferenceExists constraint")
-    model.c24_InterferenceExists = Constraint(model.sPosPosSlotSlot, rule=fc24_InterferenceExists)
+    log("Generating c24_InterferenceExists constraint")
+    model.c24_InterferenceExists = Constraint(model.sInterference, rule=fc24_InterferenceExists)
 
-    print("Generating c25_SwitchingPlanes constraint - Eq. PlaneSwitchInPOsition")
-    model.c25_SwitchingPlanes = Constraint(model.sSwitchPlanes, rule=fc25_SwitchingPlanes)
+    # c25 is implied by c20d + c20e, also in the LP relaxation: if r is in (s,p) and r2 != r in the next slot s2,
+    # c20d gives vPresence[s2,p,r] ≤ 1 - vPresence[s2,p,r2] and c20e gives
+    # v01SwitchPlanes[s,p] ≥ vPresence[s,p,r] - vPresence[s2,p,r] ≥ vPresence[s,p,r] + vPresence[s2,p,r2] - 1.
+    # switch="aggregated" leaves it out and keeps the O(R) rows of c20e/c20f per (s,p)
+    if switch == "pairwise":
+        log("Generating c25_SwitchingPlanes constraint - Eq. PlaneSwitchInPOsition")
+        model.c25_SwitchingPlanes = Constraint(model.sSwitchPlanes, rule=fc25_SwitchingPlanes)
 
-    print("Generating c26_NoOverlapSlots constraint")
-    model.c26_NoOverlapSlots = Constraint(model.sSlots, model.sSlots, model.sPositions, model.sPositions, model.sJobs, rule=fc26_NoOverlapSlots)
+    log("Generating c26_NoOverlapSlots constraint")
+    model.c26_NoOverlapSlots = Constraint(model.sNoOverlap, rule=fc26_NoOverlapSlots)
 
-    print("Generating c26b_EntryExitOutside constraint")
+    log("Generating c26b_EntryExitOutside constraint")
     model.c26b_EntryExitOutside = Constraint(model.sJobs, rule=fc26b_EntryExitOutside)
 
-    print("Generating c27_EarlyStart constraint")
+    log("Generating c27_EarlyStart constraint")
     model.c28_EarlyStart = Constraint(model.sJobs, rule=fc27_EarlyStart)
 
-    print("Generating c28_LateFinish constraint")
+    log("Generating c28_LateFinish constraint")
     model.c29_LateFinish = Constraint(model.sJobs, rule=fc28_LateFinish)
 
+    if symmetry:
+        # Equivalent positions (same interference neighbours): swapping their whole schedules gives the same
+        # objective, so the position holding the lowest-index job comes first. p2 can only take job j if p
+        # already has some job that is not after j in sJobs
+        def fcSymPositionOrder(model, p, p2, j):
+            jobs = list(model.sJobs)
+            earlier = jobs[:jobs.index(j) + 1]
+            return sum(model.v01JobInSlot[s, p2, j] for s in model.sSlots) <= \
+                sum(model.v01JobInSlot[s, p, j2] for s in model.sSlots for j2 in earlier)
+
+        # Empty slots carry neither presence nor switches: being present in an empty slot costs vPresence +
+        # vIdle, more than the single switch it can save, so no optimal schedule uses it
+        def fcSymEmptyPresence(model, s, p, r):
+            return model.vPresence[s, p, r] <= sum(model.v01JobInSlot[s, p, j] for j in model.sJobs)
+
+        def fcSymEmptySwitch(model, s, p):
+            return model.v01SwitchPlanes[s, p] <= sum(model.v01JobInSlot[s, p, j] for j in model.sJobs)
+
+        log("Generating symmetry breaking constraints")
+        model.cSymPositionOrder = Constraint(model.sEquivalentPositions, model.sJobs, rule=fcSymPositionOrder)
+        model.cSymEmptyPresence = Constraint(model.sSlots, model.sPositions, model.sPlanes, rule=fcSymEmptyPresence)
+        model.cSymEmptySwitch = Constraint(model.sSlots, model.sPositions, rule=fcSymEmptySwitch)
+
     #Objective function
-    print("Generating objective function")
+    log("Generating objective function")
     model.ObjFunction = Objective(rule=fc29_NoMovements, sense=minimize)
 
     return model
 
 
-def read_excel(file_name, sheet_name):
-    df = pd.read_excel(file_name, sheet_name=sheet_name)
+def equivalent_positions(sPositions, sPositionsInterference):
+    """
+    Clases de posiciones intercambiables: las que interfieren exactamente con las mismas posiciones (sin contar
+    la otra). La posición exterior no entra nunca porque los trabajos entry/exit están obligados a ir a ella.
+    """
+    neighbours = {p: set() for p in sPositions}
+    for (p, p2) in sPositionsInterference:
+        neighbours[p].add(p2)
+        neighbours[p2].add(p)
+    classes = []
+    for p in sPositions:
+        if p == OUTSIDE:
+            continue
+        for cls in classes:
+            q = cls[0]
+            if neighbours[p] - {q} == neighbours[q] - {p}:
+                cls.append(p)
+                break
+        else:
+            classes.append([p])
+    return [cls for cls in classes if len(cls) > 1]
+
+
+def slot_names(n_slots):
+    return [f"slot{i}" for i in range(n_slots)]
+
+
+def max_slots(sJobs, pPlaneOfJob, pTaskOfJob, sPositions):
+    """
+    nSlotsMax de read_excel, el máximo de slots que puede añadir solve_with_slot_sizing:
+        - carga: 1.5 × trabajos por posición (sin contar 'outside') + 5
+        - cadena: tareas distintas del avión con más tareas, más sus dos trabajos entry/exit
+    """
+    tasks = {}
+    for j in sJobs:
+        tasks.setdefault(pPlaneOfJob[j], set()).add(pTaskOfJob[j])
+    chain = max((len(t) + 2 for t in tasks.values()), default=1)
+    return max(ceil(len(sJobs) / max(len(sPositions) - 1, 1) * 1.5) + 5, chain)
+
+
+def estimate_slots(sJobs, pPlaneOfJob, sPositions, sPositionsInterference):
+    """
+    Menor nº de slots por posición con el que existe una asignación sin movimientos ni interferencias:
+        - cadena: cada avión puede hacer todas sus tareas seguidas en una sola posición (max. trabajos por avión)
+        - carga: los trabajos se reparten entre las posiciones que no interfieren entre sí
+    Si con este valor el modelo resulta infactible, solve_with_slot_sizing va añadiendo slots. No conserva el
+    óptimo: con más slots puede haber soluciones mejores.
+    """
+    jobs_per_plane = {}
+    for j in sJobs:
+        jobs_per_plane[pPlaneOfJob[j]] = jobs_per_plane.get(pPlaneOfJob[j], 0) + 1
+    chain = max(jobs_per_plane.values(), default=1)
+
+    # Mayor conjunto de posiciones sin pares de interferencia: búsqueda exhaustiva con pocas posiciones; con
+    # muchas (escenarios sintéticos), conjunto voraz por menor nº de interferencias, que sólo puede dar menos
+    # posiciones libres y por tanto más slots
+    interfere = {(p, p2) for (p, p2) in sPositionsInterference} | {(p2, p) for (p, p2) in sPositionsInterference}
+    free_positions = 1
+    if len(sPositions) <= MAX_EXACT_POSITIONS:
+        for k in range(len(sPositions), 1, -1):
+            if any(all((p, p2) not in interfere for p, p2 in combinations(group, 2))
+                   for group in combinations(sPositions, k)):
+                free_positions = k
+                break
+    else:
+        degree = {p: sum((p, p2) in interfere for p2 in sPositions) for p in sPositions}
+        group = []
+        for p in sorted(sPositions, key=lambda p: degree[p]):
+            if all((p, p2) not in interfere for p2 in group):
+                group.append(p)
+        free_positions = len(group)
+    load = ceil(len(sJobs) / free_positions)
+
+    return max(chain, load, 1)
+
+
+def _file_sha256(file_name):
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
+def read_sheet(file_name, sheet_name, cache_dir=SCENARIO_CACHE):
+    """
+    pd.read_excel de una hoja con caché en disco (DataFrame en pickle, uno por hoja) junto al libro.
+    La caché guarda el mtime y el SHA-256 del libro: si el mtime no ha cambiado se carga directamente; si ha
+    cambiado se recalcula el hash y sólo se vuelve a leer el Excel cuando el contenido es distinto.
+    """
+    if cache_dir is None:
+        return pd.read_excel(file_name, sheet_name=sheet_name)
+    folder = os.path.join(os.path.dirname(os.path.abspath(file_name)), cache_dir)
+    stem = os.path.splitext(os.path.basename(file_name))[0]
+    cache_file = os.path.join(folder, f"{stem}.{sheet_name}.pkl")
+    mtime = os.path.getmtime(file_name)
+
+    cached = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                cached = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            cached = None  # caché corrupta o de otra versión de pandas: se regenera
+        # legible pero con otro formato (sin mtime/sha256 o sin DataFrame): también se regenera
+        if not (isinstance(cached, dict) and {'mtime', 'sha256', 'df'} <= cached.keys()
+                and isinstance(cached['df'], pd.DataFrame)):
+            cached = None
+    if cached is not None and cached['mtime'] == mtime:
+        return cached['df'].copy()
+
+    sha = _file_sha256(file_name)
+    if cached is not None and cached['sha256'] == sha:
+        df = cached['df']  # libro tocado pero sin cambios: sólo se actualiza el mtime
+    else:
+        df = pd.read_excel(file_name, sheet_name=sheet_name)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with open(tmp_file, "wb") as f:
+            pickle.dump({'mtime': mtime, 'sha256': sha, 'df': df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)  # escritura atómica: otro proceso nunca lee una caché a medias
+    except OSError:
+        # la caché es sólo una optimización: sin permisos o sin espacio se devuelve la hoja leída igualmente
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+    return df.copy()
+
+
+def read_excel(file_name, sheet_name, cache_dir=SCENARIO_CACHE):
+    df = read_sheet(file_name, sheet_name, cache_dir)
+    df_planes = read_sheet(file_name, 'Planes', cache_dir)
+    return scenario_from_frames(df, df_planes)
+
+
+def default_horizon(df):
+    # Horizonte de read_excel: 1.2 × la suma de duraciones del avión con más trabajo (hoja de trabajos)
+    return float(df.groupby('plane')['duration'].sum().max()) * 1.2
+
+
+def scenario_from_frames(df, df_planes, sPositions=POSITIONS, sPositionsInterference=POSITIONS_INTERFERE,
+                         pHorizon=None):
+    """
+    Diccionario del escenario a partir de la hoja de trabajos (plane, task, job, date, duration, movable,
+    flexible[, client]) y de la hoja 'Planes' (plane, early_start, late_finish). Lo usan read_excel y
+    scenario_generator.py, que además puede cambiar las posiciones, sus interferencias y el horizonte
+    (por defecto 1.2 × la suma de duraciones del avión más largo).
+    """
     sJobs         = df['job'].to_list()
-    pJobDuration  = df.set_index('job')['duration'].to_dict()
-    pDate         = df.set_index('job')['date'].to_dict()
-    pPlaneOfJob   = df.set_index('job')['plane'].to_dict()
-    pTaskOfJob    = df.set_index('job')['task'].to_dict()
+    by_job        = df.set_index('job')
+    pJobDuration  = by_job['duration'].to_dict()
+    pDate         = by_job['date'].to_dict()
+    pPlaneOfJob   = by_job['plane'].to_dict()
+    pTaskOfJob    = by_job['task'].to_dict()
 
-    # Preserve predicted finish of real jobs before adding dummies
-    df['predicted_finish'] = df['date'] + df['duration']
     sPlanes = df['plane'].unique().tolist()
 
     # ------------------------------------------------------------------
     # Dummy entry/exit jobs per plane located in the outside position
+    # (una fila de cada tipo por avión, a partir de la tarea máxima de cada avión)
     # ------------------------------------------------------------------
-    dummy_rows = []
-    for r in sPlanes:
-        df_r = df[df['plane'] == r]
-        max_task = int(df_r['task'].max()) if not df_r.empty else 0
-        dummy_rows.append({
-            'plane': r,
-            'task': 0,
-            'job': f'{r}-entry',
-            'date': 0,
-            'duration': 0.01,
-            'movable': 1,
-            'flexible': 1
-        })
-        dummy_rows.append({
-            'plane': r,
-            'task': max_task + 1,
-            'job': f'{r}-exit',
-            'date': 0,
-            'duration': 0.01,
-            'movable': 1,
-            'flexible': 1
-        })
-    if dummy_rows:
-        df = pd.concat([df, pd.DataFrame(dummy_rows)], ignore_index=True)
+    max_task = df.groupby('plane', sort=False)['task'].max().reindex(sPlanes).fillna(0).astype(int)
+    names = pd.Series(sPlanes).astype(str)
+    dummies = pd.DataFrame({
+        'plane': np.repeat(sPlanes, 2),
+        'task': np.column_stack([np.zeros(len(sPlanes), dtype=int), max_task.to_numpy() + 1]).ravel(),
+        'job': np.column_stack([names + '-entry', names + '-exit']).ravel(),
+        'date': 0,
+        'duration': 0.01,
+        'movable': 1,
+        'flexible': 1,
+    })
+    if len(dummies):
+        df = pd.concat([df, dummies], ignore_index=True)
 
     df['predicted_finish'] = df['date'] + df['duration']
 
     # 2) Clientes: si existe la columna "client", la uso; si no existe, considero que cada avión es cliente propio.
+    # Sólo se guardan los pares (cliente, avión) no nulos.
     if 'client' in df.columns:
-        sClients = df['client'].unique().tolist()
-        dic_pAirplaneOfClient = {}
-        for c in sClients:
-            for r in sPlanes:
-                # 1 si hay al menos una fila donde plane==r y client==c
-                dic_pAirplaneOfClient[(c, r)] = int(bool(
-                    ((df['plane'] == r) & (df['client'] == c)).any()
-                ))
+        pairs = df[['client', 'plane']].dropna().drop_duplicates()
+        sClients = pairs['client'].unique().tolist()
+        dic_pAirplaneOfClient = {(c, r): 1 for c, r in pairs.itertuples(index=False)}
     else:
         # Alternativa: cada avión se trata como su propio cliente
         sClients = sPlanes[:]  # lista de clientes = lista de aviones
-        dic_pAirplaneOfClient = {}
-        for r in sPlanes:
-            for r2 in sPlanes:
-                # Cliente “r” está vinculado solo al avión “r”
-                dic_pAirplaneOfClient[(r, r2)] = 1 if (r2 == r) else 0
-
+        dic_pAirplaneOfClient = {(r, r): 1 for r in sPlanes}
 
     max_finish_by_plane = df.groupby('plane')['predicted_finish'].max().to_dict()
 
-    dic_pLastJobOfPlane = {}
-    for r in sPlanes:
-        df_r = df[df['plane'] == r]
-        if not df_r.empty:
-            tarea_max = int(df_r['task'].max())
-            # Tomo el primer job que tenga esa tarea máxima
-            j_ultimo = df_r[df_r['task'] == tarea_max]['job'].iloc[0]
-            for j in sJobs:
-                dic_pLastJobOfPlane[(j, r)] = 1 if (j == j_ultimo) else 0
-        else:
-            for j in sJobs:
-                dic_pLastJobOfPlane[(j, r)] = 0
-
-    sPositions = POSITIONS
-    sPositionsInterference = POSITIONS_INTERFERE
+    # Último trabajo de cada avión: el primero con la tarea máxima (sólo pares (j, r) no nulos de sJobs)
+    last = df.loc[df['task'] == df.groupby('plane')['task'].transform('max')].drop_duplicates('plane')
+    job_set = set(sJobs)
+    dic_pLastJobOfPlane = {(j, r): 1 for j, r in zip(last['job'], last['plane']) if j in job_set}
 
     # sSlots = ['slot{}'.format(i) for i in range(ceil(len(sJobs) / NO_POSITIONS * 2.5)+4)]
     # sSlots = sorted(sSlots, key=lambda x: int(x.replace('slot', '')))
 
-    # Creación de slots dinámica para evitar fallos del modelo por falta de slots. En función del máximo de tareas de un avión.
-    max_tasks_per_plane = df.groupby('plane')['task'].nunique().max()
+    # Cota holgada anterior: sólo es el máximo de slots que puede añadir solve_with_slot_sizing
+    nSlotsMax = max_slots(sJobs, pPlaneOfJob, pTaskOfJob, sPositions)
 
-    # nº mínimo de slots = ceil( total_jobs / total_positions )
-    N1 = ceil(len(sJobs) / NO_POSITIONS*1.5)+5
-    # Cada avión necesita al menos sus propias tareas en un solo slot
-    N2 = max_tasks_per_plane
-    nSlots = max(N1, N2)
-    sSlots = [f"slot{i}" for i in range(nSlots)]
+    # nº de slots ajustado a las cadenas de tareas, las posiciones y las interferencias
+    nSlots = estimate_slots(sJobs, pPlaneOfJob, sPositions, sPositionsInterference)
+    sSlots = slot_names(nSlots)
 
-    pHorizon = max(
-        sum(pJobDuration[j] for j in sJobs if pPlaneOfJob[j] == r)
-        for r in sPlanes
-    ) * 1.2
+    if pHorizon is None:
+        pHorizon = default_horizon(df[df['job'].isin(job_set)])
 
-    df_planes = pd.read_excel(file_name, sheet_name='Planes')
+    df_planes = df_planes.copy()
     df_planes['plane'] = df_planes['plane'].astype(type(sPlanes[0]))
     # Filtra sólo los aviones que salen en el escenario
     df_planes = df_planes[df_planes['plane'].isin(sPlanes)]
@@ -657,6 +871,7 @@ def read_excel(file_name, sheet_name):
     data = {
         'sJobs': sJobs,
         'sSlots': sSlots,
+        'nSlotsMax': nSlotsMax,
         'sPositions': sPositions,
         'sPlanes': sPlanes,
         'sClients': sClients,
@@ -675,7 +890,67 @@ def read_excel(file_name, sheet_name):
     return data
 
 
-def create_data(data):
+def job_time_windows(sJobs, sJobSequence, pJobDuration, pPlaneOfJob, pEarlyStartOfPlane, pLateFinishDeadline, pHorizon):
+    """
+    Ventana temporal de cada trabajo a partir de la secuencia de tareas de su avión (sJobSequence):
+        - est[j]: inicio más temprano = ES del avión + duración de los trabajos que le preceden
+        - lft[j]: fin más tardío = min(LF del avión, horizonte) - duración de los trabajos que le siguen
+    """
+    est = {j: pEarlyStartOfPlane[pPlaneOfJob[j]] for j in sJobs}
+    lft = {j: min(pLateFinishDeadline[pPlaneOfJob[j]], pHorizon) for j in sJobs}
+    # sJobSequence está ordenada por tareas dentro de cada avión
+    for j, j2 in sJobSequence:
+        est[j2] = max(est[j2], est[j] + pJobDuration[j])
+    for j, j2 in reversed(sJobSequence):
+        lft[j] = min(lft[j], lft[j2] - pJobDuration[j2])
+    return est, lft
+
+
+def job_slot_windows(sJobs, sSlots, pJobDuration, est, lft, tol=1e-6):
+    """
+    Slots en los que puede estar cada trabajo. Los slots son de cada posición y van hacia atrás en el tiempo
+    (c13: el slot anterior empieza después de que acabe el siguiente), así que si j está en el slot s de una
+    posición, después de j hay s trabajos más en esa misma posición (c15). Sólo pueden ir detrás de j los
+    trabajos i que aún caben tras él (est[j] + D[j] + D[i] ≤ lft[i]), y el último de esos s trabajos tiene que
+    acabar antes de su propio lft:
+        est[j] + D[j] + (suma de las s menores duraciones de esos i) ≤ max lft de esos i
+    La precedencia no impide ningún slot por sí sola (los predecesores pueden estar en otra posición), sólo
+    a través de est/lft. Devuelve {j: {slot permitido: fin más tardío de j en ese slot}}, que es
+        min(lft[j], max lft de esos i - suma de las s menores duraciones)
+    """
+    windows = {}
+    for j in sJobs:
+        finish_j = est[j] + pJobDuration[j]
+        after = [i for i in sJobs if i != j and finish_j + pJobDuration[i] <= lft[i] + tol]
+        durations = sorted(pJobDuration[i] for i in after)
+        latest = max((lft[i] for i in after), default=finish_j)
+        windows[j] = {sSlots[0]: max(lft[j], 0)} if sSlots else {}
+        for k, s in enumerate(sSlots[1:len(after) + 1], start=1):
+            latest_finish = min(lft[j], latest - sum(durations[:k]))
+            if finish_j > latest_finish + tol:
+                break
+            windows[j][s] = latest_finish
+    return windows
+
+
+def interfering_slot_pairs(sSlots, sPositions, sPositionsInterference, sSlotWindow, est, pMFinishSlot, tol=1e-6):
+    """
+    (s, s2, p, p2) de posiciones que interfieren cuyos slots pueden coincidir en el tiempo. La ventana de (s,p)
+    va del inicio más temprano de los trabajos que pueden estar en él (est de sSlotWindow) a su fin más tardío
+    (pMFinishSlot); un slot sin trabajos posibles queda siempre vacío. Sólo se guardan los pares cuyas ventanas
+    se cortan, en lugar de todos los S² pares de slots de cada par de posiciones.
+    """
+    earliest = {}
+    for (s, p, j) in sSlotWindow:
+        earliest[s, p] = min(earliest.get((s, p), est[j]), est[j])
+    interfere = set(sPositionsInterference)
+    position_pairs = [(p, p2) for p in sPositions for p2 in sPositions if (p, p2) in interfere and p != p2]
+    return [(s, s2, p, p2) for s in sSlots for s2 in sSlots for (p, p2) in position_pairs
+            if (s, p) in earliest and (s2, p2) in earliest
+            and earliest[s, p] < pMFinishSlot[s2, p2] - tol and earliest[s2, p2] < pMFinishSlot[s, p] - tol]
+
+
+def create_data(data, verbose=True):
     sPositions = data.get('sPositions', None)
     sPositionsInterference = data.get('sPositionsInterference', None)
     sJobs = data.get('sJobs', None)
@@ -690,10 +965,12 @@ def create_data(data):
     pAirplaneOfClient = data.get('pAirplaneOfClient', None)
     pLastJobOfPlane = data.get('pLastJobOfPlane', None)
     pPredictedFinishOfPlane = data.get('pPredictedFinishOfPlane', None)
-    pNumJobsPerPlane = {
-        r: sum(1 for j in sJobs if pPlaneOfJob[j] == r)
-        for r in sPlanes
-    }
+    pNumJobsPerPlane = {r: 0 for r in sPlanes}
+    for j in sJobs:
+        pNumJobsPerPlane[pPlaneOfJob[j]] += 1
+    # Pares no nulos de pAirplaneOfClient / pLastJobOfPlane como conjuntos dispersos
+    sPlaneOfClient = [(c, r) for (c, r), v in pAirplaneOfClient.items() if v]
+    sLastJob = [(j, r) for (j, r), v in pLastJobOfPlane.items() if v]
     pEarlyStartOfPlane = data.get('pEarlyStartOfPlane', { r: 0        for r in sPlanes })
     pLateFinishDeadline = data.get('pLateFinishDeadline', { r: pHorizon for r in sPlanes })
 
@@ -723,14 +1000,15 @@ def create_data(data):
             j2, task2 = task_list[i + 1]
             if task1 < task2:
                 sJobSequence.append((j1, j2))
-            else:
+            elif verbose:
                 print(
                     f"⚠️ Advertencia: Tareas fuera de orden o repetidas para avión {r}: {j1} (tarea {task1}), {j2} (tarea {task2})")
 
     # Visible verification
-    print("Secuencias de trabajos generadas:")
-    for j1, j2 in sJobSequence:
-        print(f"{j1} → {j2}")
+    if verbose:
+        print("Secuencias de trabajos generadas:")
+        for j1, j2 in sJobSequence:
+            print(f"{j1} → {j2}")
 
     # sPosPosSlotSlot = [(s, s2, p, p2) for s in sSlots for s2 in sSlots for p in sPositions for p2 in sPositions if
     #                    (p, p2) in sPositionsInterference and p!=p2]
@@ -745,10 +1023,41 @@ def create_data(data):
 
     consecutive_pairs = [(sSlots[i], sSlots[i + 1]) for i in range(len(sSlots) - 1)]
 
-    sPosPosSlotSlot = [(s, s2, p, p2) for s in sSlots for s2 in sSlots for p in sPositions for p2 in sPositions if (p, p2) in sPositionsInterference and p != p2]
-
     sSwitchPlanes = [(p, s, s2, r, r2) for p in sPositions for (s, s2) in consecutive_pairs for r in sPlanes for r2 in sPlanes if r != r2]
 
+    # Slots en los que puede estar cada trabajo según su ventana temporal; fuera de ella v01JobInSlot = 0
+    est, lft = job_time_windows(sJobs, sJobSequence, pJobDuration, pPlaneOfJob, pEarlyStartOfPlane,
+                                pLateFinishDeadline, pHorizon)
+    slot_windows = job_slot_windows(sJobs, sSlots, pJobDuration, est, lft)
+    sSlotWindow = [(s, p, j) for s in sSlots for p in sPositions for j in sJobs if s in slot_windows[j]]
+
+    # Pares consecutivos de posiciones intercambiables para la ruptura de simetrías (symmetry=True)
+    sEquivalentPositions = [(cls[k], cls[k + 1]) for cls in equivalent_positions(sPositions, sPositionsInterference)
+                            for k in range(len(cls) - 1)]
+
+    # Big-M de cada índice en lugar de pHorizon: el inicio/fin más tardío que puede tener j en (s,p) o en
+    # cualquier slot, y el de cualquier trabajo del slot (s,p) para los enlaces de presencia y c22/c23
+    pMFinishSlotJob = {(s, p, j): slot_windows[j][s] for (s, p, j) in sSlotWindow}
+    pMStartSlotJob = {(s, p, j): max(slot_windows[j][s] - pJobDuration[j], 0) for (s, p, j) in sSlotWindow}
+    pMFinishJob = {j: max(lft[j], 0) for j in sJobs}
+    pMStartJob = {j: max(lft[j] - pJobDuration[j], 0) for j in sJobs}
+    pMStartSlot = {(s, p): 0 for s in sSlots for p in sPositions}
+    pMFinishSlot = {(s, p): 0 for s in sSlots for p in sPositions}
+    for (s, p, j) in sSlotWindow:
+        pMStartSlot[s, p] = max(pMStartSlot[s, p], pMStartSlotJob[s, p, j])
+        pMFinishSlot[s, p] = max(pMFinishSlot[s, p], pMFinishSlotJob[s, p, j])
+    if verbose:
+        print(f"Ventanas de slots: {len(sSlotWindow)} de {len(sSlots) * len(sPositions) * len(sJobs)} (s,p,j) posibles")
+
+    # Pares de slots de posiciones que interfieren cuyas ventanas temporales pueden solaparse
+    sPosPosSlotSlot = interfering_slot_pairs(sSlots, sPositions, sPositionsInterference, sSlotWindow, est, pMFinishSlot)
+    if verbose:
+        n_all = len(sSlots) ** 2 * sum(1 for (p, p2) in sPositionsInterference if p != p2)
+        print(f"Pares de slots con interferencia posible: {len(sPosPosSlotSlot)} de {n_all}")
+
+    # Only (s,s2,p,p2,j) tuples that can produce a c26 constraint: different slots of interfering positions
+    sNoOverlap = [(s, s2, p, p2, j) for (s, s2, p, p2) in sPosPosSlotSlot if s != s2 for j in sJobs]
+
     # FirstSlotOfPlane={}
     # LastSlotOfPlane={}
     # for r in sPlanes:
@@ -779,17 +1088,26 @@ def create_data(data):
         'sJobSequence': {None: sJobSequence},
         # 'sPlaneSlotAssignment': {None: sPlaneSlotAssignment},
         'sSwitchPlanes': {None: sSwitchPlanes},
+        'sNoOverlap': {None: sNoOverlap},
+        'sSlotWindow': {None: sSlotWindow},
+        'sEquivalentPositions': {None: sEquivalentPositions},
         'pHorizon': {None: pHorizon},
         'pJobDuration': pJobDuration,
         'pPlaneOfJob': pPlaneOfJob,
         'pTaskOfJob': pTaskOfJob,
         'pDate': pDate,
-        'pAirplaneOfClient': pAirplaneOfClient,
-        'pLastJobOfPlane': pLastJobOfPlane,
+        'sPlaneOfClient': {None: sPlaneOfClient},
+        'sLastJob': {None: sLastJob},
         'pPredictedFinishOfPlane': pPredictedFinishOfPlane,
         'pNumJobsPerPlane': pNumJobsPerPlane,
         'pEarlyStartOfPlane': pEarlyStartOfPlane,
         'pLateFinishDeadline': pLateFinishDeadline,
+        'pMStartSlotJob': pMStartSlotJob,
+        'pMFinishSlotJob': pMFinishSlotJob,
+        'pMStartJob': pMStartJob,
+        'pMFinishJob': pMFinishJob,
+        'pMStartSlot': pMStartSlot,
+        'pMFinishSlot': pMFinishSlot,
 
     }
     }
@@ -797,44 +1115,115 @@ def create_data(data):
     return input_data
 
 
-def get_solution_data(model):
-    slot_assignment = {(s, p): j for s in model.sSlots for p in model.sPositions for j in model.sJobs if
-                       model.v01JobInSlot[s, p, j].value == 1}
-
-    duration_slot = {(s, p): model.vDurationSlot[s, p].value for s in model.sSlots for p in model.sPositions}
-
-    duration_slot_job = {(s, p, j): model.vDurationSlotForJob[s, p, j].value for s in model.sSlots \
-                         for p in model.sPositions for j in model.sJobs}
-
-    interference = [i for i in model.sPosPosSlotSlot if model.v01Alpha[i].value == 1]
+def flatten_input_data(input_data):
+    # create_data output without the {None: ...} nesting that DataPortal expects
+    return {k: (v[None] if isinstance(v, dict) and None in v else v) for k, v in input_data[None].items()}
 
-    start_slot_job = {(s, p, j): model.vStartSlotForJob[s, p, j].value for s in model.sSlots for p in model.sPositions
-                      for j in model.sJobs}
 
-    finish_slot_job = {(s, p, j): model.vFinishSlotForJob[s, p, j].value for s in model.sSlots for p in model.sPositions
-                       for j in model.sJobs}
+def build_concrete_instance(data, formulation="bilinear", symmetry=False, lazy_interference=False, switch="pairwise"):
+    # Builds the ConcreteModel straight from the read_excel dict, without DataPortal nor create_instance
+    concrete_data = flatten_input_data(create_data(data, verbose=False))
+    return ap_pyomo_model(formulation, concrete_data=concrete_data, verbose=False, symmetry=symmetry,
+                          lazy_interference=lazy_interference, switch=switch)
 
-    start_slot = {(s, p): model.vStartSlot[s, p].value for s in model.sSlots for p in model.sPositions}
 
-    finish_slot = {(s, p): model.vFinishSlot[s, p].value for s in model.sSlots for p in model.sPositions}
+def solve_with_slot_sizing(data, solver_name="gurobi", profile=None, formulation="bilinear", tee=False, step=1,
+                           warm=False, symmetry=False, prepare=None, lazy_interference=False, switch="pairwise"):
+    """
+    Resuelve empezando por el nº de slots de read_excel (estimate_slots) y sólo si el solver demuestra que el
+    modelo es infactible vuelve a construirlo con 'step' slots más (step ≥ 1), hasta data['nSlotsMax']. Con
+    cualquier otro final (solución, límite de tiempo sin solución, error) devuelve ese resultado tal cual.
+    estimate_slots no es una cota que conserve el óptimo: con más slots puede haber soluciones mejores, así que
+    el objetivo y la cota devueltos son los del modelo con result['nSlots'] slots, no los del problema completo.
+    warm=True pasa al solver la solución inicial voraz de warm_start.py cuando es factible.
+    symmetry=True añade las restricciones de ruptura de simetrías (ap_pyomo_model).
+    lazy_interference=True resuelve con el bucle de cortes de interference_cuts.py (c22–c24 sólo para los pares
+    en conflicto).
+    switch="aggregated" deja fuera las c25 por pares de aviones (ap_pyomo_model).
+    prepare(instance), si se indica, se aplica a cada instancia antes de la solución inicial y del solver
+    (p. ej. restricciones adicionales del horizonte rodante).
+    Devuelve (instance, result, data) con los datos del nº de slots usado finalmente (result['nSlots']).
+    """
+    from warm_start import warm_start  # warm_start.py importa este módulo
+    from interference_cuts import solve_lazy_interference
+
+    if step < 1:
+        raise ValueError(f"step debe ser al menos 1 (step={step})")
+    n_slots = len(data['sSlots'])
+    n_max = max(data.get('nSlotsMax', n_slots), n_slots)
+    while True:
+        data_n = {**data, 'sSlots': slot_names(n_slots)}
+        instance = build_concrete_instance(data_n, formulation, symmetry, lazy_interference, switch)
+        if prepare is not None:
+            prepare(instance)
+        start = warm_start(instance, verbose=tee) if warm else {'feasible': False}
+        solve = solve_lazy_interference if lazy_interference else solve_instance
+        result = solve(instance, solver_name, profile=profile, tee=tee, warmstart=start['feasible'])
+        result['nSlots'] = n_slots
+        infeasible = result['termination_condition'] in (TerminationCondition.infeasible,
+                                                         TerminationCondition.infeasibleOrUnbounded)
+        if not infeasible or n_slots >= n_max:
+            return instance, result, data_n
+        print(f"⚠️ Infactible con {n_slots} slots: se reintenta con {min(n_slots + step, n_max)}")
+        n_slots = min(n_slots + step, n_max)
+
+
+# Clave de cada familia de variables en el diccionario de get_solution_data
+SOLUTION_KEYS = {
+    'v01JobInSlot': 'slot_assignment',
+    'vDurationSlot': 'duration_slot',
+    'vDurationSlotForJob': 'duration_slot_job',
+    'v01Alpha': 'interference',
+    'vStartSlotForJob': 'start_slot_job',
+    'vFinishSlotForJob': 'finish_slot_job',
+    'vStartSlot': 'start_slot',
+    'vFinishSlot': 'finish_slot',
+    'vStartJob': 'start_job',
+    'vFinishJob': 'finish_job',
+    'vPresence': 'presence',
+    'v01PlaneInSlot': 'plane_in_slot',
+    'vIdle': 'idle',
+    'vStartPresence': 'start_presence',
+    'vFinishPresence': 'finish_presence',
+    'v01SwitchPlanes': 'switch_planes',
+    'vPlaneDelay': 'plane_delay',
+}
+
+
+def extract_solution(model, names=tuple(SOLUTION_KEYS), tol=0.5):
+    """
+    Lee de una vez los valores de las familias de variables indicadas (por defecto las de get_solution_data).
+    Devuelve {nombre_variable: (índices, valores)} con los valores en un np.ndarray; para las binarias sólo se
+    guardan las asignaciones no nulas (valor > tol). Las variables sin valor se devuelven como 0.
+    """
+    families = {}
+    for name in names:
+        var = model.component(name)
+        keys = list(var.keys())
+        values = np.array([v.value for v in var.values()], dtype=float)  # None → nan
+        values[np.isnan(values)] = 0.0
+        if keys and var[keys[0]].is_binary():
+            nonzero = np.flatnonzero(values > tol)
+            keys, values = [keys[k] for k in nonzero], np.ones(len(nonzero))
+        families[name] = (keys, values)
+    return families
+
+
+def solution_from_families(families):
+    # Diccionario de get_solution_data a partir de {variable: (índices, valores)}; binarias ya filtradas
+    solution = {}
+    for name, key in SOLUTION_KEYS.items():
+        keys, values = families.get(name, ([], np.zeros(0)))
+        solution[key] = dict(zip(keys, values.tolist()))
+    solution['slot_assignment'] = {(s, p): j for (s, p, j) in solution['slot_assignment']}
+    solution['interference'] = list(solution['interference'])
+    return solution
 
-    # Add global job start and finish times
-    start_job = {j: model.vStartJob[j].value for j in model.sJobs}
-    finish_job = {j: model.vFinishJob[j].value for j in model.sJobs}
 
-    solution = {'slot_assignment': slot_assignment,
-                'duration_slot': duration_slot,
-                'duration_slot_job': duration_slot_job,
-                'interference': interference,
-                'start_slot_job': start_slot_job,
-                'finish_slot_job': finish_slot_job,
-                'start_slot': start_slot,
-                'finish_slot': finish_slot,
-                'start_job': start_job,   # Added global job start times
-                'finish_job': finish_job  # Added global job finish times
-               }
+def get_solution_data(model):
+    # Variables de la solución (incluidas presencia, idle y cambios de avión que usa check_solution)
+    return solution_from_families(extract_solution(model))
 
-    return solution
 
 # v1.0 for printing chart
 # def print_chart(solution):
@@ -960,7 +1349,7 @@ def generate_report(df_planes, model_instance, movimientos):
         mov_count[plane] = mov_count.get(plane, 0) + 1
 
     # 6) Resumen por avión
-    p2c = {r: c for (c, r), v in model_instance.pAirplaneOfClient.items() if v == 1}
+    p2c = {r: c for (c, r) in model_instance.sPlaneOfClient}
     resumen = []
     first_start_date = {}
     for avion in sorted(df['plane'].unique()):
@@ -1016,8 +1405,9 @@ def generate_report(df_planes, model_instance, movimientos):
     print("="*90)
     clientes = sorted(model_instance.sClients)
     resumen_c = []
-    c2planes = {c: [r for (c0, r), v in model_instance.pAirplaneOfClient.items() if c0 == c and v == 1]
-                for c in clientes}
+    c2planes = {c: [] for c in clientes}
+    for (c, r) in model_instance.sPlaneOfClient:
+        c2planes[c].append(r)
     for c in clientes:
         planes_c = c2planes.get(c, [])
         df_c = df_det[df_det['Avión'].isin(planes_c)]
@@ -1748,46 +2138,35 @@ def check_solution(data, solution):
                             f"Avión {r} en posiciones distintas solapadas: {p1}({t1_0:.4f}-{t1_1:.4f}) vs {p2}({t2_0:.4f}-{t2_1:.4f})"
                         )
 
-        all_passed = all(entry['passed'] for entry in verification_results.values())
-        summary = {
-            'all_constraints_satisfied': all_passed,
-            'constraints_verification': verification_results
-        }
-        return summary
+    all_passed = all(entry['passed'] for entry in verification_results.values())
+    summary = {
+        'all_constraints_satisfied': all_passed,
+        'constraints_verification': verification_results
+    }
+    return summary
 
-def diagnose_infeasibility(model, input_data, case_name="conflict"):  #Función para poder revisar la no factibilidad del modelo
+def diagnose_infeasibility(model, input_data, case_name="conflict", solver_name="gurobi"):  #Función para poder revisar la no factibilidad del modelo
 
     # 1) crea instancia
     instance = model.create_instance(input_data)
 
-    # 2) vuelca a MPS con labels simbólicos
-    mps_file = f"{case_name}.mps"
-    instance.write(mps_file, format='mps', io_options={'symbolic_solver_labels': True})
-    print(f"✏️  Modelo escrito en {mps_file}")
-
-    # 3) carga y computa IIS
-    grb = gp.read(mps_file)
-    grb.computeIIS()
-    ilp_file = f"{case_name}.ilp"
-    grb.write(ilp_file)
-    print(f"📝 IIS guardado en {ilp_file}")
-
-    # 4) imprime constrains y vars del IIS
-    infeas_cons = [c.constrName for c in grb.getConstrs() if c.IISConstr]
-    infeas_vars = [v.varName    for v in grb.getVars()    if v.IISLB or v.IISUB]
+    # 2) IIS con Gurobi o conjunto de familias en conflicto con HiGHS/CBC
+    iis = compute_iis(instance, solver_name, case_name)
 
+    # 3) imprime constrains y vars del IIS
     print("\n⚠️  Restricciones en el IIS (no pueden satisfacerse todas):")
-    for name in infeas_cons:
+    for name in iis['constraints']:
         print("   •", name)
 
     print("\n⚠️  Variables implicadas en el IIS (bounds conflictivas):")
-    for name in infeas_vars:
+    for name in iis['variables']:
         print("   •", name)
+    return iis
 
 
 if __name__ == "__main__":
 
-    # reading data from Excel
+    # reading data from Excel (para resolver todas las hojas en paralelo con un resumen: python batch.py)
     # data = read_excel("input_data.xlsx", "case_1_plane")
     # data = read_excel("input_data.xlsx", "case_2_planes")
     # data = read_excel("input_data.xlsx", "case_3_planes")
@@ -1801,57 +2180,42 @@ if __name__ == "__main__":
     print(f"Slots cargados: {len(data['sSlots'])}, Ejemplo: {data['sSlots'][:3]}")
     print(f"Posiciones cargadas: {len(data['sPositions'])}, Ejemplo: {data['sPositions'][:3]}")
 
-    # Getting input data using the function that fills the dict out
-    input_data = create_data(data)
-
-    # Creating the Pyomo model object
-    model = ap_pyomo_model()
-
-    # Creating an instance of the model with input data in input_data dict.
-    instance = model.create_instance(input_data)
+    # Solver: 'gurobi', 'highs' o 'cbc'. Los solvers abiertos necesitan la formulación lineal de c22/c23
+    SOLVER_NAME = "gurobi"
+    SOLVER_PROFILE = {
+        'time_limit': 1000,       # Límite de tiempo en segundos
+        'mip_gap': 0.10,          # Gap relativo (10%)
+        'heuristic_focus': True,  # Priorizar heurísticas sobre Branch and Bound
+    }
+    formulation = "bilinear" if SOLVER_NAME in NONCONVEX_SOLVERS else "linear"
+    WARM_START = True  # Solución inicial voraz (warm_start.py) como MIP start
+    SYMMETRY = False   # Restricciones de ruptura de simetrías (posiciones equivalentes y slots vacíos)
+
+    # Resolución del modelo: empieza con los slots de estimate_slots y añade más sólo si resulta infactible
+    print(f"\nIniciando resolución con {SOLVER_NAME}...\n")
+    instance, result, data = solve_with_slot_sizing(data, SOLVER_NAME, profile=SOLVER_PROFILE,
+                                                    formulation=formulation, tee=True, warm=WARM_START,
+                                                    symmetry=SYMMETRY)  # tee=True muestra la salida del solucionador en la consola
+    results = result['results']
+    print(f"Slots utilizados: {result['nSlots']} (máximo {data['nSlotsMax']}); el objetivo y la cota son los del "
+          f"modelo con {result['nSlots']} slots, con más slots podría haber soluciones mejores")
 
     # Printing the model on the console
     # instance.pprint()
-
-    # Seting the solver
-    opt = SolverFactory('gurobi')
-
-    # Configuración para mostrar el log detallado de Gurobi
-    opt.options['OutputFlag'] = 1        # Activar salida de log
-    opt.options['LogToConsole'] = 1      # Mostrar log en consola
-    # opt.options['LogFile'] = 'gurobi.log' # También guardar log en archivo
-    opt.options['DisplayInterval'] = 1   # Actualizar cada segundo
-
-    # Configuración de límites para la resolución
-    opt.options['TimeLimit'] = 1000       # Límite de tiempo en segundos (8 minutos)
-    opt.options['MIPGap'] = 0.10         # Gap relativo (5%)
-
-    # Configuración para priorizar heurísticas sobre Branch and Bound
-    opt.options['Heuristics'] = 1.0      # Máximo esfuerzo en heurísticas (valor entre 0 y 1)
-    opt.options['RINS'] = 1             # Frecuencia de la heurística RINS (menor valor = más frecuente)
-    opt.options['MIPFocus'] = 3          # Enfoque en encontrar soluciones factibles rápidamente
-    opt.options['ImproveStartGap'] = 0.5  # Comenzar a mejorar la solución cuando el gap sea < 50%
-    opt.options['NoRelHeurTime'] = 120    # Aplicar heurísticas en los primeros segundos indicados
-
-    # Reducir el esfuerzo de Branch and Bound
-    opt.options['BranchDir'] = -1        # Favorecer branch hacia abajo (menos exploración)
-    opt.options['MinRelNodes'] = 1000    # Limitar el número de nodos procesados
-
-    # Resolución del modelo
-    print("\nIniciando resolución con Gurobi...\n")
-    results = opt.solve(instance, tee=True)  # tee=True muestra la salida del solucionador en la consola
-    print("\nEstado del solucionador:", results.solver.status.value)
+    print("\nEstado del solucionador:", result['status'])
 
     # En caso de modelo no resoluble, se genera informe de restriciones que causan que el modelo sea no factible
-    if results.solver.termination_condition == TerminationCondition.infeasible:
-        diagnose_infeasibility(model, input_data, case_name="case2_conflict")
-        raise RuntimeError("Modelo infactible: revisa el IIS en case2_conflict.ilp")
+    if result['termination_condition'] == TerminationCondition.infeasible:
+        model = ap_pyomo_model(formulation=formulation)
+        input_data = create_data(data)
+        iis = diagnose_infeasibility(model, input_data, case_name="case2_conflict", solver_name=SOLVER_NAME)
+        raise RuntimeError(f"Modelo infactible: revisa el IIS en {iis['file']}")
 
     solution = get_solution_data(instance)
 
-    if results.solver.status.value == "ok":
+    if result['has_solution']:
         print("Solución encontrada. Verificando restricciones...")
-        verification = check_solution(data, solution)
+        verification = check_solution_vectorized(data, solution)
 
         if verification['all_constraints_satisfied']:
             print("✅ Todas las restricciones se cumplen correctamente.")
@@ -1859,7 +2223,7 @@ if __name__ == "__main__":
             print("❌ Se encontraron violaciones en las restricciones:")
             for constraint, result in verification['constraints_verification'].items():
                 if not result['passed']:
-                    print(f"  - Restricción '{constraint}' fallida:")
+                    print(f"  - Restricción '{constraint}' fallida (violación máx. {result['max_violation']:.4g}):")
                     for error in result['errors']:
                         print(f"    * {error}")
 
@@ -1869,7 +2233,7 @@ if __name__ == "__main__":
         print("="*80)
 
         # Verificar razón de terminación
-        termination_condition = results.solver.termination_condition
+        termination_condition = result['termination_condition']
         print(f"Condición de terminación: {termination_condition}")
 
         if termination_condition == TerminationCondition.optimal:
@@ -1882,23 +2246,18 @@ if __name__ == "__main__":
             print("🎯 Se alcanzó el gap relativo objetivo")
         else:
             print(f"Otra condición: {termination_condition}")
-            if results.solver.termination_condition == TerminationCondition.infeasible:
+            if termination_condition == TerminationCondition.infeasible:
                 log_infeasible_constraints(instance)
                 raise SystemExit("Modelo inviable para case_2_planes: revisa el log")
 
-        # Obtener estadísticas adicionales si están disponibles
-        try:
-            if hasattr(results.problem, 'lower_bound') and hasattr(results.problem, 'upper_bound'):
-                lower_bound = results.problem.lower_bound
-                upper_bound = results.problem.upper_bound
-
-                if upper_bound and lower_bound:
-                    gap = abs(upper_bound - lower_bound) / max(abs(upper_bound), 1e-10) * 100
-                    print(f"\nGap final: {gap:.4f}%")
-                    print(f"Cota inferior: {lower_bound:.6f}")
-                    print(f"Cota superior: {upper_bound:.6f}")
-        except:
+        # Cotas y gap comunes a todos los solvers
+        if result['gap'] is not None:
+            print(f"\nGap final: {result['gap'] * 100:.4f}%")
+            print(f"Cota inferior: {result['lower_bound']:.6f}")
+            print(f"Cota superior: {result['objective']:.6f}")
+        else:
             print("\nNo se pudieron obtener estadísticas de cotas")
+        print(f"Tiempo de ejecución: {result['wall_time']:.2f} segundos")
 
         # Estadísticas adicionales
         try:
@@ -1909,8 +2268,6 @@ if __name__ == "__main__":
                     bb_stats = stats.branch_and_bound
                     print(f"Nodos explorados: {bb_stats.get('number_of_nodes_explored', 'N/A')}")
                     print(f"Iteraciones: {bb_stats.get('number_of_iterations', 'N/A')}")
-                if hasattr(stats, 'wall_time'):
-                    print(f"Tiempo de ejecución: {stats.wall_time:.2f} segundos")
         except:
             print("\nNo se pudieron obtener estadísticas adicionales")
 
@@ -1947,7 +2304,7 @@ if __name__ == "__main__":
         for r in instance.sPlanes:
             print(f"Avión {r}:")
             for j in instance.sJobs:
-                if (j, r) in instance.pLastJobOfPlane and value(instance.pLastJobOfPlane[j, r]) == 1:
+                if (j, r) in instance.sLastJob:
                     f_real = instance.vFinishJob[j].value
                     f_teor = instance.pPredictedFinishOfPlane[r]
                     print(f"  Último trabajo: {j}")
@@ -1960,7 +2317,7 @@ if __name__ == "__main__":
         generate_report(df_full, instance, movimientos)
     else:
         print("No se pudo encontrar una solución óptima.")
-        print(f"Condición de terminación: {results.solver.termination_condition}")
+        print(f"Condición de terminación: {result['termination_condition']}")
 
     print("done")
 
@@ -0,0 +1,97 @@
+import time
+from pyomo.environ import Var
+
+from modelo_base import create_data, flatten_input_data, build_concrete_instance
+from solvers import get_persistent_solver, solve_persistent
+from warm_start import warm_start, max_violation
+
+
+# Replanificación durante el turno: cuando cambia la duración de un trabajo, el early start o el deadline de un
+# avión, se actualizan los parámetros mutables de la instancia ya construida y se vuelve a resolver con el
+# solver persistente, que conserva el modelo cargado y parte de la solución anterior.
+
+# Parámetros que dependen de duraciones y ventanas temporales (create_data) y se actualizan en el sitio
+MUTABLE_PARAMS = ('pJobDuration', 'pEarlyStartOfPlane', 'pLateFinishDeadline', 'pMStartSlotJob', 'pMFinishSlotJob',
+                  'pMStartJob', 'pMFinishJob', 'pMStartSlot', 'pMFinishSlot')
+
+# Variables (s,p,j) que quedan fijadas a 0 fuera de sSlotWindow (fb_JobInSlot / fb_SlotJobTime)
+SLOT_WINDOW_VARS = ('v01JobInSlot', 'vDurationSlotForJob', 'vStartSlotForJob', 'vFinishSlotForJob')
+
+
+def open_session(data, solver_name="highs", profile=None, formulation="linear", warm=True, tee=False):
+    """
+    Construye la instancia del escenario (read_excel, con el nº de slots definitivo), la carga en el solver
+    persistente y la resuelve. Devuelve la sesión {'data', 'instance', 'solver', 'result', ...} que usa replan.
+    """
+    instance = build_concrete_instance(data, formulation)
+    start = warm_start(instance, verbose=tee) if warm else {'feasible': False}
+    opt = get_persistent_solver(solver_name, profile)
+    opt.config.warmstart = start['feasible']
+    result = solve_persistent(instance, opt, solver_name, tee=tee)
+    return {'data': data, 'instance': instance, 'solver': opt, 'solver_name': solver_name, 'profile': profile,
+            'formulation': formulation, 'tee': tee, 'result': result}
+
+
+def _copy_values(source, target):
+    # Solución anterior como punto de partida de una instancia reconstruida (mismos índices)
+    for var in source.component_objects(Var, active=True):
+        target_var = target.find_component(var.name)
+        for index, v in var.items():
+            if v.value is not None and index in target_var:
+                target_var[index].set_value(v.value, skip_validation=True)
+
+
+def replan(session, durations=None, early_starts=None, deadlines=None):
+    """
+    Aplica los cambios {j: duración}, {r: early start}, {r: deadline} y vuelve a resolver desde la solución
+    anterior. Si las nuevas ventanas de slots caben en las de la instancia, sólo se actualizan los parámetros
+    mutables y se fijan a 0 las variables (s,p,j) que salen de la ventana; si alguna ventana crece, o aparecen
+    pares de interferencia nuevos (sPosPosSlotSlot y sNoOverlap dependen de est y pMFinishSlot), hay que
+    reconstruir la instancia (y recargarla en el solver). pHorizon no cambia.
+    Devuelve el resultado de solve_persistent con 'rebuilt', 'warm_feasible' y 'time' (total de la replanificación).
+    """
+    t0 = time.perf_counter()
+    data = session['data']
+    data = {**data,
+            'pJobDuration': {**data['pJobDuration'], **(durations or {})},
+            'pEarlyStartOfPlane': {**data['pEarlyStartOfPlane'], **(early_starts or {})},
+            'pLateFinishDeadline': {**data['pLateFinishDeadline'], **(deadlines or {})}}
+    new = flatten_input_data(create_data(dict(data), verbose=False))
+    instance = session['instance']
+    window = set(new['sSlotWindow'])
+    # c22–c24/c26 sólo existen para los pares con que se construyó la instancia: los que sobran no cambian
+    # la solución, pero los que faltan sí
+    rebuilt = not (window <= set(instance.sSlotWindow) and set(new['sPosPosSlotSlot']) <= set(instance.sPosPosSlotSlot)
+                   and set(new['sNoOverlap']) <= set(instance.sNoOverlap))
+
+    if rebuilt:
+        previous, instance = instance, build_concrete_instance(data, session['formulation'])
+        _copy_values(previous, instance)
+        session['solver'] = get_persistent_solver(session['solver_name'], session['profile'])
+    else:
+        for name in MUTABLE_PARAMS:
+            param = instance.find_component(name)
+            for index, v in new[name].items():
+                if index in param:
+                    param[index] = v
+        # una replanificación anterior puede haber cerrado índices que vuelven a entrar en la ventana
+        for index in instance.sSlotWindow:
+            for name in SLOT_WINDOW_VARS:
+                v = instance.find_component(name)[index]
+                v.setub((1 if v.is_binary() else None) if index in window else 0)
+
+    # Si la solución anterior deja de ser factible se parte de la voraz con los datos nuevos
+    warm_feasible = max_violation(instance) <= 1e-6
+    if not warm_feasible:
+        previous = [(v, v.value) for v in instance.component_data_objects(Var)]
+        warm_feasible = warm_start(instance, verbose=session['tee'])['feasible']
+        if not warm_feasible:
+            for v, val in previous:
+                v.set_value(val, skip_validation=True)
+
+    opt = session['solver']
+    opt.config.warmstart = warm_feasible
+    result = solve_persistent(instance, opt, session['solver_name'], tee=session['tee'])
+    result.update({'rebuilt': rebuilt, 'warm_feasible': warm_feasible, 'time': time.perf_counter() - t0})
+    session.update({'data': data, 'instance': instance, 'result': result})
+    return result
@@ -0,0 +1,128 @@
+import time
+from pyomo.environ import Constraint, value
+
+from modelo_base import max_slots, estimate_slots, slot_names, build_concrete_instance, solve_with_slot_sizing, \
+    get_solution_data
+from warm_start import apply_schedule, max_violation, slots_from_jobs
+
+
+# Rolling horizon: the aircraft are taken in order of early start, a window of them is solved with the usual
+# model, the schedule of the first ones is committed and the window slides. The positions used by committed
+# aircraft are passed to the next windows as initial conditions (release time of each position and positions
+# already taken by each client).
+
+
+def subset_data(data, planes):
+    """
+    Escenario de read_excel reducido a los aviones indicados (mismo formato). Los tiempos siguen siendo
+    absolutos (mismo pHorizon) y el nº de slots se vuelve a estimar para los trabajos de la ventana.
+    """
+    planes = [r for r in data['sPlanes'] if r in set(planes)]
+    keep = set(planes)
+    sJobs = [j for j in data['sJobs'] if data['pPlaneOfJob'][j] in keep]
+    jobs = set(sJobs)
+    pAirplaneOfClient = {(c, r): v for (c, r), v in data['pAirplaneOfClient'].items() if r in keep and v}
+    clients = {c for (c, r) in pAirplaneOfClient}
+    sub = {
+        **data,
+        'sJobs': sJobs,
+        'sPlanes': planes,
+        'sClients': [c for c in data['sClients'] if c in clients],
+        'pAirplaneOfClient': pAirplaneOfClient,
+        'pLastJobOfPlane': {(j, r): v for (j, r), v in data['pLastJobOfPlane'].items() if j in jobs and r in keep},
+    }
+    for name in ('pJobDuration', 'pPlaneOfJob', 'pTaskOfJob', 'pDate'):
+        sub[name] = {j: data[name][j] for j in sJobs}
+    for name in ('pPredictedFinishOfPlane', 'pEarlyStartOfPlane', 'pLateFinishDeadline'):
+        sub[name] = {r: data[name][r] for r in planes}
+    # misma regla que read_excel (max_slots, con las posiciones del escenario)
+    sub['nSlotsMax'] = max_slots(sJobs, sub['pPlaneOfJob'], sub['pTaskOfJob'], data['sPositions'])
+    sub['sSlots'] = slot_names(estimate_slots(sJobs, sub['pPlaneOfJob'], data['sPositions'],
+                                              data['sPositionsInterference']))
+    return sub
+
+
+def carry_forward(release, client_positions):
+    """
+    Condiciones iniciales de una ventana a partir de lo ya comprometido:
+        - release[p]: fin del último trabajo comprometido en p; los trabajos de la ventana empiezan después
+        - client_positions[c]: posiciones ocupadas por aviones del cliente c (c21: un avión por cliente y posición)
+    Devuelve la función prepare(instance) que se pasa a solve_with_slot_sizing.
+    """
+    def prepare(instance):
+        busy = [(s, p, j) for (s, p, j) in instance.sSlotWindow if release.get(p, 0) > 0]
+        instance.cRollingRelease = Constraint(busy, rule=lambda m, s, p, j: (
+            m.vStartSlotForJob[s, p, j] >= release[p] * m.v01JobInSlot[s, p, j]))
+        for (c, r) in instance.sPlaneOfClient:
+            for p in client_positions.get(c, ()):
+                instance.v01PlaneInPosition[r, p].setub(0)
+    return prepare
+
+
+def evaluate_schedule(data, jobs, formulation="linear"):
+    """
+    Carga la programación completa {j: (p, inicio, fin)} en el modelo con todos los aviones y devuelve
+    {'objective', 'max_violation', 'nSlots'} para compararla con la solución del modelo completo.
+    """
+    per_position = {}
+    for (p, _, _) in jobs.values():
+        per_position[p] = per_position.get(p, 0) + 1
+    n_slots = max(list(per_position.values()) + [len(data['sSlots'])])
+    full = {**data, 'sSlots': slot_names(n_slots)}
+    instance = build_concrete_instance(full, formulation)
+    apply_schedule(instance, {'jobs': jobs, 'slots': slots_from_jobs(jobs, full['sSlots'])})
+    return {'objective': value(instance.ObjFunction), 'max_violation': max_violation(instance), 'nSlots': n_slots}
+
+
+def solve_rolling_horizon(data, window=3, step=1, solver_name="gurobi", profile=None, formulation="bilinear",
+                          warm=True, verbose=True):
+    """
+    Resuelve el escenario por ventanas de 'window' aviones ordenados por early_start, comprometiendo los
+    'step' primeros de cada ventana. Devuelve:
+        - jobs: {j: (p, inicio, fin)} de la programación completa
+        - windows: [{'planes', 'committed', 'status', 'objective', 'time'}, ...]
+        - objective / max_violation: evaluación de la programación completa en el modelo con todos los aviones
+        - time: tiempo total de las ventanas
+    Necesita 1 ≤ step ≤ window: con step > window las ventanas saltarían aviones.
+    """
+    if not 1 <= step <= window:
+        raise ValueError(f"Se necesita 1 <= step <= window (step={step}, window={window})")
+    order = sorted(data['sPlanes'], key=lambda r: (data['pEarlyStartOfPlane'][r], data['sPlanes'].index(r)))
+    release, client_positions, jobs, windows, done = {}, {}, {}, [], set()
+    plane_client = {r: c for (c, r), v in data['pAirplaneOfClient'].items() if v}
+    t_total = time.perf_counter()
+
+    for first in range(0, len(order), step):
+        planes = order[first:first + window]
+        committed = planes if first + window >= len(order) else planes[:step]
+        t0 = time.perf_counter()
+        instance, result, _ = solve_with_slot_sizing(
+            subset_data(data, planes), solver_name, profile, formulation, tee=False, warm=warm,
+            prepare=carry_forward(dict(release), {c: set(ps) for c, ps in client_positions.items()}))
+        windows.append({'planes': planes, 'committed': committed, 'status': str(result['termination_condition']),
+                        'objective': result['objective'], 'time': time.perf_counter() - t0})
+        if verbose:
+            print(f"🪟 Ventana {planes}: {windows[-1]['status']}, objetivo {result['objective']}, "
+                  f"{windows[-1]['time']:.2f} s → se comprometen {committed}")
+        if not result['has_solution']:
+            raise RuntimeError(f"Ventana sin solución ({windows[-1]['status']}): {planes}")
+
+        done.update(committed)
+        solution = get_solution_data(instance)
+        for (s, p), j in solution['slot_assignment'].items():
+            r = data['pPlaneOfJob'][j]
+            if r in committed:
+                jobs[j] = (p, solution['start_job'][j], solution['finish_job'][j])
+                release[p] = max(release.get(p, 0), solution['finish_job'][j])
+                if r in plane_client:
+                    client_positions.setdefault(plane_client[r], set()).add(p)
+        if committed is planes:
+            break
+
+    missing = [r for r in data['sPlanes'] if r not in done]
+    if missing:
+        raise RuntimeError(f"Aviones sin comprometer en ninguna ventana: {missing}")
+    elapsed = time.perf_counter() - t_total
+    evaluation = evaluate_schedule(data, jobs, "linear")
+    return {'jobs': jobs, 'windows': windows, 'objective': evaluation['objective'],
+            'max_violation': evaluation['max_violation'], 'time': elapsed}
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from modelo_base import NO_POSITIONS, OUTSIDE, scenario_from_frames
+
+
+# Synthetic scenarios for scale testing: job and 'Planes' sheets with the same columns as input_data.xlsx,
+# converted to the read_excel dictionary with scenario_from_frames or written to a workbook.
+
+# Distribuciones de las duraciones de las tareas intermedias: nombre → muestreo(rng, n, **parámetros)
+DURATIONS = {
+    'constant': lambda rng, n, value=25: np.full(n, value, dtype=float),
+    'uniform': lambda rng, n, low=5, high=50: rng.uniform(low, high, n),
+    'triangular': lambda rng, n, low=5, mode=20, high=50: rng.triangular(low, mode, high, n),
+    'lognormal': lambda rng, n, mean=25, sigma=0.5: rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, n),
+}
+
+
+def position_layout(n_positions=NO_POSITIONS):
+    """
+    Posiciones e interferencias para n_positions posiciones (más 'outside'). Repite por bloques de 5 el patrón
+    de POSITIONS_INTERFERE (3-5 y 4-5 dentro del bloque, 4 y 5 con 'outside'); con 5 posiciones es el mismo.
+    """
+    positions = [f"position{i}" for i in range(1, n_positions + 1)] + [OUTSIDE]
+    interference = []
+    for first in range(0, n_positions, 5):
+        p = {k: f"position{first + k}" for k in range(1, 6) if first + k <= n_positions}
+        if 5 in p:
+            interference += [(p[3], p[5]), (p[4], p[5])]
+        if 4 in p:
+            interference += [(OUTSIDE, p[4]), (p[4], OUTSIDE)]
+        if 5 in p:
+            interference += [(OUTSIDE, p[5]), (p[5], OUTSIDE)]
+    return positions, interference
+
+
+def generate_frames(n_planes=20, tasks_per_plane=3, durations='lognormal', duration_params=None, edge_duration=3,
+                    planes_per_client=1, tightness=1.5, n_positions=NO_POSITIONS, utilization=0.7, first_plane=1,
+                    seed=0):
+    """
+    Hojas (df_jobs, df_planes) de un escenario sintético:
+        - n_planes aviones con tasks_per_plane tareas (entero o (mín, máx) para sortearlo por avión)
+        - duraciones de DURATIONS[durations] con duration_params; la primera y la última tarea duran
+          edge_duration como en input_data.xlsx (None: todas de la distribución)
+        - planes_per_client aviones por cliente (1: sin columna 'client', cada avión es su propio cliente)
+        - llegadas (early_start) uniformes en el intervalo con el que el trabajo total ocupa 'utilization'
+          de las n_positions posiciones, y late_finish = early_start + tightness × duración del avión
+          (tightness=None: sin late_finish)
+    """
+    rng = np.random.default_rng(seed)
+    sample = DURATIONS[durations]
+    low, high = tasks_per_plane if isinstance(tasks_per_plane, tuple) else (tasks_per_plane, tasks_per_plane)
+    planes = range(first_plane, first_plane + n_planes)
+    n_tasks = rng.integers(low, high + 1, n_planes)
+
+    jobs = []
+    for r, n in zip(planes, n_tasks):
+        d = np.maximum(np.rint(sample(rng, n, **(duration_params or {}))), 1).astype(int)
+        if edge_duration is not None and n >= 3:
+            d[0] = d[-1] = edge_duration
+        jobs.append(d)
+    work = np.array([d.sum() for d in jobs])
+    span = max(work.sum() / (n_positions * utilization) - work.mean(), 0)
+    early_start = np.rint(rng.uniform(0, span, n_planes)).astype(int)
+
+    rows = []
+    for k, (r, d) in enumerate(zip(planes, jobs)):
+        dates = early_start[k] + np.concatenate([[0], np.cumsum(d[:-1])])
+        for task, (date, duration) in enumerate(zip(dates, d), start=1):
+            row = {'plane': r, 'task': task, 'job': f"{r}-{task}", 'date': int(date), 'duration': int(duration),
+                   'movable': int(task != (len(d) + 1) // 2), 'flexible': 1}
+            if planes_per_client > 1:
+                row['client'] = k // planes_per_client + 1
+            rows.append(row)
+    df_jobs = pd.DataFrame(rows)
+    df_planes = pd.DataFrame({
+        'plane': list(planes),
+        'early_start': early_start,
+        'late_finish': np.rint(early_start + tightness * work) if tightness is not None else np.nan,
+    })
+    return df_jobs, df_planes
+
+
+def scenario_horizon(df_jobs, df_planes):
+    # Fin más tardío del escenario: el mayor late_finish o, sin él, 1.2 × la duración tras el early start
+    work = df_jobs.groupby('plane')['duration'].sum()
+    planes = df_planes.set_index('plane')
+    latest = planes['late_finish'].fillna(planes['early_start'] + 1.2 * work.reindex(planes.index))
+    return float(latest.max())
+
+
+def generate_data(n_positions=NO_POSITIONS, **params):
+    """
+    Escenario sintético con el formato de read_excel (parámetros de generate_frames). El horizonte cubre el
+    late_finish de todos los aviones (scenario_horizon) en lugar de la regla de read_excel, que con muchos
+    aviones llegando a lo largo del turno dejaría fuera a los últimos.
+    """
+    df_jobs, df_planes = generate_frames(n_positions=n_positions, **params)
+    positions, interference = position_layout(n_positions)
+    return scenario_from_frames(df_jobs, df_planes, positions, interference, scenario_horizon(df_jobs, df_planes))
+
+
+def write_workbook(file_name, scenarios):
+    """
+    Escribe {hoja: (df_jobs, df_planes)} como input_data.xlsx: una hoja por escenario y una hoja 'Planes'
+    común (los ids de avión deben ser distintos entre escenarios: first_plane de generate_frames).
+    read_excel usa siempre POSITIONS y su regla del horizonte; para otras posiciones o flotas grandes que
+    llegan a lo largo del turno, generate_data.
+    """
+    df_planes = pd.concat([planes for _, planes in scenarios.values()], ignore_index=True)
+    if df_planes['plane'].duplicated().any():
+        raise ValueError("Ids de avión repetidos entre escenarios: usar first_plane distintos")
+    with pd.ExcelWriter(file_name) as writer:
+        for sheet, (df_jobs, _) in scenarios.items():
+            df_jobs.to_excel(writer, sheet_name=sheet, index=False)
+        df_planes.to_excel(writer, sheet_name='Planes', index=False)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--planes", type=int, nargs="*", default=[20, 50, 100], help="un escenario por valor")
+    parser.add_argument("--tasks", type=int, default=3)
+    parser.add_argument("--durations", default="lognormal", choices=list(DURATIONS))
+    parser.add_argument("--planes-per-client", type=int, default=1)
+    parser.add_argument("--tightness", type=float, default=1.5)
+    parser.add_argument("--utilization", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_data.xlsx")
+    args = parser.parse_args()
+
+    scenarios, first = {}, 1
+    for n in args.planes:
+        scenarios[f"synthetic_{n}_planes"] = generate_frames(
+            n, args.tasks, args.durations, planes_per_client=args.planes_per_client, tightness=args.tightness,
+            utilization=args.utilization, first_plane=first, seed=args.seed)
+        first += n
+    write_workbook(args.out, scenarios)
+    print(f"{len(scenarios)} escenarios guardados en {args.out}: {', '.join(scenarios)}")
@@ -0,0 +1,288 @@
+import re
+import time
+from pyomo.environ import SolverFactory, TerminationCondition, Constraint, Objective, value
+
+
+# Tuning profile of the main script: time limit, relative gap and emphasis on finding feasible schedules early
+DEFAULT_PROFILE = {
+    'time_limit': 1000,      # segundos
+    'mip_gap': 0.10,         # gap relativo
+    'heuristic_focus': True, # priorizar heurísticas frente a Branch and Bound
+    'threads': None,         # None = lo que decida el solver
+}
+
+# Pyomo plugin used for each backend
+SOLVER_PLUGINS = {
+    'gurobi': 'gurobi',
+    'highs': 'appsi_highs',
+    'cbc': 'cbc',
+}
+
+# Backends that can read the bilinear c22/c23 (the open solvers need formulation="linear")
+NONCONVEX_SOLVERS = ('gurobi',)
+
+
+def solver_options(solver_name, profile):
+    # Translates the tuning profile into the options of each solver
+    options = {}
+    if solver_name == 'gurobi':
+        options['OutputFlag'] = 1        # Activar salida de log
+        options['LogToConsole'] = 1      # Mostrar log en consola
+        options['DisplayInterval'] = 1   # Actualizar cada segundo
+        options['TimeLimit'] = profile['time_limit']
+        options['MIPGap'] = profile['mip_gap']
+        options['NonConvex'] = 2         # Necesario con la formulación bilineal de c22/c23
+        if profile['heuristic_focus']:
+            options['Heuristics'] = 1.0      # Máximo esfuerzo en heurísticas
+            options['RINS'] = 1              # Frecuencia de la heurística RINS
+            options['MIPFocus'] = 3          # Enfoque en encontrar soluciones factibles rápidamente
+            options['ImproveStartGap'] = 0.5 # Comenzar a mejorar la solución cuando el gap sea < 50%
+            options['NoRelHeurTime'] = 120   # Aplicar heurísticas en los primeros segundos indicados
+            options['BranchDir'] = -1        # Favorecer branch hacia abajo
+            options['MinRelNodes'] = 1000    # Heurística de nodo raíz sin relajación
+        if profile['threads']:
+            options['Threads'] = profile['threads']
+    elif solver_name == 'highs':
+        options['time_limit'] = float(profile['time_limit'])
+        options['mip_rel_gap'] = profile['mip_gap']
+        if profile['heuristic_focus']:
+            options['mip_heuristic_effort'] = 0.3   # por defecto 0.05
+        if profile['threads']:
+            options['threads'] = profile['threads']
+    elif solver_name == 'cbc':
+        options['seconds'] = profile['time_limit']
+        options['ratioGap'] = profile['mip_gap']
+        if profile['heuristic_focus']:
+            options['heuristicsOnOff'] = 'on'
+            options['feasibilityPump'] = 'on'
+            options['Rins'] = 'on'
+            options['proximitySearch'] = 'on'
+        if profile['threads']:
+            options['threads'] = profile['threads']
+    else:
+        raise ValueError(f"Solver desconocido: {solver_name} (usar {', '.join(SOLVER_PLUGINS)})")
+    return options
+
+
+def get_solver(solver_name, profile=None):
+    if solver_name not in SOLVER_PLUGINS:
+        raise ValueError(f"Solver desconocido: {solver_name} (usar {', '.join(SOLVER_PLUGINS)})")
+    profile = {**DEFAULT_PROFILE, **(profile or {})}
+    opt = SolverFactory(SOLVER_PLUGINS[solver_name])
+    opt.options.update(solver_options(solver_name, profile))
+    return opt
+
+
+def available_solvers():
+    names = []
+    for solver_name, plugin in SOLVER_PLUGINS.items():
+        try:
+            if SolverFactory(plugin).available(exception_flag=False):
+                names.append(solver_name)
+        except Exception:
+            pass
+    return names
+
+
+def solve_instance(instance, solver_name='gurobi', profile=None, tee=False, warmstart=False):
+    """
+    Resuelve la instancia con el solver indicado ('gurobi', 'highs' o 'cbc') aplicando el perfil de ajuste.
+    Devuelve un diccionario con el mismo formato para todos los solvers:
+        - solver, termination_condition, status
+        - has_solution: True si se ha cargado una solución factible en la instancia
+        - objective, lower_bound, gap, wall_time
+        - results: objeto de resultados original de Pyomo
+    """
+    opt = get_solver(solver_name, profile)
+
+    t0 = time.perf_counter()
+    results = opt.solve(instance, tee=tee, load_solutions=False, warmstart=warmstart)
+    wall_time = time.perf_counter() - t0
+
+    termination = results.solver.termination_condition
+    has_solution = len(results.solution) > 0 and termination not in (
+        TerminationCondition.infeasible, TerminationCondition.infeasibleOrUnbounded, TerminationCondition.unbounded)
+    if has_solution:
+        instance.solutions.load_from(results)
+
+    objective = value(instance.ObjFunction) if has_solution else None
+    lower_bound = results.problem.lower_bound
+    try:
+        lower_bound = float(lower_bound)
+    except (TypeError, ValueError):
+        lower_bound = None
+    if lower_bound is not None and abs(lower_bound) == float('inf'):
+        lower_bound = None
+    gap = None
+    if objective is not None and lower_bound is not None:
+        gap = abs(objective - lower_bound) / max(abs(objective), 1e-10)
+
+    return {
+        'solver': solver_name,
+        'termination_condition': termination,
+        'status': str(results.solver.status),
+        'has_solution': has_solution,
+        'objective': objective,
+        'lower_bound': lower_bound,
+        'gap': gap,
+        'wall_time': wall_time,
+        'results': results,
+    }
+
+
+# Persistent (appsi) interfaces: the model stays loaded in the solver and later solves only send the changes
+PERSISTENT_SOLVERS = ('gurobi', 'highs')
+
+
+def get_persistent_solver(solver_name, profile=None):
+    from pyomo.contrib import appsi
+
+    if solver_name not in PERSISTENT_SOLVERS:
+        raise ValueError(f"Solver sin interfaz persistente: {solver_name} (usar {', '.join(PERSISTENT_SOLVERS)})")
+    profile = {**DEFAULT_PROFILE, **(profile or {})}
+    options = solver_options(solver_name, profile)
+    if solver_name == 'gurobi':
+        opt = appsi.solvers.Gurobi()
+        opt.gurobi_options.update(options)
+    else:
+        opt = appsi.solvers.Highs()
+        opt.highs_options.update(options)
+    opt.config.load_solution = False
+    opt.config.warmstart = True  # los valores actuales de las variables se pasan como MIP start
+    return opt
+
+
+def solve_persistent(instance, opt, solver_name, tee=False):
+    """
+    Resuelve con un solver de get_persistent_solver: la primera llamada carga la instancia y las siguientes
+    sólo actualizan parámetros mutables, cotas y restricciones nuevas. Devuelve el mismo diccionario que
+    solve_instance, con 'status' también como estado del solver ('ok', 'aborted', 'error'), no de terminación.
+    """
+    opt.config.stream_solver = tee
+    t0 = time.perf_counter()
+    results = opt.solve(instance)
+    wall_time = time.perf_counter() - t0
+
+    from pyomo.contrib.appsi.base import legacy_solver_status_map
+
+    termination = getattr(TerminationCondition, results.termination_condition.name, TerminationCondition.unknown)
+    has_solution = results.best_feasible_objective is not None
+    if has_solution:
+        results.solution_loader.load_vars()
+    objective = value(instance.ObjFunction) if has_solution else None
+    lower_bound = results.best_objective_bound
+    if lower_bound is not None and abs(lower_bound) == float('inf'):
+        lower_bound = None
+    gap = None
+    if objective is not None and lower_bound is not None:
+        gap = abs(objective - lower_bound) / max(abs(objective), 1e-10)
+
+    return {
+        'solver': solver_name,
+        'termination_condition': termination,
+        'status': str(legacy_solver_status_map[results.termination_condition]),  # 'ok', 'aborted'...
+        'has_solution': has_solution,
+        'objective': objective,
+        'lower_bound': lower_bound,
+        'gap': gap,
+        'wall_time': wall_time,
+        'results': results,
+    }
+
+
+def first_incumbent_time(log, solver_name):
+    # Seconds until the first feasible solution according to the solver log (tee=True output); None if none
+    for line in log.splitlines():
+        tokens = line.split()
+        if solver_name == 'highs':
+            # node table: [Src] Proc. InQueue Leaves Expl.% BestBound BestSol Gap ... Time
+            pct = [k for k, t in enumerate(tokens) if t.endswith('%')]
+            if pct and tokens[-1].endswith('s') and len(tokens) > pct[0] + 2 and tokens[pct[0] + 2] != 'inf':
+                return float(tokens[-1][:-1])
+        elif solver_name == 'gurobi':
+            if line.startswith('Loaded user MIP start with objective'):
+                return 0.0
+            # new incumbents are the node log lines marked with H (heuristic) or * (branching)
+            if line[:1] in ('H', '*') and tokens[-1].endswith('s') and tokens[-1][:-1].isdigit():
+                return float(tokens[-1][:-1])
+        elif solver_name == 'cbc':
+            match = re.search(r"Integer solution of .* \(([\d.]+) seconds\)", line)
+            if match:
+                return float(match.group(1))
+    return None
+
+
+def node_count(log, solver_name):
+    # Branch-and-bound nodes explored according to the solver log (tee=True output); None if not reported
+    patterns = {
+        'highs': r"^\s*Nodes\s+(\d+)",
+        'gurobi': r"Explored (\d+) nodes",
+        'cbc': r"Enumerated nodes:\s+(\d+)",
+    }
+    match = re.search(patterns[solver_name], log, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def is_infeasible(instance, solver_name, time_limit=60):
+    # Feasibility check: True only if the solver proves infeasibility within the time limit
+    opt = get_solver(solver_name, {'time_limit': time_limit, 'mip_gap': 1.0, 'heuristic_focus': True})
+    if solver_name == 'gurobi':
+        opt.options['OutputFlag'] = 0
+    results = opt.solve(instance, load_solutions=False)
+    return results.solver.termination_condition in (
+        TerminationCondition.infeasible, TerminationCondition.infeasibleOrUnbounded)
+
+
+def compute_iis(instance, solver_name='gurobi', case_name="conflict", time_limit=60):
+    """
+    Busca un conjunto irreducible de restricciones incompatibles.
+    Con Gurobi usa computeIIS sobre el MPS de la instancia (fichero .ilp). HiGHS sólo calcula IIS de LPs y
+    CBC no tiene herramienta de conflictos, así que con ellos se aplica un filtro de eliminación por familias
+    de restricciones (c01, c02, ...): se desactiva cada familia y se mantiene desactivada si el modelo sigue
+    siendo infactible. Las familias que quedan activas forman el conflicto (fichero .mis).
+    Devuelve {'constraints': [...], 'variables': [...], 'file': ruta}.
+    """
+    if solver_name == 'gurobi':
+        import gurobipy as gp
+
+        # vuelca a MPS con labels simbólicos
+        mps_file = f"{case_name}.mps"
+        instance.write(mps_file, format='mps', io_options={'symbolic_solver_labels': True})
+        print(f"✏️  Modelo escrito en {mps_file}")
+
+        # carga y computa IIS
+        grb = gp.read(mps_file)
+        grb.computeIIS()
+        iis_file = f"{case_name}.ilp"
+        grb.write(iis_file)
+        infeas_cons = [c.constrName for c in grb.getConstrs() if c.IISConstr]
+        infeas_vars = [v.varName for v in grb.getVars() if v.IISLB or v.IISUB]
+    else:
+        objectives = list(instance.component_objects(Objective, active=True))
+        for obj in objectives:
+            obj.deactivate()
+        instance.FeasibilityObjective = Objective(expr=0)
+        families = list(instance.component_objects(Constraint, active=True))
+        try:
+            for c in families:
+                c.deactivate()
+                if is_infeasible(instance, solver_name, time_limit):
+                    print(f"   - {c.name}: no necesaria para la infactibilidad")
+                else:
+                    c.activate()
+                    print(f"   + {c.name}: forma parte del conflicto")
+            infeas_cons = [c.name for c in families if c.active]
+        finally:
+            for c in families:
+                c.activate()
+            instance.del_component(instance.FeasibilityObjective)
+            for obj in objectives:
+                obj.activate()
+        infeas_vars = []
+
+        iis_file = f"{case_name}.mis"
+        with open(iis_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(infeas_cons))
+
+    print(f"📝 IIS guardado en {iis_file}")
+    return {'constraints': infeas_cons, 'variables': infeas_vars, 'file': iis_file}
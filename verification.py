@@ -0,0 +1,368 @@
+import numpy as np
+from itertools import product
+
+
+# Array version of modelo_base.check_solution: the solution dictionaries are loaded once into dense arrays
+# (S×P×J for slot/job values, S×P×R for presence, S×P for slots, J and R for jobs and planes) and every
+# constraint family is checked with one vectorized residual. Only the violated entries are formatted as
+# error messages, with the same text as the loop version.
+
+
+def _index(items):
+    return {k: i for i, k in enumerate(items)}
+
+
+def _dense(values, maps, fill=0.0):
+    # {key: value} → array with one axis per index map; keys outside the maps are ignored like in the loops
+    shape = tuple(len(m) for m in maps)
+    keys = list(product(*maps)) if len(maps) > 1 else list(maps[0])
+    if len(values) == len(keys) and list(values) == keys:
+        # get_solution_data builds the dictionaries over the full product in set order: no lookups needed
+        arr = np.array(list(values.values()), dtype=float).reshape(shape)
+        return np.nan_to_num(arr, nan=0.0)  # None (variable sin valor) → 0
+    arr = np.full(shape, fill, dtype=float)
+    for key, v in values.items():
+        key = key if isinstance(key, tuple) else (key,)
+        try:
+            pos = tuple(m[k] for m, k in zip(maps, key))
+        except KeyError:
+            continue
+        arr[pos] = 0.0 if v is None else v
+    return arr
+
+
+def _entry(results, name, violation=None):
+    # violation: array of residuals (> 0 means violated); its maximum is reported as max_violation
+    worst = float(np.max(violation)) if violation is not None and np.size(violation) else 0.0
+    results[name] = {'passed': True, 'errors': [], 'max_violation': max(worst, 0.0)}
+    return results[name]
+
+
+def _fail(entry, messages):
+    for msg in messages:
+        entry['passed'] = False
+        entry['errors'].append(msg)
+
+
+def check_solution_vectorized(data, solution, tol=1e-6):
+    """
+    Comprueba la solución igual que check_solution (mismos nombres de restricción, mismos mensajes) pero con
+    operaciones de NumPy sobre arrays densos. Cada entrada de constraints_verification incluye además
+    'max_violation', la mayor violación de esa familia (0 si se cumple).
+    """
+    sSlots = list(data.get('sSlots', []))
+    sPositions = list(data.get('sPositions', []))
+    sJobs = list(data.get('sJobs', []))
+    sPlanes = list(data.get('sPlanes', []))
+    pJobDuration = data.get('pJobDuration', {})
+    pPlaneOfJob = data.get('pPlaneOfJob', {})
+    pLastJobOfPlane = data.get('pLastJobOfPlane', {})
+    pPredictedFinishOfPlane = data.get('pPredictedFinishOfPlane', {})
+    H = M = data.get('pHorizon', 0)
+
+    sSlotsSequence = data.get('sSlotsSequence', [])
+    sJobSequence = data.get('sJobSequence', [])
+    sPosPosSlotSlot = data.get('sPosPosSlotSlot', [])
+    sSwitchPlanes = data.get('sSwitchPlanes', [])
+    prev_slot = data.get('prev_slot', {})
+
+    iS, iP, iJ, iR = _index(sSlots), _index(sPositions), _index(sJobs), _index(sPlanes)
+    SPJ, SPR, SP = (iS, iP, iJ), (iS, iP, iR), (iS, iP)
+    nS, nP, nJ, nR = len(sSlots), len(sPositions), len(sJobs), len(sPlanes)
+
+    slot_assignment = solution.get('slot_assignment', {})
+    X = np.zeros((nS, nP, nJ))
+    for (s, p), j in slot_assignment.items():
+        if s in iS and p in iP and j in iJ:
+            X[iS[s], iP[p], iJ[j]] = 1
+    DSJ = _dense(solution.get('duration_slot_job', {}), SPJ)
+    SSJ = _dense(solution.get('start_slot_job', {}), SPJ)
+    FSJ = _dense(solution.get('finish_slot_job', {}), SPJ)
+    DS = _dense(solution.get('duration_slot', {}), SP)
+    SS = _dense(solution.get('start_slot', {}), SP)
+    FS = _dense(solution.get('finish_slot', {}), SP)
+    SJ = _dense(solution.get('start_job', {}), (iJ,))
+    FJ = _dense(solution.get('finish_job', {}), (iJ,))
+    PRES = _dense(solution.get('presence', {}), SPR)
+    PIS = _dense(solution.get('plane_in_slot', {}), SPR)
+    IDLE = _dense(solution.get('idle', {}), SPR)
+    SPRES = _dense(solution.get('start_presence', {}), SPR)
+    FPRES = _dense(solution.get('finish_presence', {}), SPR)
+    SW = _dense(solution.get('switch_planes', {}), SP)
+    DELAY = _dense(solution.get('plane_delay', {}), (iR,))
+    D = np.array([pJobDuration.get(j, 0.0) for j in sJobs], dtype=float)
+    PF = np.array([pPredictedFinishOfPlane.get(r, 0.0) for r in sPlanes], dtype=float)
+    LAST = _dense(pLastJobOfPlane, (iJ, iR))
+    PLANE = np.zeros((nJ, nR))  # PLANE[j, r] = 1 si el trabajo j es del avión r
+    for j, r in pPlaneOfJob.items():
+        if j in iJ and r in iR:
+            PLANE[iJ[j], iR[r]] = 1
+
+    results = {}
+    x_cnt = X.sum(axis=2)                                    # trabajos asignados a cada (s,p)
+    plane_cnt = np.einsum('spj,jr->spr', X, PLANE)           # trabajos de r asignados a (s,p)
+    in_slot = (plane_cnt > 0).astype(float)                  # v01PlaneInSlot reconstruido
+
+    # c01: SingleJobPerSlot
+    viol = x_cnt - 1
+    e = _entry(results, 'c01_single_job_per_slot', viol)
+    _fail(e, (f"Ranura {sSlots[a]}, posición {sPositions[b]} tiene múltiples trabajos asignados: "
+              f"{[sJobs[k] for k in np.flatnonzero(X[a, b])]}" for a, b in zip(*np.nonzero(viol > 0))))
+
+    # c02: SlotJobDuration
+    viol = np.abs(DSJ - (FSJ - SSJ))
+    e = _entry(results, 'c02_slot_job_duration', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},j={sJobs[c]}): vDurationSlotForJob={DSJ[a, b, c]:.4f} ≠ "
+              f"finish-start={(FSJ[a, b, c] - SSJ[a, b, c]):.4f}" for a, b, c in zip(*np.nonzero(viol > tol))))
+
+    # c03 & c04: NullStart/NullFinishIfNotAssigned
+    for name, label, T in (('c03_null_start_if_not_assigned', 'start_slot_job', SSJ),
+                           ('c04_null_finish_if_not_assigned', 'finish_slot_job', FSJ)):
+        viol = T - H * X
+        e = _entry(results, name, viol)
+        _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},j={sJobs[c]}): {label}={T[a, b, c]:.4f} > "
+                  f"Horizon*{int(X[a, b, c])}={H * X[a, b, c]:.4f}" for a, b, c in zip(*np.nonzero(viol > tol))))
+
+    # c05: JobDuration
+    total = DSJ.sum(axis=(0, 1))
+    viol = np.abs(total - D)
+    e = _entry(results, 'c05_job_duration', viol)
+    _fail(e, (f"Trabajo {sJobs[c]}: suma_duración_fragmentos={total[c]:.4f} ≠ pJobDuration({pJobDuration.get(sJobs[c])})"
+              for c in np.flatnonzero(viol > tol)))
+
+    # c06 & c07: inicio/fin global con Big-M (mensajes en el orden de la versión con bucles)
+    slack = M * (1 - X)
+    c06_up, c06_lo = SJ - (SSJ + slack), (SSJ - slack) - SJ
+    c07_lo, c07_up = (FSJ - slack) - FJ, FJ - (FSJ + slack)
+    e06 = _entry(results, 'c06_startjob_bigM', np.maximum(c06_up, c06_lo))
+    e07 = _entry(results, 'c07_finishjob_bigM', np.maximum(c07_lo, c07_up))
+    for a, b, c in zip(*np.nonzero((np.maximum(c06_up, c06_lo) > tol) | (np.maximum(c07_lo, c07_up) > tol))):
+        where = f"(s={sSlots[a]},p={sPositions[b]},j={sJobs[c]})"
+        st_frag, fn_frag, m = SSJ[a, b, c], FSJ[a, b, c], slack[a, b, c]
+        if c06_up[a, b, c] > tol:
+            _fail(e06, [f"{where}: start_job={SJ[c]:.4f} > frag_start+M(1-x)={st_frag + m:.4f}"])
+        if c06_lo[a, b, c] > tol:
+            _fail(e06, [f"{where}: frag_start-M(1-x)={st_frag - m:.4f} > start_job={SJ[c]:.4f}"])
+        if c07_lo[a, b, c] > tol:
+            _fail(e07, [f"{where}: frag_finish-M(1-x)={fn_frag - m:.4f} > finish_job={FJ[c]:.4f}"])
+        if c07_up[a, b, c] > tol:
+            _fail(e07, [f"{where}: finish_job={FJ[c]:.4f} > frag_finish+M(1-x)={fn_frag + m:.4f}"])
+
+    # c08: StartFinishRelation
+    viol = SJ - FJ
+    e = _entry(results, 'c08_start_finish_relation', viol)
+    _fail(e, (f"Job {sJobs[c]}: start={SJ[c]:.4f} > finish={FJ[c]:.4f}" for c in np.flatnonzero(viol > tol)))
+
+    # c09: PlaneDelay (sólo el último trabajo de cada avión contribuye)
+    sum_term = ((FJ[:, None] - PF[None, :]) * LAST).sum(axis=0)
+    viol = sum_term - DELAY
+    e = _entry(results, 'c09_plane_delay', viol)
+    _fail(e, (f"Avión {sPlanes[k]}: vPlaneDelay={DELAY[k]:.4f} < (finish_last - deadline)={sum_term[k]:.4f}"
+              for k in np.flatnonzero(viol > tol)))
+
+    # c11 & c12: SlotStartTime / SlotFinishTime
+    for name, label, T, TJ, what in (('c11_slot_start_time', 'vStartSlot', SS, SSJ, 'starts'),
+                                     ('c12_slot_finish_time', 'vFinishSlot', FS, FSJ, 'finishes')):
+        total = TJ.sum(axis=2)
+        viol = np.abs(T - total)
+        e = _entry(results, name, viol)
+        _fail(e, (f"(s={sSlots[a]},p={sPositions[b]}): {label}={T[a, b]:.4f} ≠ suma({what})={total[a, b]:.4f}"
+                  for a, b in zip(*np.nonzero(viol > tol))))
+
+    # c13: SlotSequence
+    seq = [(iS[s], iS[s2], iP[p]) for (s, s2, p) in sSlotsSequence]
+    a, a2, b = (np.array(v, dtype=int) for v in zip(*seq)) if seq else (np.zeros(0, dtype=int),) * 3
+    viol = FS[a2, b] - SS[a, b]
+    e = _entry(results, 'c13_slot_sequence', viol)
+    _fail(e, (f"SlotSequence: start[{sSlots[a[k]]},{sPositions[b[k]]}]={SS[a[k], b[k]]:.4f} < "
+              f"finish[{sSlots[a2[k]]},{sPositions[b[k]]}]={FS[a2[k], b[k]]:.4f}" for k in np.flatnonzero(viol > tol)))
+
+    # c14: JobSequence
+    seq = [(iJ[j], iJ[j2]) for (j, j2) in sJobSequence]
+    c, c2 = (np.array(v, dtype=int) for v in zip(*seq)) if seq else (np.zeros(0, dtype=int),) * 2
+    viol = FJ[c] - SJ[c2]
+    e = _entry(results, 'c14_job_sequence', viol)
+    _fail(e, (f"JobSequence: start_job[{sJobs[c2[k]]}]={SJ[c2[k]]:.4f} < finish_job[{sJobs[c[k]]}]={FJ[c[k]]:.4f}"
+              for k in np.flatnonzero(viol > tol)))
+
+    # c15: ConsecutiveSlots
+    order = np.array([iS[s] for s in sorted(sSlots, key=lambda x: int(x.replace('slot', '')))], dtype=int)
+    cnt = x_cnt[order]
+    viol = cnt[1:] - cnt[:-1]
+    e = _entry(results, 'c15_consecutive_slots', viol)
+    _fail(e, (f"ConsecutiveSlots: posición {sPositions[b]}: {sSlots[order[k + 1]]} tiene {int(cnt[k + 1, b])} jobs, "
+              f"pero {sSlots[order[k]]} tiene {int(cnt[k, b])}" for b, k in zip(*np.nonzero(viol.T > 0))))
+
+    # c16: SingleSlotPerJob
+    count = np.bincount(np.array([iJ[j] for j in slot_assignment.values() if j in iJ], dtype=int), minlength=nJ)
+    viol = np.abs(count - 1)
+    e = _entry(results, 'c16_single_slot_per_job', viol)
+    _fail(e, (f"Job {sJobs[c]} asignado en {count[c]} slots (debe 1)" for c in np.flatnonzero(viol > 0)))
+
+    # c17: DurationIfNotAssigned
+    lhs, rhs = FSJ - SSJ, D * X
+    viol = rhs - lhs
+    e = _entry(results, 'c17_duration_if_not_assigned', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},j={sJobs[c]}): finish-start={lhs[a, b, c]:.4f} < "
+              f"duration[{sJobs[c]}]*x={rhs[a, b, c]:.4f}" for a, b, c in zip(*np.nonzero(viol > tol))))
+
+    # c18: SlotDuration
+    total = DSJ.sum(axis=2)
+    viol = np.abs(DS - total)
+    e = _entry(results, 'c18_slot_duration', viol)
+    _fail(e, (f"Ranura {sSlots[a]},{sPositions[b]}: vDurationSlot={DS[a, b]:.4f} ≠ suma_fragmentos={total[a, b]:.4f}"
+              for a, b in zip(*np.nonzero(viol > tol))))
+
+    # c19: PlaneSlotAssignment (conteo ≠ 1 con el avión presente)
+    viol = np.abs((plane_cnt == 1).astype(float) - in_slot)
+    e = _entry(results, 'c19_plane_slot_assignment', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): conteo={int(plane_cnt[a, b, k])}, "
+              f"pero v01PlaneInSlot reconstruido={int(in_slot[a, b, k])}" for a, b, k in zip(*np.nonzero(viol > 0))))
+
+    # c20: PlaneInPosition
+    in_position = in_slot.max(axis=0, initial=0)             # [p, r]
+    viol = in_slot - in_position[None]
+    e = _entry(results, 'c20_plane_in_position', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): v01PlaneInPosition={int(in_position[b, k])} < "
+              f"v01PlaneInSlot={int(in_slot[a, b, k])}" for a, b, k in zip(*np.nonzero(viol > 0))))
+
+    # c20b: si r tiene un trabajo en (s,p), debe estar presente
+    viol = PIS - PRES
+    e = _entry(results, 'c20b_present_if_work', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): presence={PRES[a, b, k]} < "
+              f"plane_in_slot={PIS[a, b, k]}" for a, b, k in zip(*np.nonzero(viol > tol))))
+
+    # c20c: presencia = slots + idle
+    pres_sr, rest_sr = PRES.sum(axis=1), PIS.sum(axis=1) + IDLE.sum(axis=1)
+    viol = np.abs(pres_sr - rest_sr)
+    e = _entry(results, 'c20c_present_exactly_one', viol)
+    _fail(e, (f"(s={sSlots[a]},r={sPlanes[k]}): pres={pres_sr[a, k]} != slots+idle={rest_sr[a, k]}"
+              for a, k in zip(*np.nonzero(viol > tol))))
+
+    # c20d: un avión por posición
+    total = PRES.sum(axis=2)
+    viol = total - 1
+    e = _entry(results, 'c20d_single_plane_per_position', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]}): presencia total={total[a, b]} > 1"
+              for a, b in zip(*np.nonzero(viol > tol))))
+
+    # c20e & c20f: no hay salto adelante / atrás sin switch
+    pairs = [(iS[prev_slot[s]], iS[s]) for s in sSlots if prev_slot.get(s) is not None]
+    a0, a1 = (np.array(v, dtype=int) for v in zip(*pairs)) if pairs else (np.zeros(0, dtype=int),) * 2
+    delta = PRES[a0] - PRES[a1]                              # [par, p, r]
+    sw = SW[a0][:, :, None]
+    for name, viol, text in (('c20e_no_jump_forward', delta - sw, "pres_prev-pres"),
+                             ('c20f_no_jump_backward', -delta - sw, "pres-pres_prev")):
+        e = _entry(results, name, viol)
+        _fail(e, (f"(s_prev={sSlots[a0[k]]},s={sSlots[a1[k]]},p={sPositions[b]},r={sPlanes[q]}): "
+                  f"{text}={viol[k, b, q] + sw[k, b, 0]} > switch={sw[k, b, 0]}"
+                  for k, b, q in zip(*np.nonzero(viol > tol))))
+
+    # idle_def1 / idle_def2
+    viol = (PRES - PIS) - IDLE
+    e = _entry(results, 'idle_def1', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): idle={IDLE[a, b, k]} < "
+              f"pres-pi={PRES[a, b, k] - PIS[a, b, k]}" for a, b, k in zip(*np.nonzero(viol > tol))))
+    viol = IDLE - PRES
+    e = _entry(results, 'idle_def2', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): idle={IDLE[a, b, k]} > presence={PRES[a, b, k]}"
+              for a, b, k in zip(*np.nonzero(viol > tol))))
+
+    # link_start_presence / link_finish_presence_lb / link_finish_presence_ub
+    slack = M * (1 - PRES)
+    viol = SPRES - (SS[:, :, None] + slack)
+    e = _entry(results, 'link_start_presence', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): sp={SPRES[a, b, k]} > "
+              f"ss+M(1-pres)={SS[a, b] + slack[a, b, k]}" for a, b, k in zip(*np.nonzero(viol > tol))))
+    viol = (FS[:, :, None] - slack) - FPRES
+    e = _entry(results, 'link_finish_presence_lb', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): fs-M(1-pres)={FS[a, b] - slack[a, b, k]} > "
+              f"fp={FPRES[a, b, k]}" for a, b, k in zip(*np.nonzero(viol > tol))))
+    viol = FPRES - (FS[:, :, None] + slack)
+    e = _entry(results, 'link_finish_presence_ub', viol)
+    _fail(e, (f"(s={sSlots[a]},p={sPositions[b]},r={sPlanes[k]}): fp={FPRES[a, b, k]} > "
+              f"fs+M(1-pres)={FS[a, b] + slack[a, b, k]}" for a, b, k in zip(*np.nonzero(viol > tol))))
+
+    # c21: ClientInPosition (sin datos de clientes en la solución, se asume que se cumple)
+    _entry(results, 'c21_client_in_position')
+
+    # c22, c23 & c24: definición de β y existencia de interferencia sobre sPosPosSlotSlot
+    quad = [(iS[s], iS[s2], iP[p], iP[p2]) for (s, s2, p, p2) in sPosPosSlotSlot]
+    a, a2, b, b2 = (np.array(v, dtype=int) for v in zip(*quad)) if quad else (np.zeros(0, dtype=int),) * 4
+    st, st2, fn, fn2 = SS[a, b], SS[a2, b2], FS[a, b], FS[a2, b2]
+    beta_s = (st + tol < st2).astype(float)
+    beta_f = (st2 + tol < fn).astype(float)
+    def where(k):
+        return f"(s={sSlots[a[k]]},s2={sSlots[a2[k]]},p={sPositions[b[k]]},p2={sPositions[b2[k]]})"
+    viol = st2 - (M * beta_s + st)
+    e = _entry(results, 'c22_beta_definition1', viol)
+    _fail(e, (f"{where(k)}: M·βS+start[{sSlots[a[k]]},{sPositions[b[k]]}]={M * beta_s[k] + st[k]:.4f} < "
+              f"start[{sSlots[a2[k]]},{sPositions[b2[k]]}]={st2[k]:.4f}" for k in np.flatnonzero(viol > tol)))
+    viol = fn - (M * beta_f + st2)
+    e = _entry(results, 'c23_beta_definition2', viol)
+    _fail(e, (f"{where(k)}: M·βF+start[{sSlots[a2[k]]},{sPositions[b2[k]]}]={M * beta_f[k] + st2[k]:.4f} < "
+              f"finish[{sSlots[a[k]]},{sPositions[b[k]]}]={fn[k]:.4f}" for k in np.flatnonzero(viol > tol)))
+
+    overlap = ~((fn <= st2 + tol) | (fn2 <= st + tol))
+    ALPHA = np.zeros((nS, nS, nP, nP), dtype=bool)
+    for (s, s2, p, p2) in solution.get('interference', []):
+        if s in iS and s2 in iS and p in iP and p2 in iP:
+            ALPHA[iS[s], iS[s2], iP[p], iP[p2]] = True
+    marked = ALPHA[a, a2, b, b2] | ALPHA[a2, a, b2, b]
+    viol = (beta_s + beta_f) - (1 + overlap)
+    unmarked = overlap & ~marked
+    e = _entry(results, 'c24_interference_exists', np.maximum(viol, unmarked.astype(float)))
+    for k in np.flatnonzero((viol > tol) | unmarked):
+        if viol[k] > tol:
+            _fail(e, [f"{where(k)}: 1+α={1 + overlap[k]:.4f} < βS+βF={beta_s[k] + beta_f[k]:.4f}"])
+        if unmarked[k]:
+            s, s2, p, p2 = sPosPosSlotSlot[k]
+            _fail(e, [f"Solapamiento real entre ({s},{s2},{p},{p2}) no marcado en interference_list"])
+
+    # c25: SwitchingPlanes (v01SwitchPlanes reconstruido a partir de la asignación)
+    quint = [(iP[p], iS[s], iS[s2], iR[r], iR[r2]) for (p, s, s2, r, r2) in sSwitchPlanes
+             if r in iR and r2 in iR]
+    b, a, a2, k1, k2 = (np.array(v, dtype=int) for v in zip(*quint)) if quint else (np.zeros(0, dtype=int),) * 5
+    in12 = in_slot[a, b, k1] + in_slot[a2, b, k2]
+    viol = in12 - (1 + (in12 > 1))
+    e = _entry(results, 'c25_switching_planes', viol)
+    _fail(e, (f"(p={sPositions[b[q]]},s={sSlots[a[q]]},s2={sSlots[a2[q]]},r={sPlanes[k1[q]]},r2={sPlanes[k2[q]]}): "
+              f"1+vSwitch={1 + (in12[q] > 1):.4f} < in1+in2={in12[q]:.4f}" for q in np.flatnonzero(viol > tol)))
+
+    # c26: NoOverlapSlots, sólo para los trabajos asignados a más de un (s,p)
+    e = _entry(results, 'c26_no_overlap_slots')
+    for c in np.flatnonzero(count > 1):
+        j = sJobs[c]
+        ubic = [(s, p) for (s, p), job in slot_assignment.items() if job == j and s in iS and p in iP]
+        t0 = np.array([SSJ[iS[s], iP[p], c] for (s, p) in ubic])
+        t1 = np.array([FSJ[iS[s], iP[p], c] for (s, p) in ubic])
+        lhs = 1 + (t0[:, None] + tol < t0[None, :]) + (t0[None, :] + tol < t1[:, None])
+        for u, v in zip(*np.nonzero(np.triu(lhs < 2 - tol, k=1))):
+            e['max_violation'] = max(e['max_violation'], 2.0 - lhs[u, v])
+            _fail(e, [f"NoOverlapSlots j={j}: ({ubic[u][0]},{ubic[u][1]},{t0[u]:.4f}-{t1[u]:.4f}) vs "
+                      f"({ubic[v][0]},{ubic[v][1]},{t0[v]:.4f}-{t1[v]:.4f}), 1+βS+βF={lhs[u, v]:.4f} < 2"])
+
+    # within_horizon: ∀(s,p): finish_slot[s,p] ≤ pHorizon
+    viol = FS - H
+    e = _entry(results, 'within_horizon', viol)
+    _fail(e, (f"Ranura ({sSlots[a]},{sPositions[b]}) termina en {FS[a, b]:.4f} > Horizon={H:.4f}"
+              for a, b in zip(*np.nonzero(viol > tol))))
+
+    # plane_single_position: fragmentos del mismo avión en posiciones distintas que se solapan
+    e = _entry(results, 'plane_single_position')
+    st, fn = SS.ravel(), FS.ravel()
+    pos = np.repeat(np.arange(nS), nP), np.tile(np.arange(nP), nS)
+    clash = (np.triu(~((fn[:, None] <= st[None, :] + tol) | (fn[None, :] <= st[:, None] + tol)), k=1)
+             & (pos[1][:, None] != pos[1][None, :]))
+    frag = in_slot.reshape(nS * nP, nR).astype(bool)
+    for k in range(nR):
+        for u, v in zip(*np.nonzero(clash & frag[:, k, None] & frag[None, :, k])):
+            overlap_len = min(fn[u], fn[v]) - max(st[u], st[v])
+            e['max_violation'] = max(e['max_violation'], float(overlap_len))
+            _fail(e, [f"Avión {sPlanes[k]} en posiciones distintas solapadas: {sPositions[pos[1][u]]}"
+                      f"({st[u]:.4f}-{fn[u]:.4f}) vs {sPositions[pos[1][v]]}({st[v]:.4f}-{fn[v]:.4f})"])
+
+    return {
+        'all_constraints_satisfied': all(entry['passed'] for entry in results.values()),
+        'constraints_verification': results,
+    }
@@ -0,0 +1,224 @@
+import time
+from pyomo.environ import Var, Constraint, value
+
+from modelo_base import OUTSIDE, job_time_windows, equivalent_positions
+
+
+# Constructive heuristic: list scheduling of the jobs in task order, one position at a time, giving a complete
+# assignment of every variable of ap_pyomo_model that can be passed to the solver as a MIP start.
+
+
+def _is_entry_exit(j):
+    return str(j).endswith('entry') or str(j).endswith('exit')
+
+
+def greedy_schedule(instance):
+    """
+    Programa los trabajos de la instancia con una regla de lista:
+        - cada trabajo entra cuando ha terminado el anterior de su avión (sJobSequence) y no antes del ES del avión
+        - se coloca en la posición donde, terminando antes de su fin más tardío, genera menos solapes con
+          posiciones que interfieren (sPositionsInterference), no cambia al avión de posición y termina antes
+        - los trabajos entry/exit sólo van a la posición exterior (c26b)
+        - cada posición admite tantos trabajos como slots, y dos aviones del mismo cliente no comparten posición (c21)
+    Devuelve {'jobs': {j: (p, inicio, fin)}, 'slots': {(s, p): j}, 'feasible': bool}.
+    """
+    S = list(instance.sSlots)
+    P = list(instance.sPositions)
+    J = list(instance.sJobs)
+    R = list(instance.sPlanes)
+    D = {j: value(instance.pJobDuration[j]) for j in J}
+    plane = {j: instance.pPlaneOfJob[j] for j in J}
+    H = value(instance.pHorizon)
+    ES = {r: value(instance.pEarlyStartOfPlane[r]) for r in R}
+    LF = {r: value(instance.pLateFinishDeadline[r]) for r in R}
+    sequence = sorted(instance.sJobSequence, key=lambda jj: (str(plane[jj[0]]), instance.pTaskOfJob[jj[0]]))
+    est, lft = job_time_windows(J, sequence, D, plane, ES, LF, H)
+
+    interfere = {}
+    for (p, p2) in instance.sPositionsInterference:
+        interfere.setdefault(p, set()).add(p2)
+        interfere.setdefault(p2, set()).add(p)
+    planes_of_client = {}
+    for (c, r) in instance.sPlaneOfClient:
+        planes_of_client.setdefault(c, set()).add(r)
+    client_planes = {r: set() for r in R}
+    for planes in planes_of_client.values():
+        for r in planes:
+            client_planes[r] |= planes - {r}
+
+    predecessor = {j2: j for (j, j2) in sequence}
+    pending = sorted(J, key=lambda j: instance.pTaskOfJob[j])
+    finish = {}
+    jobs = {}
+    position_jobs = {p: [] for p in P}
+    planes_in = {p: set() for p in P}
+    current = {}
+    feasible = True
+
+    while pending:
+        ready = [j for j in pending if predecessor.get(j) is None or predecessor[j] in finish]
+        # the job that can start first, ties broken by the tightest deadline
+        j = min(ready, key=lambda j: (max(est[j], finish.get(predecessor.get(j), 0)), lft[j]))
+        r = plane[j]
+        release = max(est[j], finish.get(predecessor.get(j), 0))
+        best = None
+        for k, p in enumerate(P):
+            if _is_entry_exit(j) and p != OUTSIDE:
+                continue
+            if len(position_jobs[p]) >= len(S) or planes_in[p] & client_planes[r]:
+                continue
+            start = max([release] + [f for (_, _, f) in position_jobs[p]])
+            end = start + D[j]
+            overlaps = sum(1 for p2 in interfere.get(p, ()) for (_, s2, f2) in position_jobs[p2]
+                           if s2 < end and start < f2)
+            cost = (end > lft[j] + 1e-6, overlaps, current.get(r, p) != p, end, k)
+            if best is None or cost < best[0]:
+                best = (cost, p, start, end)
+        if best is None:
+            feasible = False
+            break
+        cost, p, start, end = best
+        feasible = feasible and not cost[0]
+        position_jobs[p].append((j, start, end))
+        planes_in[p].add(r)
+        current[r] = p
+        finish[j] = end
+        jobs[j] = (p, start, end)
+        pending.remove(j)
+
+    # Equivalent positions are interchangeable: order them as cSymPositionOrder expects (lowest-index job first)
+    order = {j: k for k, j in enumerate(J)}
+    for cls in equivalent_positions(P, list(instance.sPositionsInterference)):
+        assigned = sorted((position_jobs[p] for p in cls),
+                          key=lambda jobs_p: min((order[j] for (j, _, _) in jobs_p), default=len(J)))
+        for p, jobs_p in zip(cls, assigned):
+            position_jobs[p] = jobs_p
+            for (j, start, end) in jobs_p:
+                jobs[j] = (p, start, end)
+
+    slots = slots_from_jobs(jobs, S)
+    feasible = feasible and all((s, p, j) in instance.sSlotWindow for (s, p), j in slots.items())
+    return {'jobs': jobs, 'slots': slots, 'feasible': feasible and len(jobs) == len(J)}
+
+
+def slots_from_jobs(jobs, sSlots):
+    # {j: (p, inicio, fin)} → {(s, p): j}. Slots run backwards in time (c13): the last job of each position
+    # goes to the first slot
+    position_jobs = {}
+    for j, (p, start, _) in jobs.items():
+        position_jobs.setdefault(p, []).append((start, j))
+    slots = {}
+    for p, assigned in position_jobs.items():
+        for k, (_, j) in enumerate(sorted(assigned, key=lambda t: t[0], reverse=True)):
+            slots[sSlots[k], p] = j
+    return slots
+
+
+def apply_schedule(instance, schedule):
+    """
+    Carga en las variables de la instancia la solución completa que corresponde a la programación de
+    greedy_schedule (asignación, tiempos, presencia, cambios de avión, interferencias y retrasos).
+    """
+    S = list(instance.sSlots)
+    P = list(instance.sPositions)
+    J = list(instance.sJobs)
+    R = list(instance.sPlanes)
+    jobs, slots = schedule['jobs'], schedule['slots']
+
+    for v in instance.component_data_objects(Var):
+        v.set_value(0, skip_validation=True)
+
+    start_slot, finish_slot, plane_in = {}, {}, {}
+    for (s, p), j in slots.items():
+        _, start, end = jobs[j]
+        r = instance.pPlaneOfJob[j]
+        start_slot[s, p], finish_slot[s, p], plane_in[s, p] = start, end, r
+        instance.v01JobInSlot[s, p, j].set_value(1, skip_validation=True)
+        instance.vStartSlotForJob[s, p, j].set_value(start, skip_validation=True)
+        instance.vFinishSlotForJob[s, p, j].set_value(end, skip_validation=True)
+        instance.vDurationSlotForJob[s, p, j].set_value(end - start, skip_validation=True)
+        instance.vStartSlot[s, p].set_value(start, skip_validation=True)
+        instance.vFinishSlot[s, p].set_value(end, skip_validation=True)
+        instance.vDurationSlot[s, p].set_value(end - start, skip_validation=True)
+        instance.v01PlaneInSlot[s, p, r].set_value(1, skip_validation=True)
+        instance.v01PlaneInPosition[r, p].set_value(1, skip_validation=True)
+        instance.vPresence[s, p, r].set_value(1, skip_validation=True)
+        instance.vStartPresence[s, p, r].set_value(start, skip_validation=True)
+        instance.vFinishPresence[s, p, r].set_value(end, skip_validation=True)
+        instance.vDurPresence[s, p, r].set_value(end - start, skip_validation=True)
+    for j, (_, start, end) in jobs.items():
+        instance.vStartJob[j].set_value(start, skip_validation=True)
+        instance.vFinishJob[j].set_value(end, skip_validation=True)
+
+    # c20e/c20f/c25: switch in slot s when the plane present changes between s and the next slot
+    for i in range(len(S) - 1):
+        for p in P:
+            if plane_in.get((S[i], p)) != plane_in.get((S[i + 1], p)):
+                instance.v01SwitchPlanes[S[i], p].set_value(1, skip_validation=True)
+
+    for (c, r) in instance.sPlaneOfClient:
+        for p in P:
+            if instance.v01PlaneInPosition[r, p].value:
+                instance.vClientPosition[c, p].set_value(1, skip_validation=True)
+
+    # c22/c23/c24: βS if (s2,p2) starts after (s,p) starts, βF if (s,p) finishes after (s2,p2) starts
+    for (s, s2, p, p2) in instance.sInterference:
+        st, fn, st2 = start_slot.get((s, p), 0), finish_slot.get((s, p), 0), start_slot.get((s2, p2), 0)
+        beta_s, beta_f = int(st2 > st), int(fn > st2)
+        instance.v01BetaS[s, s2, p, p2].set_value(beta_s, skip_validation=True)
+        instance.v01BetaF[s, s2, p, p2].set_value(beta_f, skip_validation=True)
+        instance.v01Alpha[s, s2, p, p2].set_value(int(beta_s + beta_f > 1), skip_validation=True)
+
+    # c09/c10: delay of the last job of each plane over its deadline
+    delay = {r: 0 for r in R}
+    for (j, r) in instance.sLastJob:
+        if j in jobs:
+            delay[r] = max(delay[r], jobs[j][2] - value(instance.pLateFinishDeadline[r]))
+    for r in R:
+        instance.vPlaneDelay[r].set_value(delay[r], skip_validation=True)
+    client_delay = {c: 0 for c in instance.sClients}
+    for (c, r) in instance.sPlaneOfClient:
+        client_delay[c] += delay[r]
+    for c, v in client_delay.items():
+        instance.vClientDelay[c].set_value(v, skip_validation=True)
+
+
+def max_violation(instance):
+    # Largest violation of any active constraint or variable bound at the current values (0 = feasible start)
+    worst = 0.0
+    for c in instance.component_data_objects(Constraint, active=True):
+        body = value(c.body)
+        if c.has_lb():
+            worst = max(worst, value(c.lower) - body)
+        if c.has_ub():
+            worst = max(worst, body - value(c.upper))
+    for v in instance.component_data_objects(Var):
+        if v.value is None:  # variables fuera de toda restricción (p. ej. sin cargar por el solver persistente)
+            continue
+        if v.lb is not None:
+            worst = max(worst, v.lb - v.value)
+        if v.ub is not None:
+            worst = max(worst, v.value - v.ub)
+    return worst
+
+
+def warm_start(instance, verbose=True):
+    """
+    Calcula la programación voraz, la carga en la instancia y devuelve
+    {'feasible', 'objective', 'max_violation', 'time'}. Después basta con resolver con warmstart=True.
+    """
+    t0 = time.perf_counter()
+    schedule = greedy_schedule(instance)
+    apply_schedule(instance, schedule)
+    elapsed = time.perf_counter() - t0
+    violation = max_violation(instance)
+    info = {
+        'feasible': schedule['feasible'] and violation <= 1e-6,
+        'objective': value(instance.ObjFunction),
+        'max_violation': violation,
+        'time': elapsed,
+    }
+    if verbose:
+        status = "factible" if info['feasible'] else f"no factible (violación máx. {violation:.3g})"
+        print(f"🔧 Solución inicial voraz: objetivo {info['objective']:.2f}, {status}, {elapsed:.2f} s")
+    return info